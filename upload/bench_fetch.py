@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+GDELT Fetch Conversion Benchmark
+Compares per-row conversion with column-wise Arrow conversion over
+recorded (or synthetic) BigQuery results, and single-query with sharded
+concurrent fetches against simulated page latency, without network access.
+"""
+
+import argparse
+import sys
+import time
+
+import pyarrow as pa
+
+from events_daily import EventFetcher
+from fake_bigquery import FakeClient
+from gkg_daily import GKGFetcher
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def record_fixture(fetcher, target_date: str, path: str, max_records: int):
+    """Run the fetcher's query once and save the raw result as Arrow IPC."""
+    query = fetcher._build_query(target_date, max_records)
+    table = fetcher.client.query(query).result().to_arrow()
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    print(f"💾 Recorded {table.num_rows} rows to {path}")
+
+
+def load_fixture(path: str):
+    with pa.memory_map(path, 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def time_path(batches) -> tuple:
+    started = time.perf_counter()
+    rows = sum(len(batch) for batch in batches)
+    return rows, time.perf_counter() - started
+
+
+def run(name: str, fetcher_cls, client, batch_size: int):
+    fetcher = fetcher_cls(client=client)
+    results = {
+        'rows': time_path(fetcher.iter_batches('2025-01-06', batch_size=batch_size)),
+        'arrow': time_path(fetcher.iter_arrow_batches('2025-01-06', batch_size=batch_size)),
+    }
+
+    baseline = results['rows'][1]
+    print(f"\n📊 {name}")
+    for mode, (rows, seconds) in results.items():
+        print(f"   {mode:<10} {rows} rows  {seconds:6.2f}s  {rows / seconds:>10,.0f} rows/s  "
+              f"x{baseline / seconds:.1f}")
+
+
+def run_shards(name: str, fetcher_cls, client, batch_size: int, shard_counts: list):
+    print(f"\n📊 {name}: sharded fetch ({client.page_latency * 1000:.0f} ms per page)")
+    # Generate the synthetic day up front so no shard count pays for it
+    client.query(fetcher_cls(client=client)._build_query('2025-01-06', client.rows_per_day))
+    baseline = None
+    for shards in shard_counts:
+        fetcher = fetcher_cls(client=client, shards=shards)
+        rows, seconds = time_path(fetcher.iter_arrow_batches('2025-01-06', batch_size=batch_size))
+        baseline = baseline or seconds
+        print(f"   {shards:>3} shards  {rows} rows  {seconds:6.2f}s  {rows / seconds:>10,.0f} rows/s  "
+              f"x{baseline / seconds:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GDELT fetch conversion benchmark')
+    parser.add_argument('--dataset', choices=['events', 'gkg'], default='events',
+                        help='Dataset to benchmark (default: events)')
+    parser.add_argument('--fixture', help='Arrow IPC file of recorded query results')
+    parser.add_argument('--rows', '-n', type=int, default=100000,
+                        help='Synthetic rows when no fixture is given (default: 100000)')
+    parser.add_argument('--batch-size', type=int, default=10000,
+                        help='Rows per page (default: 10000)')
+    parser.add_argument('--shards', type=lambda v: [int(n) for n in v.split(',')],
+                        help='Compare sharded fetches instead, e.g. 1,2,4,8 (synthetic rows only)')
+    parser.add_argument('--page-latency', type=float, default=0.05,
+                        help='Simulated seconds per page for --shards (default: 0.05)')
+    parser.add_argument('--record', metavar='PATH',
+                        help='Record a fixture from BigQuery instead of benchmarking')
+    parser.add_argument('--date', default='2025-01-06', help='Date to record (YYYY-MM-DD)')
+    parser.add_argument('--project', '-p', help='BigQuery project for --record')
+    args = parser.parse_args()
+
+    fetcher_cls = EventFetcher if args.dataset == 'events' else GKGFetcher
+
+    if args.record:
+        fetcher = fetcher_cls(project_id=args.project) if args.project else fetcher_cls()
+        record_fixture(fetcher, args.date, args.record, args.rows)
+        return 0
+
+    if args.shards:
+        if args.fixture:
+            parser.error("--shards needs synthetic rows; a fixture ignores shard ranges")
+        client = FakeClient(rows_per_day=args.rows, page_latency=args.page_latency)
+        run_shards(args.dataset, fetcher_cls, client, args.batch_size, args.shards)
+        return 0
+
+    if args.fixture:
+        client = FakeClient(fixture=load_fixture(args.fixture))
+    else:
+        synthetic = FakeClient(rows_per_day=args.rows)
+        query = fetcher_cls(client=synthetic)._build_query('2025-01-06', args.rows)
+        client = FakeClient(fixture=synthetic.query(query).result().to_arrow())
+
+    run(args.dataset, fetcher_cls, client, args.batch_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
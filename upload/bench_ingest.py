@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+GDELT Ingestion Benchmark
+Runs the daily fetch -> store path (EventFetcher / GKGFetcher into
+EventDatabase / GKGDatabase) over realistic synthetic days served by a
+streaming fake BigQuery client, one process per case, and reports
+rows/s, peak RSS and per-stage times without network access.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from events_daily import EventDatabase, EventFetcher
+from fake_bigquery import FakeClient
+from gdelt_common import BATCH_SIZE, comma_list
+from gkg_daily import GKGDatabase, GKGFetcher
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+BENCH_DATE = '2025-01-06'
+DEFAULT_SIZES = (10 ** 4, 10 ** 5, 10 ** 6)
+
+DATASETS = {
+    'events': (EventFetcher, EventDatabase),
+    'gkg': (GKGFetcher, GKGDatabase),
+}
+
+_UNITS = {'k': 10 ** 3, 'm': 10 ** 6}
+
+
+def parse_size(value: str) -> int:
+    """'10k' -> 10000, '1M' -> 1000000."""
+    value = value.lower()
+    scale = _UNITS.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def format_size(rows: int) -> str:
+    for unit, scale in (('M', 10 ** 6), ('k', 10 ** 3)):
+        if rows >= scale and rows % scale == 0:
+            return f"{rows // scale}{unit}"
+    return str(rows)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+
+# =============================================================================
+# CASE
+# =============================================================================
+
+def run_case(dataset: str, rows: int, args) -> dict:
+    """Fetch and store one synthetic day in this process and measure it.
+
+    Stages: source is the fake client producing pages (generation plus
+    simulated latency, standing in for BigQuery), convert the fetcher's
+    row conversion, store the SQLite load. Streamed cases overlap them,
+    so only source and the total are reported.
+    """
+    fetcher_cls, database_cls = DATASETS[dataset]
+    client = FakeClient(rows_per_day=rows, page_latency=args.page_latency, streaming=True)
+    fetcher = fetcher_cls(client=client)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / f"{dataset}.db"
+        db = database_cls(db_path, fields=fetcher.fields, compact=args.compact_schema)
+        start_rss = peak_rss_mb()
+
+        iter_batches = fetcher.iter_arrow_batches if args.arrow else fetcher.iter_batches
+        batches = iter_batches(BENCH_DATE, max_records=rows, batch_size=args.batch_size)
+        stages = {}
+        started = time.perf_counter()
+        if args.stream:
+            stats = db.store_batches(batches, bulk=args.bulk)
+        else:
+            records = [r for batch in batches for r in batch]
+            stages['convert'] = time.perf_counter() - started
+            stored = time.perf_counter()
+            stats = db.store(records, bulk=args.bulk)
+            stages['store'] = time.perf_counter() - stored
+            del records
+        seconds = time.perf_counter() - started
+        stages['source'] = client.source_seconds
+        if 'convert' in stages:
+            stages['convert'] -= stages['source']
+        db_mb = db_path.stat().st_size / 2 ** 20
+
+    return {
+        'dataset': dataset,
+        'rows': stats.rows,
+        'seconds': seconds,
+        'rows_per_sec': stats.rows / seconds if seconds else 0.0,
+        'start_rss_mb': start_rss,
+        'peak_rss_mb': peak_rss_mb(),
+        'db_mb': db_mb,
+        'stages': stages,
+    }
+
+
+# =============================================================================
+# SUITE
+# =============================================================================
+
+def case_flags(args) -> list:
+    """Command-line flags that carry the case options to a child process."""
+    flags = ['--batch-size', str(args.batch_size), '--page-latency', str(args.page_latency)]
+    for flag in ('arrow', 'stream', 'bulk', 'compact_schema'):
+        if getattr(args, flag):
+            flags.append(f"--{flag.replace('_', '-')}")
+    return flags
+
+
+def run_suite(args) -> int:
+    """Run every dataset x size case in a fresh process so peak RSS is its own."""
+    datasets = list(DATASETS) if args.dataset == 'all' else [args.dataset]
+    mode = ', '.join(name.replace('_', ' ') for name in ('arrow', 'stream', 'bulk', 'compact_schema')
+                     if getattr(args, name)) or 'rows'
+    print(f"📊 Ingest benchmark ({mode}; {args.batch_size} rows per page, "
+          f"{args.page_latency * 1000:.0f} ms page latency)\n")
+    print(f"{'dataset':<8}{'rows':>6}{'total s':>9}{'rows/s':>10}{'peak MB':>9}{'db MB':>8}"
+          f"{'source':>8}{'convert':>9}{'store':>8}")
+
+    results, failed = [], 0
+    for dataset in datasets:
+        for rows in args.sizes:
+            proc = subprocess.run(
+                [sys.executable, __file__, '--case', dataset, str(rows), *case_flags(args)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                error = (proc.stderr.strip().splitlines() or [f"exit {proc.returncode}"])[-1]
+                print(f"{dataset:<8}{format_size(rows):>6}   ❌ {error}")
+                failed += 1
+                continue
+            result = json.loads(proc.stdout.splitlines()[-1])
+            results.append(result)
+            stages = ''.join(f"{result['stages'][s]:>{w}.2f}" if s in result['stages'] else f"{'-':>{w}}"
+                             for s, w in (('source', 8), ('convert', 9), ('store', 8)))
+            print(f"{dataset:<8}{format_size(rows):>6}{result['seconds']:>9.2f}"
+                  f"{result['rows_per_sec']:>10,.0f}{result['peak_rss_mb']:>9.0f}"
+                  f"{result['db_mb']:>8.0f}{stages}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results written to {args.json}")
+    return 1 if failed else 0
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='GDELT ingestion benchmark - synthetic fetch -> store throughput',
+        epilog="Example: %(prog)s --dataset events --sizes 10k,100k,1M --bulk",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--dataset', choices=['events', 'gkg', 'all'], default='all',
+                        help='Dataset to benchmark (default: all)')
+    parser.add_argument('--sizes', type=comma_list(parse_size), default=list(DEFAULT_SIZES),
+                        help='Comma-separated row counts, e.g. 10k,100k,1M (default: 10k,100k,1M)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'Rows per page (default: {BATCH_SIZE})')
+    parser.add_argument('--page-latency', type=float, default=0.05,
+                        help='Simulated seconds per BigQuery page (default: 0.05)')
+    parser.add_argument('--arrow', action='store_true',
+                        help='Fetch through the Arrow path')
+    parser.add_argument('--stream', action='store_true',
+                        help='Store batches while they are fetched (per-stage times overlap)')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Store with the bulk-load mode')
+    parser.add_argument('--compact-schema', action='store_true',
+                        help='Store into the dictionary-encoded schema')
+    parser.add_argument('--json', metavar='PATH',
+                        help='Also write the results as JSON')
+    parser.add_argument('--case', nargs=2, metavar=('DATASET', 'ROWS'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        dataset, rows = args.case
+        print(json.dumps(run_case(dataset, int(rows), args)))
+        return 0
+    return run_suite(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+GDELT Query Benchmark
+Times the per-day GROUP BY that gdelt_query.py --group-by runs on a
+synthetic day stored with the plain schema and with the compact
+(dictionary-encoded) schema, both through the decoding view and on the
+dictionary keys, so the compact path can be checked against the plain one.
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from events_daily import EventDatabase, EventFetcher
+from fake_bigquery import FakeClient
+from gdelt_common import dict_view_columns
+from gdelt_query import partial_sql
+from gkg_daily import GKGDatabase, GKGFetcher
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_ROWS = 50000
+
+# dataset -> (fetcher, database, [(group by, aggregates), ...])
+DATASETS = {
+    'events': (EventFetcher, EventDatabase, [
+        (['action_geo_country_code'], [('count', None), ('avg', 'goldstein_scale')]),
+        (['action_geo_country_code', 'event_root_code'], [('count', None), ('sum', 'num_mentions')]),
+        (['actor1_country_code', 'actor2_country_code', 'quad_class'], [('count', None)]),
+    ]),
+    'gkg': (GKGFetcher, GKGDatabase, [
+        (['source_common_name'], [('count', None), ('avg', 'tone')]),
+    ]),
+}
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def best_seconds(db_path: Path, sql: str, repeat: int) -> float:
+    """Fastest of repeat runs of a query on a read-only connection."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql).fetchall()
+            best = min(best, time.perf_counter() - started)
+        return best
+    finally:
+        conn.close()
+
+
+def run(name: str, rows: int, repeat: int, workdir: Path):
+    fetcher_cls, database_cls, queries = DATASETS[name]
+    records = fetcher_cls(client=FakeClient(rows_per_day=rows)).fetch('2025-01-06', max_records=rows)
+    plain = database_cls(workdir / f"{name}_plain.db")
+    plain.store(records)
+    compact = database_cls(workdir / f"{name}_compact.db", compact=True)
+    compact.store(records)
+    del records
+
+    conn = sqlite3.connect(compact.db_path)
+    dict_columns = dict_view_columns(conn, name)
+    conn.close()
+
+    print(f"\n📊 {name}: {rows} records "
+          f"(plain {plain.db_path.stat().st_size / 2 ** 20:.1f} MB, "
+          f"compact {compact.db_path.stat().st_size / 2 ** 20:.1f} MB)")
+    print(f"   {'group by':<62}{'plain':>8}{'view':>8}{'keys':>8}")
+    for group_by, aggregates in queries:
+        times = (
+            best_seconds(plain.db_path, partial_sql(name, group_by, aggregates), repeat),
+            best_seconds(compact.db_path, partial_sql(name, group_by, aggregates), repeat),
+            best_seconds(compact.db_path, partial_sql(name, group_by, aggregates,
+                                                      dict_columns=dict_columns), repeat),
+        )
+        print(f"   {', '.join(group_by):<62}" + ''.join(f"{seconds:>8.3f}" for seconds in times))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='GDELT GROUP BY benchmark - plain vs compact schema',
+        epilog="view decodes every row through the compact schema's view; keys groups on "
+               "the dictionary keys and decodes the groups, as gdelt_query.py does.",
+    )
+    parser.add_argument('--rows', '-n', type=int, default=DEFAULT_ROWS,
+                        help=f'Records per dataset (default: {DEFAULT_ROWS})')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Runs per query, fastest reported (default: 10)')
+    parser.add_argument('--dataset', choices=['events', 'gkg', 'all'], default='all',
+                        help='Dataset to benchmark (default: all)')
+    args = parser.parse_args()
+
+    datasets = list(DATASETS) if args.dataset == 'all' else [args.dataset]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in datasets:
+            run(name, args.rows, args.repeat, Path(tmp))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
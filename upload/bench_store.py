@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+GDELT SQLite Store Benchmark
+Compares the original per-row insert loop with the executemany and
+bulk-load paths on synthetic days of Events and GKG records, at several
+day sizes so the point where bulk mode starts to pay off is visible.
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from events_daily import EventDatabase, EventFetcher
+from fake_bigquery import FakeClient
+from gdelt_common import BULK_INDEX_ROWS, comma_list
+from gkg_daily import GKGDatabase, GKGFetcher
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_SIZES = (20000, 100000)
+
+DATASETS = {
+    'events': (EventFetcher, EventDatabase),
+    'gkg': (GKGFetcher, GKGDatabase),
+}
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+class _PerRowCursor:
+    """Cursor that runs every executemany as one execute per row."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, sql: str, parameters=()):
+        return self.cursor.execute(sql, parameters)
+
+    def executemany(self, sql: str, rows):
+        for row in rows:
+            self.cursor.execute(sql, row)
+
+
+def store_row_by_row(db, records: list) -> float:
+    """Baseline: the original loader, one execute per row in a single
+    transaction with default connection settings."""
+    started = time.perf_counter()
+    conn = sqlite3.connect(db.db_path)
+    db._insert_rows(_PerRowCursor(conn.cursor()), records)
+    conn.commit()
+    conn.close()
+    return time.perf_counter() - started
+
+
+def run(name: str, database_cls, records: list, workdir: Path):
+    print(f"\n📊 {name}: {len(records)} records")
+    results = {}
+
+    db = database_cls(workdir / f"{name}_rows.db")
+    results['row-by-row'] = store_row_by_row(db, records)
+
+    db = database_cls(workdir / f"{name}_many.db")
+    results['executemany'] = db.store(records).seconds
+
+    db = database_cls(workdir / f"{name}_bulk.db")
+    results['bulk'] = db.store(records, bulk=True).seconds
+
+    baseline = results['row-by-row']
+    for mode, seconds in results.items():
+        print(f"   {mode:<12} {seconds:7.2f}s  {len(records) / seconds:>10,.0f} rows/s  "
+              f"x{baseline / seconds:.2f}")
+    for path in workdir.glob(f"{name}_*.db*"):
+        path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='GDELT SQLite store benchmark',
+        epilog=f"Bulk loads rebuild the events indexes once past {BULK_INDEX_ROWS} rows; "
+               "GKG bulk loads only switch the connection settings.",
+    )
+    parser.add_argument('--rows', '-n', type=comma_list(int), default=list(DEFAULT_SIZES),
+                        help='Comma-separated records per dataset '
+                             f"(default: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--dataset', choices=['events', 'gkg', 'all'], default='all',
+                        help='Dataset to benchmark (default: all)')
+    args = parser.parse_args()
+
+    datasets = list(DATASETS) if args.dataset == 'all' else [args.dataset]
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for name in datasets:
+            fetcher_cls, database_cls = DATASETS[name]
+            for rows in args.rows:
+                client = FakeClient(rows_per_day=rows)
+                records = fetcher_cls(client=client).fetch('2025-01-06', max_records=rows)
+                run(name, database_cls, records, workdir)
+                del records
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+GDELT Events Dyadic Cube
+Dense per-day Actor1 country x Actor2 country x QuadClass arrays (event
+count, summed GoldsteinScale, summed AvgTone) stored as
+events_YYYYMMDD.npz next to each daily database, and summed over a date
+range from memory-mapped files.
+"""
+
+import argparse
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+from events_daily import DB_DIR, EVENT_CUBE_COLUMNS, get_db_path
+from gdelt_common import date_range
+
+try:
+    import numpy as np
+except ImportError:  # only needed for the cube files
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # not on Windows, where the axis is only locked per process
+    fcntl = None
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Country code axis shared by every cube, one code per line. Codes are
+# only ever appended, so an index keeps its meaning and older (smaller)
+# cubes stay valid; index 0 is the unknown / empty code.
+AXIS_FILE = 'events_cube_axis.txt'
+
+QUAD_CLASSES = 4
+
+# name -> dtype of the arrays in a cube, each shaped [C, C, QUAD_CLASSES]
+CUBE_ARRAYS = {
+    'count': 'int32',
+    'goldstein_sum': 'float64',
+    'tone_sum': 'float64',
+}
+
+_axis_lock = threading.Lock()
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("numpy is required for event cubes (pip install numpy)")
+
+
+def cube_path(db_path: Path) -> Path:
+    """events_YYYYMMDD.db -> events_YYYYMMDD.npz"""
+    return Path(db_path).with_suffix('.npz')
+
+
+# =============================================================================
+# AXIS
+# =============================================================================
+
+def load_axis(db_dir: Path = DB_DIR) -> list:
+    """Country codes of the cube axis, by index."""
+    path = Path(db_dir) / AXIS_FILE
+    if not path.exists():
+        return ['']
+    return path.read_text().split('\n')
+
+
+def extend_axis(db_dir: Path, codes) -> dict:
+    """Append unseen codes to the axis and return {code: index} for all of it.
+
+    The read-extend-write holds an exclusive lock on a sidecar file, so
+    parallel ingest processes never give two codes the same index.
+    """
+    path = Path(db_dir) / AXIS_FILE
+    with _axis_lock, open(path.with_name(path.name + '.lock'), 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file closes
+        axis = load_axis(db_dir)
+        known = set(axis)
+        new = sorted(set(codes) - known)
+        if new:
+            axis += new
+            tmp = path.with_name(path.name + '.tmp')
+            tmp.write_text('\n'.join(axis))
+            os.replace(tmp, path)
+    return {code: i for i, code in enumerate(axis)}
+
+
+# =============================================================================
+# BUILD
+# =============================================================================
+
+def build_cube(db_path: Path) -> dict:
+    """Aggregate one daily events database into cube arrays."""
+    require_numpy()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        present = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+        missing = set(EVENT_CUBE_COLUMNS) - present
+        if missing:
+            raise ValueError(f"{db_path} was loaded without {', '.join(sorted(missing))}")
+        rows = conn.execute("""
+            SELECT IFNULL(actor1_country_code, ''), IFNULL(actor2_country_code, ''),
+                   quad_class, COUNT(*), TOTAL(goldstein_scale), TOTAL(avg_tone)
+            FROM events
+            WHERE quad_class BETWEEN 1 AND 4
+            GROUP BY 1, 2, 3
+        """).fetchall()
+    finally:
+        conn.close()
+
+    index = extend_axis(Path(db_path).parent, (code for row in rows for code in row[:2]))
+    size = len(index)
+    cube = {name: np.zeros((size, size, QUAD_CLASSES), dtype) for name, dtype in CUBE_ARRAYS.items()}
+    if rows:
+        actor1, actor2, quad, count, goldstein, tone = zip(*rows)
+        at = (np.fromiter((index[c] for c in actor1), np.intp, len(rows)),
+              np.fromiter((index[c] for c in actor2), np.intp, len(rows)),
+              np.array(quad, np.intp) - 1)
+        # NULL and '' codes share index 0, so cells can repeat
+        np.add.at(cube['count'], at, count)
+        np.add.at(cube['goldstein_sum'], at, goldstein)
+        np.add.at(cube['tone_sum'], at, tone)
+    return cube
+
+
+def write_day_cube(db_path: Path) -> Path:
+    """Build and (atomically) write the cube of one daily database; returns its path."""
+    path = cube_path(db_path)
+    cube = build_cube(db_path)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        # Uncompressed, so load_cube can memory-map the members
+        np.savez(f, **cube)
+    os.replace(tmp, path)
+    return path
+
+
+# =============================================================================
+# LOAD
+# =============================================================================
+
+def load_cube(path: Path) -> dict:
+    """Memory-map the arrays of a cube file without reading them.
+
+    np.load cannot map .npz members, but np.savez stores them uncompressed,
+    so each .npy member is mapped at its offset inside the zip.
+    """
+    require_numpy()
+    readers = {(1, 0): np.lib.format.read_array_header_1_0,
+               (2, 0): np.lib.format.read_array_header_2_0}
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {info.filename} is compressed and cannot be mapped")
+            # Local file header: fixed 30 bytes, then the name and extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            shape, fortran_order, dtype = readers[np.lib.format.read_magic(f)](f)
+            arrays[info.filename.removesuffix('.npy')] = np.memmap(
+                path, dtype=dtype, mode='r', shape=shape, offset=f.tell(),
+                order='F' if fortran_order else 'C',
+            )
+    return arrays
+
+
+def sum_cubes(dates: list, db_dir: Path = DB_DIR) -> tuple:
+    """Sum the cubes of a date range; returns (axis, arrays, days found).
+
+    Cubes written before the axis grew are smaller and add into its
+    leading corner.
+    """
+    require_numpy()
+    axis = load_axis(db_dir)
+    size = len(axis)
+    totals = {name: np.zeros((size, size, QUAD_CLASSES), dtype) for name, dtype in CUBE_ARRAYS.items()}
+    days = 0
+    for date in dates:
+        path = cube_path(get_db_path(date))
+        if not path.exists():
+            continue
+        for name, array in load_cube(path).items():
+            n = array.shape[0]
+            totals[name][:n, :n] += array
+        days += 1
+    return axis, totals, days
+
+
+def top_dyads(axis: list, cube: dict, k: int = 20, quad_class: int = None) -> list:
+    """(actor1, actor2, events, goldstein sum, mean tone) of the k busiest country pairs."""
+    if quad_class is None:
+        count, goldstein, tone = (cube[name].sum(axis=2) for name in CUBE_ARRAYS)
+    else:
+        count, goldstein, tone = (cube[name][:, :, quad_class - 1] for name in CUBE_ARRAYS)
+    flat = count.ravel()
+    order = np.argsort(flat, kind='stable')[::-1][:k]
+    dyads = []
+    for i, j in zip(*np.unravel_index(order, count.shape)):
+        if not count[i, j]:
+            break
+        dyads.append((axis[i], axis[j], int(count[i, j]), float(goldstein[i, j]),
+                      float(tone[i, j]) / int(count[i, j])))
+    return dyads
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def cmd_build(args) -> int:
+    built = 0
+    for date in date_range(args.start, args.end or args.start):
+        db_path = get_db_path(date)
+        if not db_path.exists():
+            continue
+        try:
+            path = write_day_cube(db_path)
+        except ValueError as e:
+            print(f"   ⚠️  {e}", file=sys.stderr)
+            continue
+        print(f"   ✅ {path}")
+        built += 1
+    print(f"\n🧊 Built {built} cubes ({len(load_axis())} countries on the axis)")
+    return 0 if built else 1
+
+
+def cmd_top(args) -> int:
+    started = time.perf_counter()
+    axis, cube, days = sum_cubes(date_range(args.start, args.end))
+    elapsed = time.perf_counter() - started
+    print(f"📂 {days} daily cubes summed in {elapsed * 1000:.1f} ms\n")
+    print(f"{'actor1':<8}{'actor2':<8}{'events':>10}{'goldstein':>12}{'avg_tone':>10}")
+    for actor1, actor2, count, goldstein, tone in top_dyads(axis, cube, args.top, args.quad_class):
+        print(f"{actor1 or '-':<8}{actor2 or '-':<8}{count:>10}{goldstein:>12.1f}{tone:>10.3f}")
+    return 0 if days else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='GDELT Events Dyadic Cube - country x country x quad class arrays per day',
+        epilog="Example: %(prog)s build 2025-01-01 2025-01-31"
+               "\n         %(prog)s top 2025-01-01 2025-01-31 --quad-class 4",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser(
+        'build', help='Write the cube of existing daily events databases')
+    build_parser.add_argument('start', help='Date (YYYY-MM-DD)')
+    build_parser.add_argument('end', nargs='?', help='Range end date, inclusive (YYYY-MM-DD)')
+    build_parser.set_defaults(func=cmd_build)
+
+    top_parser = commands.add_parser(
+        'top', help='Sum the cubes of a date range and list the busiest country pairs')
+    top_parser.add_argument('start', help='Range start date (YYYY-MM-DD)')
+    top_parser.add_argument('end', help='Range end date, inclusive (YYYY-MM-DD)')
+    top_parser.add_argument('--quad-class', '-q', type=int, choices=range(1, QUAD_CLASSES + 1),
+                            help='Only this quad class (default: all)')
+    top_parser.add_argument('--top', '-k', type=int, default=20,
+                            help='Number of pairs to list (default: 20)')
+    top_parser.set_defaults(func=cmd_top)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,190 +4,247 @@ GDELT Event Database Daily Raw Data Fetcher
 Fetches ALL raw Event fields for a single day and stores in SQLite.
 """
 
-import os
 import sys
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 import argparse
 
-from google.cloud import bigquery
+from gdelt_common import (
+    BULK_INDEX_ROWS, DB_DIR, DICT_TABLE_SQL, GEO_SLOTS, QUEUE_DEPTH, STATE_TABLE_SQL, DailyIngest,
+    DayFetcher, DictEncoder, LoadStats, SQLiteSink, add_missing_columns, backfill_url_hash,
+    comma_list, compact_table_sql, create_dict_view, create_fts_index, create_geo_index,
+    create_rollup, day_db_path, day_parquet_dir, geo_delete_sql, get_state, project_table_sql,
+    reset_rollups, sample_filter, set_state, storage_table, update_rollups, url_hash,
+    write_records, write_stream,
+)
 
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gdelt-483607")
-DB_DIR = Path("db")
-
-
 def get_db_path(target_date: str) -> Path:
     """Generate database filename with target date."""
-    date_clean = target_date.replace('-', '')
-    return DB_DIR / f"events_{date_clean}.db"
+    return day_db_path('events', target_date)
+
 
+def get_parquet_dir(target_date: str) -> Path:
+    """Hive partition directory of one day in the Parquet dataset."""
+    return day_parquet_dir('events', target_date)
 
-MAX_RECORDS = 100000
+
+# Ingestion-time partitioned copy of gdeltv2.events. Events land in the
+# partition of the day they were added, which can trail their SQLDATE, so
+# a day's query scans its own partition plus PARTITION_LAG_DAYS after it.
+EVENTS_TABLE = "gdelt-bq.gdeltv2.events_partitioned"
+PARTITION_LAG_DAYS = 1
 
 
 # =============================================================================
-# EVENT FETCHER
+# FIELDS
 # =============================================================================
 
-class EventFetcher:
-    """Fetches ALL Event data from BigQuery."""
+# (column, BigQuery field, kind) in INSERT column order; kinds are
+# documented in gdelt_common
+EVENT_FIELDS = (
+    ('global_event_id',         'GLOBALEVENTID',         'str'),
+    ('sql_date',                'SQLDATE',               'str'),
+    ('month_year',              'MonthYear',             'str'),
+    ('year',                    'Year',                  'int_nz'),
+    ('fraction_date',           'FractionDate',          'float_nz'),
+    ('actor1_code',             'Actor1Code',            'text'),
+    ('actor1_name',             'Actor1Name',            'text'),
+    ('actor1_country_code',     'Actor1CountryCode',     'text'),
+    ('actor1_known_group_code', 'Actor1KnownGroupCode',  'text'),
+    ('actor1_ethnic_code',      'Actor1EthnicCode',      'text'),
+    ('actor1_religion1_code',   'Actor1Religion1Code',   'text'),
+    ('actor1_religion2_code',   'Actor1Religion2Code',   'text'),
+    ('actor1_type1_code',       'Actor1Type1Code',       'text'),
+    ('actor1_type2_code',       'Actor1Type2Code',       'text'),
+    ('actor1_type3_code',       'Actor1Type3Code',       'text'),
+    ('actor2_code',             'Actor2Code',            'text'),
+    ('actor2_name',             'Actor2Name',            'text'),
+    ('actor2_country_code',     'Actor2CountryCode',     'text'),
+    ('actor2_known_group_code', 'Actor2KnownGroupCode',  'text'),
+    ('actor2_ethnic_code',      'Actor2EthnicCode',      'text'),
+    ('actor2_religion1_code',   'Actor2Religion1Code',   'text'),
+    ('actor2_religion2_code',   'Actor2Religion2Code',   'text'),
+    ('actor2_type1_code',       'Actor2Type1Code',       'text'),
+    ('actor2_type2_code',       'Actor2Type2Code',       'text'),
+    ('actor2_type3_code',       'Actor2Type3Code',       'text'),
+    ('is_root_event',           'IsRootEvent',           'int'),
+    ('event_code',              'EventCode',             'text'),
+    ('event_base_code',         'EventBaseCode',         'text'),
+    ('event_root_code',         'EventRootCode',         'text'),
+    ('quad_class',              'QuadClass',             'int'),
+    ('goldstein_scale',         'GoldsteinScale',        'float'),
+    ('num_mentions',            'NumMentions',           'int'),
+    ('num_sources',             'NumSources',            'int'),
+    ('num_articles',            'NumArticles',           'int'),
+    ('avg_tone',                'AvgTone',               'float'),
+    ('actor1_geo_type',         'Actor1Geo_Type',        'int'),
+    ('actor1_geo_full_name',    'Actor1Geo_FullName',    'text'),
+    ('actor1_geo_country_code', 'Actor1Geo_CountryCode', 'text'),
+    ('actor1_geo_adm1_code',    'Actor1Geo_ADM1Code',    'text'),
+    ('actor1_geo_adm2_code',    'Actor1Geo_ADM2Code',    'text'),
+    ('actor1_geo_lat',          'Actor1Geo_Lat',         'float'),
+    ('actor1_geo_long',         'Actor1Geo_Long',        'float'),
+    ('actor1_geo_feature_id',   'Actor1Geo_FeatureID',   'str_nn'),
+    ('actor2_geo_type',         'Actor2Geo_Type',        'int'),
+    ('actor2_geo_full_name',    'Actor2Geo_FullName',    'text'),
+    ('actor2_geo_country_code', 'Actor2Geo_CountryCode', 'text'),
+    ('actor2_geo_adm1_code',    'Actor2Geo_ADM1Code',    'text'),
+    ('actor2_geo_adm2_code',    'Actor2Geo_ADM2Code',    'text'),
+    ('actor2_geo_lat',          'Actor2Geo_Lat',         'float'),
+    ('actor2_geo_long',         'Actor2Geo_Long',        'float'),
+    ('actor2_geo_feature_id',   'Actor2Geo_FeatureID',   'str_nn'),
+    ('action_geo_type',         'ActionGeo_Type',        'int'),
+    ('action_geo_full_name',    'ActionGeo_FullName',    'text'),
+    ('action_geo_country_code', 'ActionGeo_CountryCode', 'text'),
+    ('action_geo_adm1_code',    'ActionGeo_ADM1Code',    'text'),
+    ('action_geo_adm2_code',    'ActionGeo_ADM2Code',    'text'),
+    ('action_geo_lat',          'ActionGeo_Lat',         'float'),
+    ('action_geo_long',         'ActionGeo_Long',        'float'),
+    ('action_geo_feature_id',   'ActionGeo_FeatureID',   'str_nn'),
+    ('date_added',              'DATEADDED',             'str'),
+    ('source_url',              'SOURCEURL',             'text'),
+)
+
+EVENT_COLUMNS = tuple(column for column, _, _ in EVENT_FIELDS)
+
+# --fields profiles. The unique key and the date/watermark columns are
+# always loaded on top of any profile or explicit column list.
+EVENT_REQUIRED_COLUMNS = ('global_event_id', 'sql_date', 'date_added')
+
+# Columns aggregated into the dyadic cube (events_cube.py), added to the
+# loaded fields when --cube is set
+EVENT_CUBE_COLUMNS = (
+    'actor1_country_code', 'actor2_country_code', 'quad_class', 'goldstein_scale', 'avg_tone',
+)
+
+_EVENT_CORE = (
+    'is_root_event', 'event_code', 'event_base_code', 'event_root_code', 'quad_class',
+    'goldstein_scale', 'num_mentions', 'num_sources', 'num_articles', 'avg_tone', 'source_url',
+)
+
+EVENT_PROFILES = {
+    'minimal': _EVENT_CORE,
+    'actors': _EVENT_CORE + tuple(c for c in EVENT_COLUMNS
+                                  if c.startswith(('actor1_', 'actor2_')) and '_geo_' not in c),
+    'geo': _EVENT_CORE + tuple(c for c in EVENT_COLUMNS if '_geo_' in c),
+    'all': EVENT_COLUMNS,
+}
+
+# Row filters pushed down into the BigQuery query (see gdelt_common):
+# ActionGeo country (FIPS), CAMEO root code, quad class, Goldstein floor
+EVENT_FILTERS = (
+    ('countries',     'ActionGeo_CountryCode IN UNNEST(@countries)', 'STRING'),
+    ('root_codes',    'EventRootCode IN UNNEST(@root_codes)',        'STRING'),
+    ('quad_classes',  'QuadClass IN UNNEST(@quad_classes)',          'INT64'),
+    ('min_goldstein', 'GoldsteinScale >= @min_goldstein',            'FLOAT64'),
+    sample_filter('GLOBALEVENTID'),
+)
+
+
+def root_code(value: str) -> str:
+    """CAMEO root code as stored by GDELT ('1' -> '01')."""
+    code = int(value)
+    if not 1 <= code <= 20:
+        raise ValueError(value)
+    return f"{code:02d}"
+
+
+def quad_class(value: str) -> int:
+    code = int(value)
+    if not 1 <= code <= 4:
+        raise ValueError(value)
+    return code
+
+
+# Indexed columns; an index is only created when its column is loaded
+EVENT_INDEXES = (
+    ('idx_events_date', 'sql_date'),
+    ('idx_events_actor1', 'actor1_name'),
+    ('idx_events_actor2', 'actor2_name'),
+    ('idx_events_event_code', 'event_code'),
+    ('idx_events_goldstein', 'goldstein_scale'),
+    ('idx_events_global_id', 'global_event_id'),
+    ('idx_events_url_hash', 'url_hash'),
+)
+
+# Text columns covered by the optional events_fts full-text index
+EVENT_FTS_COLUMNS = ('actor1_name', 'actor2_name', 'source_url')
+
+# (kind, lat column, long column) of each point in the optional geo_rtree
+# index; a point's slot is its position here
+EVENT_GEO_POINTS = (
+    ('action', 'action_geo_lat', 'action_geo_long'),
+    ('actor1', 'actor1_geo_lat', 'actor1_geo_long'),
+    ('actor2', 'actor2_geo_lat', 'actor2_geo_long'),
+)
+
+# Rollups kept by the optional --rollups (specs are documented in
+# gdelt_common): hourly by DATEADDED and daily by SQLDATE, per ActionGeo
+# country x CAMEO root code x quad class. Mean tone is avg_tone_sum /
+# avg_tone_count; unknown keys are '' / 0.
+_ROLLUP_KEYS = (
+    ('action_geo_country_code', 'TEXT',    "IFNULL(action_geo_country_code, '')"),
+    ('event_root_code',         'TEXT',    "IFNULL(event_root_code, '')"),
+    ('quad_class',              'INTEGER', "IFNULL(quad_class, 0)"),
+)
+_ROLLUP_MEASURES = (
+    ('events',              'INTEGER', "COUNT(*)"),
+    ('avg_tone_sum',        'REAL',    "TOTAL(avg_tone)"),
+    ('avg_tone_count',      'INTEGER', "COUNT(avg_tone)"),
+    ('goldstein_scale_sum', 'REAL',    "TOTAL(goldstein_scale)"),
+    ('num_mentions_sum',    'INTEGER', "IFNULL(SUM(num_mentions), 0)"),
+)
+EVENT_ROLLUPS = (
+    ('events_rollup_hourly', (('hour', 'INTEGER', "IFNULL(date_added / 10000, 0)"),) + _ROLLUP_KEYS,
+     _ROLLUP_MEASURES),
+    ('events_rollup_daily', (('sql_date', 'INTEGER', "IFNULL(sql_date, 0)"),) + _ROLLUP_KEYS,
+     _ROLLUP_MEASURES),
+)
+# Low-cardinality columns stored as dict_text keys under --compact-schema
+EVENT_DICT_COLUMNS = tuple(
+    c for c in EVENT_COLUMNS
+    if c.endswith(('_code', '_geo_full_name'))
+)
+
+EVENT_ROLLUP_COLUMNS = ('action_geo_country_code', 'event_root_code', 'quad_class', 'avg_tone',
+                        'goldstein_scale', 'num_mentions')
 
-    def __init__(self, project_id: str = PROJECT_ID):
-        self.client = bigquery.Client(project=project_id)
 
-    def fetch(self, target_date: str, max_records: int = MAX_RECORDS) -> list:
-        """Fetch ALL event records for a date."""
-        date_obj = datetime.strptime(target_date, '%Y-%m-%d')
-        next_date = date_obj + timedelta(days=1)
+# =============================================================================
+# EVENT FETCHER
+# =============================================================================
 
-        # Query ALL Event fields
-        query = f"""
-        SELECT
-            GLOBALEVENTID,
-            SQLDATE,
-            MonthYear,
-            Year,
-            FractionDate,
-            Actor1Code,
-            Actor1Name,
-            Actor1CountryCode,
-            Actor1KnownGroupCode,
-            Actor1EthnicCode,
-            Actor1Religion1Code,
-            Actor1Religion2Code,
-            Actor1Type1Code,
-            Actor1Type2Code,
-            Actor1Type3Code,
-            Actor2Code,
-            Actor2Name,
-            Actor2CountryCode,
-            Actor2KnownGroupCode,
-            Actor2EthnicCode,
-            Actor2Religion1Code,
-            Actor2Religion2Code,
-            Actor2Type1Code,
-            Actor2Type2Code,
-            Actor2Type3Code,
-            IsRootEvent,
-            EventCode,
-            EventBaseCode,
-            EventRootCode,
-            QuadClass,
-            GoldsteinScale,
-            NumMentions,
-            NumSources,
-            NumArticles,
-            AvgTone,
-            Actor1Geo_Type,
-            Actor1Geo_FullName,
-            Actor1Geo_CountryCode,
-            Actor1Geo_ADM1Code,
-            Actor1Geo_ADM2Code,
-            Actor1Geo_Lat,
-            Actor1Geo_Long,
-            Actor1Geo_FeatureID,
-            Actor2Geo_Type,
-            Actor2Geo_FullName,
-            Actor2Geo_CountryCode,
-            Actor2Geo_ADM1Code,
-            Actor2Geo_ADM2Code,
-            Actor2Geo_Lat,
-            Actor2Geo_Long,
-            Actor2Geo_FeatureID,
-            ActionGeo_Type,
-            ActionGeo_FullName,
-            ActionGeo_CountryCode,
-            ActionGeo_ADM1Code,
-            ActionGeo_ADM2Code,
-            ActionGeo_Lat,
-            ActionGeo_Long,
-            ActionGeo_FeatureID,
-            DATEADDED,
-            SOURCEURL
-        FROM `gdelt-bq.gdeltv2.events`
-        WHERE
-            SQLDATE >= {int(date_obj.strftime('%Y%m%d'))}
-            AND SQLDATE < {int(next_date.strftime('%Y%m%d'))}
-            AND Actor1Name IS NOT NULL
-        LIMIT {max_records}
-        """
+class EventFetcher(DayFetcher):
+    """Fetches Event data from BigQuery: every field, or those of a profile."""
 
-        result = self.client.query(query).result()
-
-        records = []
-        for row in result:
-            records.append({
-                'global_event_id': str(row.GLOBALEVENTID) if row.GLOBALEVENTID else None,
-                'sql_date': str(row.SQLDATE) if row.SQLDATE else None,
-                'month_year': str(row.MonthYear) if row.MonthYear else None,
-                'year': int(row.Year) if row.Year else None,
-                'fraction_date': float(row.FractionDate) if row.FractionDate else None,
-                'actor1_code': row.Actor1Code,
-                'actor1_name': row.Actor1Name,
-                'actor1_country_code': row.Actor1CountryCode,
-                'actor1_known_group_code': row.Actor1KnownGroupCode,
-                'actor1_ethnic_code': row.Actor1EthnicCode,
-                'actor1_religion1_code': row.Actor1Religion1Code,
-                'actor1_religion2_code': row.Actor1Religion2Code,
-                'actor1_type1_code': row.Actor1Type1Code,
-                'actor1_type2_code': row.Actor1Type2Code,
-                'actor1_type3_code': row.Actor1Type3Code,
-                'actor2_code': row.Actor2Code,
-                'actor2_name': row.Actor2Name,
-                'actor2_country_code': row.Actor2CountryCode,
-                'actor2_known_group_code': row.Actor2KnownGroupCode,
-                'actor2_ethnic_code': row.Actor2EthnicCode,
-                'actor2_religion1_code': row.Actor2Religion1Code,
-                'actor2_religion2_code': row.Actor2Religion2Code,
-                'actor2_type1_code': row.Actor2Type1Code,
-                'actor2_type2_code': row.Actor2Type2Code,
-                'actor2_type3_code': row.Actor2Type3Code,
-                'is_root_event': int(row.IsRootEvent) if row.IsRootEvent is not None else None,
-                'event_code': row.EventCode,
-                'event_base_code': row.EventBaseCode,
-                'event_root_code': row.EventRootCode,
-                'quad_class': int(row.QuadClass) if row.QuadClass is not None else None,
-                'goldstein_scale': float(row.GoldsteinScale) if row.GoldsteinScale is not None else None,
-                'num_mentions': int(row.NumMentions) if row.NumMentions is not None else None,
-                'num_sources': int(row.NumSources) if row.NumSources is not None else None,
-                'num_articles': int(row.NumArticles) if row.NumArticles is not None else None,
-                'avg_tone': float(row.AvgTone) if row.AvgTone is not None else None,
-                'actor1_geo_type': int(row.Actor1Geo_Type) if row.Actor1Geo_Type is not None else None,
-                'actor1_geo_full_name': row.Actor1Geo_FullName,
-                'actor1_geo_country_code': row.Actor1Geo_CountryCode,
-                'actor1_geo_adm1_code': row.Actor1Geo_ADM1Code,
-                'actor1_geo_adm2_code': row.Actor1Geo_ADM2Code,
-                'actor1_geo_lat': float(row.Actor1Geo_Lat) if row.Actor1Geo_Lat is not None else None,
-                'actor1_geo_long': float(row.Actor1Geo_Long) if row.Actor1Geo_Long is not None else None,
-                'actor1_geo_feature_id': str(row.Actor1Geo_FeatureID) if row.Actor1Geo_FeatureID is not None else None,
-                'actor2_geo_type': int(row.Actor2Geo_Type) if row.Actor2Geo_Type is not None else None,
-                'actor2_geo_full_name': row.Actor2Geo_FullName,
-                'actor2_geo_country_code': row.Actor2Geo_CountryCode,
-                'actor2_geo_adm1_code': row.Actor2Geo_ADM1Code,
-                'actor2_geo_adm2_code': row.Actor2Geo_ADM2Code,
-                'actor2_geo_lat': float(row.Actor2Geo_Lat) if row.Actor2Geo_Lat is not None else None,
-                'actor2_geo_long': float(row.Actor2Geo_Long) if row.Actor2Geo_Long is not None else None,
-                'actor2_geo_feature_id': str(row.Actor2Geo_FeatureID) if row.Actor2Geo_FeatureID is not None else None,
-                'action_geo_type': int(row.ActionGeo_Type) if row.ActionGeo_Type is not None else None,
-                'action_geo_full_name': row.ActionGeo_FullName,
-                'action_geo_country_code': row.ActionGeo_CountryCode,
-                'action_geo_adm1_code': row.ActionGeo_ADM1Code,
-                'action_geo_adm2_code': row.ActionGeo_ADM2Code,
-                'action_geo_lat': float(row.ActionGeo_Lat) if row.ActionGeo_Lat is not None else None,
-                'action_geo_long': float(row.ActionGeo_Long) if row.ActionGeo_Long is not None else None,
-                'action_geo_feature_id': str(row.ActionGeo_FeatureID) if row.ActionGeo_FeatureID is not None else None,
-                'date_added': str(row.DATEADDED) if row.DATEADDED else None,
-                'source_url': row.SOURCEURL,
-            })
-
-        return records
+    TABLE = EVENTS_TABLE
+    FIELDS = EVENT_FIELDS
+    FILTERS = EVENT_FILTERS
+    TIME_COLUMN = 'DATEADDED'
 
+    def __init__(self, *args, partition_lag: int = PARTITION_LAG_DAYS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.partition_lag = partition_lag
+
+    def _day_predicates(self, target_date: str) -> list:
+        # _PARTITIONTIME prunes the scan to the day's ingestion partitions,
+        # SQLDATE keeps only the day's events
+        date_obj = datetime.strptime(target_date, '%Y-%m-%d')
+        next_date = date_obj + timedelta(days=1)
+        partition_end = next_date + timedelta(days=self.partition_lag)
+        return [
+            f"_PARTITIONTIME >= TIMESTAMP('{target_date}')",
+            f"_PARTITIONTIME < TIMESTAMP('{partition_end.strftime('%Y-%m-%d')}')",
+            f"SQLDATE >= {int(date_obj.strftime('%Y%m%d'))}",
+            f"SQLDATE < {int(next_date.strftime('%Y%m%d'))}",
+            "Actor1Name IS NOT NULL",
+        ]
 
 # =============================================================================
 # DATABASE
@@ -196,10 +253,96 @@ class EventFetcher:
 class EventDatabase:
     """Stores ALL Event raw data in SQLite."""
 
-    def __init__(self, db_path: Path):
+    TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        global_event_id TEXT UNIQUE,
+        sql_date INTEGER,
+        month_year INTEGER,
+        year INTEGER,
+        fraction_date REAL,
+        actor1_code TEXT,
+        actor1_name TEXT,
+        actor1_country_code TEXT,
+        actor1_known_group_code TEXT,
+        actor1_ethnic_code TEXT,
+        actor1_religion1_code TEXT,
+        actor1_religion2_code TEXT,
+        actor1_type1_code TEXT,
+        actor1_type2_code TEXT,
+        actor1_type3_code TEXT,
+        actor2_code TEXT,
+        actor2_name TEXT,
+        actor2_country_code TEXT,
+        actor2_known_group_code TEXT,
+        actor2_ethnic_code TEXT,
+        actor2_religion1_code TEXT,
+        actor2_religion2_code TEXT,
+        actor2_type1_code TEXT,
+        actor2_type2_code TEXT,
+        actor2_type3_code TEXT,
+        is_root_event INTEGER,
+        event_code TEXT,
+        event_base_code TEXT,
+        event_root_code TEXT,
+        quad_class INTEGER,
+        goldstein_scale REAL,
+        num_mentions INTEGER,
+        num_sources INTEGER,
+        num_articles INTEGER,
+        avg_tone REAL,
+        actor1_geo_type INTEGER,
+        actor1_geo_full_name TEXT,
+        actor1_geo_country_code TEXT,
+        actor1_geo_adm1_code TEXT,
+        actor1_geo_adm2_code TEXT,
+        actor1_geo_lat REAL,
+        actor1_geo_long REAL,
+        actor1_geo_feature_id TEXT,
+        actor2_geo_type INTEGER,
+        actor2_geo_full_name TEXT,
+        actor2_geo_country_code TEXT,
+        actor2_geo_adm1_code TEXT,
+        actor2_geo_adm2_code TEXT,
+        actor2_geo_lat REAL,
+        actor2_geo_long REAL,
+        actor2_geo_feature_id TEXT,
+        action_geo_type INTEGER,
+        action_geo_full_name TEXT,
+        action_geo_country_code TEXT,
+        action_geo_adm1_code TEXT,
+        action_geo_adm2_code TEXT,
+        action_geo_lat REAL,
+        action_geo_long REAL,
+        action_geo_feature_id TEXT,
+        date_added INTEGER,
+        source_url TEXT,
+        url_hash INTEGER
+    )
+"""
+
+    def __init__(self, db_path: Path, fields: tuple = EVENT_FIELDS, fts: bool = False,
+                 geo: bool = False, rollups: bool = False, compact: bool = False):
         self.db_path = db_path
+        self.fields = fields
+        self.fts = fts
+        self.geo = geo
+        self.rollups = rollups
+        self.compact = compact
+        self.columns = tuple(column for column, _, _ in fields)
         self._init_db()
 
+        # Loaded columns, then the hash of source_url when it is loaded
+        self._url_at = self.columns.index('source_url') if 'source_url' in self.columns else None
+        insert_columns = self.columns
+        if self._url_at is not None:
+            insert_columns += ('url_hash',)
+        self.INSERT_SQL = (
+            f"INSERT OR IGNORE INTO {self.table} ({', '.join(insert_columns)}) "
+            f"VALUES ({', '.join('?' * len(insert_columns))})"
+        )
+        self._encoder = self._new_encoder()
+
     def _init_db(self):
         """Initialize database schema with ALL fields."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -207,187 +350,269 @@ class EventDatabase:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        # Create table with ALL Event fields
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                global_event_id TEXT UNIQUE,
-                sql_date INTEGER,
-                month_year INTEGER,
-                year INTEGER,
-                fraction_date REAL,
-                actor1_code TEXT,
-                actor1_name TEXT,
-                actor1_country_code TEXT,
-                actor1_known_group_code TEXT,
-                actor1_ethnic_code TEXT,
-                actor1_religion1_code TEXT,
-                actor1_religion2_code TEXT,
-                actor1_type1_code TEXT,
-                actor1_type2_code TEXT,
-                actor1_type3_code TEXT,
-                actor2_code TEXT,
-                actor2_name TEXT,
-                actor2_country_code TEXT,
-                actor2_known_group_code TEXT,
-                actor2_ethnic_code TEXT,
-                actor2_religion1_code TEXT,
-                actor2_religion2_code TEXT,
-                actor2_type1_code TEXT,
-                actor2_type2_code TEXT,
-                actor2_type3_code TEXT,
-                is_root_event INTEGER,
-                event_code TEXT,
-                event_base_code TEXT,
-                event_root_code TEXT,
-                quad_class INTEGER,
-                goldstein_scale REAL,
-                num_mentions INTEGER,
-                num_sources INTEGER,
-                num_articles INTEGER,
-                avg_tone REAL,
-                actor1_geo_type INTEGER,
-                actor1_geo_full_name TEXT,
-                actor1_geo_country_code TEXT,
-                actor1_geo_adm1_code TEXT,
-                actor1_geo_adm2_code TEXT,
-                actor1_geo_lat REAL,
-                actor1_geo_long REAL,
-                actor1_geo_feature_id TEXT,
-                actor2_geo_type INTEGER,
-                actor2_geo_full_name TEXT,
-                actor2_geo_country_code TEXT,
-                actor2_geo_adm1_code TEXT,
-                actor2_geo_adm2_code TEXT,
-                actor2_geo_lat REAL,
-                actor2_geo_long REAL,
-                actor2_geo_feature_id TEXT,
-                action_geo_type INTEGER,
-                action_geo_full_name TEXT,
-                action_geo_country_code TEXT,
-                action_geo_adm1_code TEXT,
-                action_geo_adm2_code TEXT,
-                action_geo_lat REAL,
-                action_geo_long REAL,
-                action_geo_feature_id TEXT,
-                date_added INTEGER,
-                source_url TEXT
-            )
-        """)
+        # Rows go to events, or to events_base behind a decoding events view
+        # when the database was created with the compact schema
+        self.table = storage_table(conn, 'events', self.compact)
+        self.compact = self.table != 'events'
+        self.table_sql = self.TABLE_SQL
+        if self.compact:
+            cursor.execute(DICT_TABLE_SQL)
+            self.table_sql = compact_table_sql(self.TABLE_SQL, 'events', EVENT_DICT_COLUMNS)
+
+        # Create the table with the loaded fields; databases created with a
+        # smaller profile gain the missing columns
+        cursor.execute(project_table_sql(self.table_sql, self.columns))
+        add_missing_columns(conn, self.table, self.table_sql, self.columns)
+
+        # Article join key, filled in place for databases created before it;
+        # only tables that hold the article URL get one
+        present = {row[1] for row in cursor.execute(f"PRAGMA table_info({self.table})")}
+        if 'source_url' in present and add_missing_columns(conn, self.table, self.table_sql, ('url_hash',)):
+            backfill_url_hash(conn, self.table, 'source_url')
+            present.add('url_hash')
+
+        cursor.execute(STATE_TABLE_SQL)
 
         # Create indexes for common queries
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_date ON events(sql_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_actor1 ON events(actor1_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_actor2 ON events(actor2_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_event_code ON events(event_code)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_goldstein ON events(goldstein_scale)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_global_id ON events(global_event_id)")
+        for name, column in EVENT_INDEXES:
+            if column in present:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {self.table}({column})")
+
+        # The full-text index stays on once a database has it
+        self.fts = self.fts or cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+        ).fetchone() is not None
+        if self.fts:
+            add_missing_columns(conn, self.table, self.table_sql, EVENT_FTS_COLUMNS)
+            create_fts_index(conn, self.table, 'events_fts', EVENT_FTS_COLUMNS)
+
+        # And for the spatial index
+        self.geo = self.geo or cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'geo_rtree'"
+        ).fetchone() is not None
+        if self.geo:
+            self._init_geo_index(conn)
+
+        # And for the rollup tables
+        self.rollups = self.rollups or cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_rollup_daily'"
+        ).fetchone() is not None
+        if self.rollups:
+            add_missing_columns(conn, self.table, self.table_sql, EVENT_ROLLUP_COLUMNS)
+            for spec in EVENT_ROLLUPS:
+                create_rollup(conn, spec)
+
+        # Recreated on every open so it covers columns added above
+        if self.compact:
+            create_dict_view(conn, 'events', EVENT_DICT_COLUMNS)
 
         conn.commit()
         conn.close()
 
-    def store(self, records: list):
-        """Store all event records."""
+    def _init_geo_index(self, conn):
+        """Create geo_rtree with triggers adding and removing each event's points.
+
+        Events already in the table are indexed on creation.
+        """
+        geo_columns = tuple(column for _, lat, lon in EVENT_GEO_POINTS for column in (lat, lon))
+        add_missing_columns(conn, self.table, self.table_sql, geo_columns)
+        if not create_geo_index(conn):
+            return
+
+        def point_sql(slot, kind, lat, lon, row=''):
+            source = '' if row else f' FROM {self.table}'
+            return (
+                f"INSERT INTO geo_rtree SELECT {row}id * {GEO_SLOTS} + {slot}, "
+                f"{row}{lat}, {row}{lat}, {row}{lon}, {row}{lon}, {row}{lat}, {row}{lon}, "
+                f"'{kind}'{source} WHERE {row}{lat} IS NOT NULL AND {row}{lon} IS NOT NULL"
+            )
+
+        points = [(slot, *point) for slot, point in enumerate(EVENT_GEO_POINTS)]
+        inserts = ';\n'.join(point_sql(*point, row='new.') for point in points)
+        conn.execute(f"""
+            CREATE TRIGGER events_geo_ai AFTER INSERT ON {self.table} BEGIN
+                {inserts};
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER events_geo_ad AFTER DELETE ON {self.table} BEGIN
+                {geo_delete_sql('old.id', len(EVENT_GEO_POINTS) - 1)};
+            END
+        """)
+        for point in points:
+            conn.execute(point_sql(*point))
+
+    def get_watermark(self):
+        """Return the highest DATEADDED already loaded, or None for an empty database."""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        try:
+            watermark = get_state(conn, 'watermark')
+            if watermark is None:
+                watermark = conn.execute(f"SELECT MAX(date_added) FROM {self.table}").fetchone()[0]
+        finally:
+            conn.close()
+        return int(watermark) if watermark is not None else None
+
+    def advance_watermark(self, truncated: bool = False):
+        """Persist the loaded DATEADDED high-water mark.
+
+        When the fetch hit its LIMIT the newest DATEADDED slice may be partial,
+        so the watermark stops just below it and the next run re-fetches it.
+        """
+        conn = sqlite3.connect(self.db_path)
+        watermark = conn.execute(f"SELECT MAX(date_added) FROM {self.table}").fetchone()[0]
+        if truncated and watermark is not None:
+            watermark = conn.execute(
+                f"SELECT MAX(date_added) FROM {self.table} WHERE date_added < ?", (watermark,)
+            ).fetchone()[0]
+        if watermark is not None:
+            set_state(conn, 'watermark', int(watermark))
+        conn.commit()
+        conn.close()
+        return watermark
 
-        for r in records:
-            cursor.execute("""
-                INSERT OR IGNORE INTO events (
-                    global_event_id, sql_date, month_year, year, fraction_date,
-                    actor1_code, actor1_name, actor1_country_code, actor1_known_group_code,
-                    actor1_ethnic_code, actor1_religion1_code, actor1_religion2_code,
-                    actor1_type1_code, actor1_type2_code, actor1_type3_code,
-                    actor2_code, actor2_name, actor2_country_code, actor2_known_group_code,
-                    actor2_ethnic_code, actor2_religion1_code, actor2_religion2_code,
-                    actor2_type1_code, actor2_type2_code, actor2_type3_code,
-                    is_root_event, event_code, event_base_code, event_root_code, quad_class,
-                    goldstein_scale, num_mentions, num_sources, num_articles, avg_tone,
-                    actor1_geo_type, actor1_geo_full_name, actor1_geo_country_code,
-                    actor1_geo_adm1_code, actor1_geo_adm2_code, actor1_geo_lat, actor1_geo_long,
-                    actor1_geo_feature_id,
-                    actor2_geo_type, actor2_geo_full_name, actor2_geo_country_code,
-                    actor2_geo_adm1_code, actor2_geo_adm2_code, actor2_geo_lat, actor2_geo_long,
-                    actor2_geo_feature_id,
-                    action_geo_type, action_geo_full_name, action_geo_country_code,
-                    action_geo_adm1_code, action_geo_adm2_code, action_geo_lat, action_geo_long,
-                    action_geo_feature_id,
-                    date_added, source_url
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                r['global_event_id'], r['sql_date'], r['month_year'], r['year'], r['fraction_date'],
-                r['actor1_code'], r['actor1_name'], r['actor1_country_code'], r['actor1_known_group_code'],
-                r['actor1_ethnic_code'], r['actor1_religion1_code'], r['actor1_religion2_code'],
-                r['actor1_type1_code'], r['actor1_type2_code'], r['actor1_type3_code'],
-                r['actor2_code'], r['actor2_name'], r['actor2_country_code'], r['actor2_known_group_code'],
-                r['actor2_ethnic_code'], r['actor2_religion1_code'], r['actor2_religion2_code'],
-                r['actor2_type1_code'], r['actor2_type2_code'], r['actor2_type3_code'],
-                r['is_root_event'], r['event_code'], r['event_base_code'], r['event_root_code'], r['quad_class'],
-                r['goldstein_scale'], r['num_mentions'], r['num_sources'], r['num_articles'], r['avg_tone'],
-                r['actor1_geo_type'], r['actor1_geo_full_name'], r['actor1_geo_country_code'],
-                r['actor1_geo_adm1_code'], r['actor1_geo_adm2_code'], r['actor1_geo_lat'], r['actor1_geo_long'],
-                r['actor1_geo_feature_id'],
-                r['actor2_geo_type'], r['actor2_geo_full_name'], r['actor2_geo_country_code'],
-                r['actor2_geo_adm1_code'], r['actor2_geo_adm2_code'], r['actor2_geo_lat'], r['actor2_geo_long'],
-                r['actor2_geo_feature_id'],
-                r['action_geo_type'], r['action_geo_full_name'], r['action_geo_country_code'],
-                r['action_geo_adm1_code'], r['action_geo_adm2_code'], r['action_geo_lat'], r['action_geo_long'],
-                r['action_geo_feature_id'],
-                r['date_added'], r['source_url']
-            ))
+    def update_rollups(self, rebuild: bool = False) -> int:
+        """Fold events loaded since the last update into the rollups; returns rows added.
 
+        With rebuild=True the rollups are recomputed from every row.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if rebuild:
+                reset_rollups(conn, EVENT_ROLLUPS)
+            # Through the events view so compact databases roll up decoded codes
+            added = update_rollups(conn, 'events', EVENT_ROLLUPS)
+            conn.commit()
+        finally:
+            conn.close()
+        return added
+
+    def mark_complete(self):
+        """Record that this database holds the full day."""
+        conn = sqlite3.connect(self.db_path)
+        set_state(conn, 'complete', 1)
         conn.commit()
         conn.close()
 
+    def store(self, records: list, bulk: bool = False) -> LoadStats:
+        """Store all event records (row tuples in field order)."""
+        return write_records(records, lambda: self.open_sink(bulk=bulk))
+
+    def store_batches(self, batches, bulk: bool = False,
+                      max_pending: int = QUEUE_DEPTH) -> LoadStats:
+        """Store record batches on a writer thread while they are still downloading."""
+        return write_stream(batches, lambda: self.open_sink(bulk=bulk),
+                            max_pending=max_pending)
+
+    def open_sink(self, bulk: bool = False) -> SQLiteSink:
+        """Open a sink that writes batches of row tuples into this database.
+
+        With bulk=True the load runs with loader PRAGMAs, and loads past
+        BULK_INDEX_ROWS rows rebuild the secondary indexes once after the
+        last batch.
+        """
+        self._encoder = self._new_encoder()
+        return SQLiteSink(self.db_path, self._insert_rows, table=self.table, bulk=bulk)
+
+    def _new_encoder(self):
+        if not self.compact:
+            return None
+        return DictEncoder(i for i, column in enumerate(self.columns) if column in EVENT_DICT_COLUMNS)
+
+    def _insert_rows(self, cursor, rows: list):
+        """Insert a batch of row tuples in field order."""
+        at = self._url_at
+        if at is not None:
+            hashes = [url_hash(row[at]) for row in rows]
+        if self._encoder is not None:
+            rows = self._encoder.encode(cursor, rows)
+        if at is not None:
+            rows = (row + (h,) for row, h in zip(rows, hashes))
+        cursor.executemany(self.INSERT_SQL, rows)
+
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='GDELT Event Database Daily Raw Data Fetcher - ALL FIELDS',
-        epilog="Fetches ALL Event fields for a single day and stores in SQLite.\n\nExample: %(prog)s 2025-01-06"
-    )
-
-    parser.add_argument('date', type=str, help='Date (YYYY-MM-DD)')
-    parser.add_argument('--project', '-p', default=PROJECT_ID,
-                        help=f'BigQuery project ID (default: {PROJECT_ID})')
-    parser.add_argument('--max', '-m', type=int, default=MAX_RECORDS,
-                        help=f'Max records to fetch (default: {MAX_RECORDS})')
-
-    args = parser.parse_args()
-
-    # Validate date
-    try:
-        datetime.strptime(args.date, '%Y-%m-%d')
-    except ValueError:
-        print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD.", file=sys.stderr)
-        return 1
-
-    # Setup
-    db_path = get_db_path(args.date)
-    print(f"📊 Event Database Daily Raw Data - ALL FIELDS")
-    print(f"📅 Date: {args.date}")
-    print(f"💾 Output: {db_path}")
-    print(f"📊 Max records: {args.max}\n")
-
-    # Fetch
-    print("📥 Fetching Event data...")
-    fetcher = EventFetcher(project_id=args.project)
-    records = fetcher.fetch(args.date, max_records=args.max)
-    print(f"   Found {len(records)} records")
-
-    # Store
-    print("\n💾 Storing to database...")
-    db = EventDatabase(db_path)
-    db.store(records)
-
-    print(f"\n✅ Done!")
-    print(f"   Records: {len(records)}")
-    print(f"   Database: {db_path}")
-
-    return 0
+class EventIngest(DailyIngest):
+    """Daily Events command line: storage features, event filters and the cube."""
+
+    DATASET = 'events'
+    TITLE = 'Event Database'
+    DATA = 'Event'
+    UNIT = 'events'
+    FETCHER = EventFetcher
+    DATABASE = EventDatabase
+    PROFILES = EVENT_PROFILES
+    REQUIRED_COLUMNS = EVENT_REQUIRED_COLUMNS
+    REQUIRED_NOTE = 'keys and dates'
+    WATERMARK = 'date_added'
+    SAMPLE_KEY = 'GLOBALEVENTID'
+    BULK_HELP = ('Bulk-load: loader PRAGMAs, and one index rebuild at the end for '
+                 f'loads past {BULK_INDEX_ROWS} rows')
+
+    def add_arguments(self, parser: argparse.ArgumentParser):
+        parser.add_argument('--fts', action='store_true',
+                            help='Maintain an FTS5 index over actor names and source URLs '
+                                 '(search with gdelt_query.py --search)')
+        parser.add_argument('--geo', action='store_true',
+                            help='Maintain an R*Tree index over action and actor coordinates '
+                                 '(query with gdelt_query.py --box / --near)')
+        parser.add_argument('--rollups', action='store_true',
+                            help='Maintain hourly and daily country x root code x quad class rollups '
+                                 '(query with gdelt_query.py --table)')
+        parser.add_argument('--cube', action='store_true',
+                            help='Write the day\'s actor country x country x quad class cube '
+                                 '(events_YYYYMMDD.npz, summed with events_cube.py); '
+                                 'loads the cube columns whatever --fields says')
+        parser.add_argument('--compact-schema', action='store_true',
+                            help='Create new databases with code and place name columns stored as '
+                                 'dictionary keys behind an events view (smaller files)')
+        parser.add_argument('--country', action='extend', type=comma_list(str.upper), metavar='CODES',
+                            help='Only events whose action is in these FIPS country codes (e.g. US,UK)')
+        parser.add_argument('--root-code', action='extend', type=comma_list(root_code), metavar='CODES',
+                            help='Only these CAMEO root codes, 1-20 (e.g. 14,18)')
+        parser.add_argument('--quad-class', action='extend', type=comma_list(quad_class),
+                            metavar='CLASSES', help='Only these quad classes, 1-4 (e.g. 3,4)')
+        parser.add_argument('--min-goldstein', type=float, metavar='SCALE',
+                            help='Only events with a Goldstein scale of at least SCALE (-10 to 10)')
+        parser.add_argument('--partition-lag', type=int, default=PARTITION_LAG_DAYS,
+                            help='Extra ingestion days scanned for late-added events '
+                                 f'(default: {PARTITION_LAG_DAYS})')
+
+    def check_args(self, parser: argparse.ArgumentParser, args):
+        if args.partition_lag < 0:
+            parser.error("--partition-lag cannot be negative")
+        if args.cube and args.sink == 'parquet':
+            parser.error("--cube is built from the SQLite database; use --sink both")
+
+    def filters(self, args) -> dict:
+        return {
+            'countries': args.country,
+            'root_codes': args.root_code,
+            'quad_classes': args.quad_class,
+            'min_goldstein': args.min_goldstein,
+        }
+
+    def fetcher_options(self, args) -> dict:
+        return {'partition_lag': args.partition_lag}
+
+    def required_columns(self, args) -> tuple:
+        return self.REQUIRED_COLUMNS + (EVENT_CUBE_COLUMNS if args.cube else ())
+
+    def open_database(self, target_date: str, fields: tuple, args) -> EventDatabase:
+        return EventDatabase(get_db_path(target_date), fields=fields, fts=args.fts, geo=args.geo,
+                             rollups=args.rollups, compact=args.compact_schema)
+
+    def after_store(self, db: EventDatabase, args, log):
+        if args.cube:
+            from events_cube import write_day_cube  # numpy is only needed here
+            log(f"🧊 Cube: {write_day_cube(db.db_path)}")
+
+
+def main(argv=None, client=None):
+    return EventIngest().main(argv, client=client)
 
 
 if __name__ == "__main__":
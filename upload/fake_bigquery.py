@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+Fake BigQuery Client
+Serves synthetic GDELT Events / GKG rows through the subset of the
+google.cloud.bigquery API the daily fetchers use, for offline runs and
+benchmarks.
+"""
+
+import random
+import re
+import zlib
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import islice
+
+try:
+    import pyarrow as pa
+except ImportError:  # only needed for the Arrow fetch path
+    pa = None
+
+
+# =============================================================================
+# SYNTHETIC ROWS
+# =============================================================================
+
+COUNTRIES = ['USA', 'GBR', 'FRA', 'DEU', 'CHN', 'RUS', 'IND', 'BRA', 'NGA', 'UKR']
+FIPS = ['US', 'UK', 'FR', 'GM', 'CH', 'RS', 'IN', 'BR', 'NI', 'UP']
+COUNTRY_NAMES = ['United States', 'United Kingdom', 'France', 'Germany', 'China', 'Russia',
+                 'India', 'Brazil', 'Nigeria', 'Ukraine']
+SOURCES = ['bbc.co.uk', 'nytimes.com', 'reuters.com', 'lemonde.fr', 'spiegel.de', 'xinhuanet.com']
+
+ACTOR_TYPES = ['GOV', 'MIL', 'COP', 'JUD', 'BUS', 'CVL', 'EDU', 'MED', 'OPP', 'REB', 'LEG', 'REF']
+THEMES = ['ARMEDCONFLICT', 'CRISISLEX_CRISISLEXREC', 'ECON_INFLATION', 'ELECTION', 'EPU_POLICY',
+          'GENERAL_GOVERNMENT', 'KILL', 'LEADER', 'MANMADE_DISASTER_IMPLIED', 'MEDIA_MSM',
+          'MILITARY', 'PROTEST', 'SECURITY_SERVICES', 'TAX_ETHNICITY', 'TERROR',
+          'USPEC_POLITICS_GENERAL1']
+THEMES += [f"WB_{n}_TOPIC_{n % 37}" for n in range(100, 400)]
+COUNT_TYPES = ['KILL', 'WOUND', 'ARREST', 'PROTEST', 'AFFECT', 'DISPLACED', 'CRISISLEX_T03_DEAD']
+
+# Synthetic words for names, titles and quotations
+_SYLLABLES = ['ka', 'ri', 'to', 'mar', 'len', 'sa', 'vo', 'bu', 'din', 'el', 'gor', 'ne', 'pol',
+              'an', 'ber', 'tsk', 'li', 'mo', 'ra', 'zan']
+
+EVENT_FIELDS = (
+    'GLOBALEVENTID', 'SQLDATE', 'MonthYear', 'Year', 'FractionDate',
+    'Actor1Code', 'Actor1Name', 'Actor1CountryCode', 'Actor1KnownGroupCode', 'Actor1EthnicCode',
+    'Actor1Religion1Code', 'Actor1Religion2Code', 'Actor1Type1Code', 'Actor1Type2Code',
+    'Actor1Type3Code',
+    'Actor2Code', 'Actor2Name', 'Actor2CountryCode', 'Actor2KnownGroupCode', 'Actor2EthnicCode',
+    'Actor2Religion1Code', 'Actor2Religion2Code', 'Actor2Type1Code', 'Actor2Type2Code',
+    'Actor2Type3Code',
+    'IsRootEvent', 'EventCode', 'EventBaseCode', 'EventRootCode', 'QuadClass', 'GoldsteinScale',
+    'NumMentions', 'NumSources', 'NumArticles', 'AvgTone',
+    'Actor1Geo_Type', 'Actor1Geo_FullName', 'Actor1Geo_CountryCode', 'Actor1Geo_ADM1Code',
+    'Actor1Geo_ADM2Code', 'Actor1Geo_Lat', 'Actor1Geo_Long', 'Actor1Geo_FeatureID',
+    'Actor2Geo_Type', 'Actor2Geo_FullName', 'Actor2Geo_CountryCode', 'Actor2Geo_ADM1Code',
+    'Actor2Geo_ADM2Code', 'Actor2Geo_Lat', 'Actor2Geo_Long', 'Actor2Geo_FeatureID',
+    'ActionGeo_Type', 'ActionGeo_FullName', 'ActionGeo_CountryCode', 'ActionGeo_ADM1Code',
+    'ActionGeo_ADM2Code', 'ActionGeo_Lat', 'ActionGeo_Long', 'ActionGeo_FeatureID',
+    'DATEADDED', 'SOURCEURL',
+)
+
+GKG_FIELDS = (
+    'GKGRECORDID', 'DATE', 'SourceCollectionIdentifier', 'SourceCommonName', 'DocumentIdentifier',
+    'Counts', 'V2Counts', 'Themes', 'V2Themes', 'Locations', 'V2Locations', 'Persons', 'V2Persons',
+    'Organizations', 'V2Organizations', 'V2Tone', 'Dates', 'GCAM', 'SharingImage', 'RelatedImages',
+    'SocialImageEmbeds', 'SocialVideoEmbeds', 'Quotations', 'AllNames', 'Amounts',
+    'TranslationInfo', 'Extras', 'date_ts',
+)
+
+# GCAM dimension keys: word counts (cN.N) and score averages (vN.N)
+GCAM_COUNT_DIMENSIONS = [f"c{d}.{k}" for d in range(1, 25) for k in range(1, 201)]
+GCAM_VALUE_DIMENSIONS = [f"v{d}.{k}" for d in range(1, 25) for k in range(1, 21)]
+_GCAM_COUNTS = [str(n) for n in range(1, 31)]
+_GCAM_COUNT_WEIGHTS = [1 / n for n in range(1, 31)]
+
+
+EVENT_INT_FIELDS = {
+    'GLOBALEVENTID', 'SQLDATE', 'MonthYear', 'Year', 'IsRootEvent', 'QuadClass', 'NumMentions',
+    'NumSources', 'NumArticles', 'Actor1Geo_Type', 'Actor2Geo_Type', 'ActionGeo_Type', 'DATEADDED',
+}
+EVENT_FLOAT_FIELDS = {
+    'FractionDate', 'GoldsteinScale', 'AvgTone', 'Actor1Geo_Lat', 'Actor1Geo_Long',
+    'Actor2Geo_Lat', 'Actor2Geo_Long', 'ActionGeo_Lat', 'ActionGeo_Long',
+}
+GKG_INT_FIELDS = {'DATE', 'SourceCollectionIdentifier'}
+
+
+def arrow_schema(fields: tuple):
+    """Arrow schema matching the BigQuery column types of a field list."""
+    def arrow_type(name):
+        if name in EVENT_INT_FIELDS or name in GKG_INT_FIELDS:
+            return pa.int64()
+        if name in EVENT_FLOAT_FIELDS:
+            return pa.float64()
+        if name == 'date_ts':
+            return pa.timestamp('us', tz='UTC')
+        return pa.string()
+    return pa.schema([(name, arrow_type(name)) for name in fields])
+
+
+def rows_to_arrow(rows: list, fields: tuple):
+    """Build an Arrow table from FakeRows."""
+    return pa.Table.from_pylist([row._values for row in rows], schema=arrow_schema(fields))
+
+
+def arrow_to_rows(table) -> list:
+    """Build FakeRows from an Arrow table (e.g. a recorded fixture)."""
+    return [FakeRow(values) for values in table.to_pylist()]
+
+
+class FakeRow:
+    """Attribute access over a field dict, like google.cloud.bigquery.Row."""
+
+    __slots__ = ('_values',)
+
+    def __init__(self, values: dict):
+        self._values = values
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def get(self, name, default=None):
+        return self._values.get(name, default)
+
+    def items(self):
+        return self._values.items()
+
+
+def selected_fields(query: str) -> list:
+    """Output names of the SELECT list of a query (aliases for expressions)."""
+    match = re.search(r"SELECT\s+(.*?)\s+FROM\s", query, re.S | re.I)
+    if not match:
+        return []
+    names, depth, current = [], 0, ''
+    for char in match.group(1) + ',':
+        if char == ',' and depth == 0:
+            alias = re.search(r"(?:\bas\s+)?(\w+)\s*$", current.strip(), re.I)
+            names.append(alias.group(1))
+            current = ''
+            continue
+        depth += (char == '(') - (char == ')')
+        current += char
+    return names
+
+
+def project_rows(rows, fields: list):
+    """Keep the selected fields of each row; lazily when rows is an iterator."""
+    projected = (FakeRow({name: row._values[name] for name in fields}) for row in rows)
+    return list(projected) if isinstance(rows, list) else projected
+
+
+def query_parameters(job_config) -> dict:
+    """Values of a job's query parameters by name (arrays as lists)."""
+    parameters = getattr(job_config, 'query_parameters', None) or []
+    return {p.name: list(p.values) if hasattr(p, 'values') else p.value for p in parameters}
+
+
+def _field_int(value, index: int):
+    """SAFE_CAST(SPLIT(value, ',')[SAFE_OFFSET(index)] AS INT64)."""
+    try:
+        return int((value or '').split(',')[index])
+    except (IndexError, ValueError):
+        return None
+
+
+def _fingerprint_bucket(value, buckets: int) -> int:
+    """Stable stand-in for MOD(ABS(FARM_FINGERPRINT(CAST(value AS STRING))), buckets)."""
+    return zlib.crc32(str(value).encode()) % buckets
+
+
+def _at_least(value, bound) -> bool:
+    return value is not None and value >= bound
+
+
+# Parameterized predicates the fetchers emit: pattern -> builder of a row
+# check from the match groups and the parameter values
+_PREDICATES = (
+    (r"(\w+) IN UNNEST\(@(\w+)\)",
+     lambda column, name, p: lambda row: row.get(column) in p[name]),
+    (r"\b(\w+)\s*>=\s*@(\w+)",
+     lambda column, name, p: lambda row: _at_least(row.get(column), p[name])),
+    (r"\b(\w+)\s*<\s*@(\w+)",
+     lambda column, name, p: lambda row: row.get(column) is not None and row.get(column) < p[name]),
+    (r"UNNEST\(@(\w+)\) AS \w+ WHERE STRPOS\(CONCAT\(';', (\w+)\)",
+     lambda name, column, p: lambda row: any(f";{theme}," in f";{row.get(column) or ''}"
+                                             for theme in p[name])),
+    (r"SPLIT\((\w+), ','\)\[SAFE_OFFSET\((\d+)\)\] AS INT64\) >= @(\w+)",
+     lambda column, index, name, p: lambda row: _at_least(_field_int(row.get(column), int(index)),
+                                                          p[name])),
+    (r"MOD\(ABS\(FARM_FINGERPRINT\(CAST\((\w+) AS STRING\)\)\), (\d+)\) < @(\w+)",
+     lambda column, buckets, name, p: lambda row: _fingerprint_bucket(row.get(column), int(buckets))
+                                                  < p[name]),
+)
+
+
+def parameter_filter(query: str, params: dict):
+    """Row predicate applying every parameterized condition of a query, or None."""
+    checks = [build(*match.groups(), params)
+              for pattern, build in _PREDICATES for match in re.finditer(pattern, query)]
+    if not checks:
+        return None
+    return lambda row: all(check(row) for check in checks)
+
+
+def _word(rnd: random.Random, syllables: int = 3) -> str:
+    return ''.join(rnd.choice(_SYLLABLES) for _ in range(rnd.randint(2, syllables))).capitalize()
+
+
+def _make_gazetteer(size: int = 5000) -> list:
+    """Places shared by all rows: (type, full name, FIPS, ADM1, ADM2, lat, long, feature id).
+
+    Countries, states and cities in the proportions of real GDELT
+    geocoding, clustered around a centre per country.
+    """
+    rnd = random.Random('gazetteer')
+    centres = [(rnd.uniform(-40, 60), rnd.uniform(-170, 170)) for _ in FIPS]
+    places = [(1, name, fips, fips, '', lat, lon, fips)
+              for name, fips, (lat, lon) in zip(COUNTRY_NAMES, FIPS, centres)]
+    while len(places) < size:
+        c = rnd.randrange(len(FIPS))
+        fips, country = FIPS[c], COUNTRY_NAMES[c]
+        lat = max(-85.0, min(85.0, centres[c][0] + rnd.uniform(-8, 8)))
+        lon = (centres[c][1] + rnd.uniform(-12, 12) + 180) % 360 - 180
+        adm1 = f"{fips}{rnd.randint(1, 40):02d}"
+        region = f"{_word(rnd)} Region"
+        if rnd.random() < 0.2:
+            loc_type = 2 if fips == 'US' else 5
+            places.append((loc_type, f"{region}, {country}", fips, adm1, '', lat, lon, adm1))
+        else:
+            loc_type = 3 if fips == 'US' else 4
+            places.append((loc_type, f"{_word(rnd)}, {region}, {country}", fips, adm1,
+                           str(rnd.randrange(10 ** 5)), lat, lon, str(-rnd.randrange(10 ** 7))))
+    return places
+
+
+GAZETTEER = _make_gazetteer()
+PLACES_BY_FIPS = {fips: [place for place in GAZETTEER if place[2] == fips] for fips in FIPS}
+# V2Locations / V1 Locations blocks of each place, without the character offset
+_V2_PLACES = [f"{t}#{name}#{fips}#{adm1}#{adm2}#{lat:.4f}#{lon:.4f}#{fid}"
+              for t, name, fips, adm1, adm2, lat, lon, fid in GAZETTEER]
+_V1_PLACES = [f"{t}#{name}#{fips}#{adm1}#{lat:.4f}#{lon:.4f}#{fid}"
+              for t, name, fips, adm1, adm2, lat, lon, fid in GAZETTEER]
+
+_NAMES = random.Random('names')
+PERSONS = [f"{_word(_NAMES, 2)} {_word(_NAMES)}" for _ in range(3000)]
+ORGANIZATIONS = [f"{_word(_NAMES)} {kind}" for kind in ('Ministry', 'Party', 'Bank', 'University',
+                                                         'Council', 'Group') for _ in range(250)]
+WORDS = [_word(_NAMES).lower() for _ in range(1000)]
+
+
+def _stamp(rnd: random.Random, day: str) -> int:
+    return int(f"{day}{rnd.randrange(24):02d}{rnd.choice((0, 15, 30, 45)):02d}00")
+
+
+def _event_geo(values: dict, prefix: str, place: tuple):
+    loc_type, full_name, fips, adm1, adm2, lat, lon, feature_id = place
+    values[f'{prefix}_Type'] = loc_type
+    values[f'{prefix}_FullName'] = full_name
+    values[f'{prefix}_CountryCode'] = fips
+    values[f'{prefix}_ADM1Code'] = adm1
+    values[f'{prefix}_ADM2Code'] = adm2 or None
+    values[f'{prefix}_Lat'] = lat
+    values[f'{prefix}_Long'] = lon
+    values[f'{prefix}_FeatureID'] = feature_id
+
+
+def iter_event_rows(n: int, day: str = '20250106', seed: int = 0):
+    """Generate Events rows with BigQuery field names for one YYYYMMDD day, one at a time.
+
+    Every field GDELT fills for a typical event is set, including the three
+    geo blocks; rows hold no references to each other, so a streamed day
+    never has to be held in memory.
+    """
+    rnd = random.Random(f"events-{day}-{seed}")
+    base_id = int(day) * 10 ** 7
+    for i in range(n):
+        values = dict.fromkeys(EVENT_FIELDS)
+        c1, c2 = rnd.randrange(len(COUNTRIES)), rnd.randrange(len(COUNTRIES))
+        type1, type2 = rnd.choice(ACTOR_TYPES), rnd.choice(ACTOR_TYPES)
+        root = rnd.randint(1, 20)
+        values.update({
+            'GLOBALEVENTID': base_id + i,
+            'SQLDATE': int(day),
+            'MonthYear': int(day[:6]),
+            'Year': int(day[:4]),
+            'FractionDate': 2025.0164,
+            'Actor1Code': COUNTRIES[c1] + type1,
+            'Actor1Name': f"ACTOR {rnd.randrange(5000)}",
+            'Actor1CountryCode': COUNTRIES[c1],
+            'Actor1Type1Code': type1,
+            'Actor2Code': COUNTRIES[c2] + type2,
+            'Actor2Name': f"ACTOR {rnd.randrange(5000)}",
+            'Actor2CountryCode': COUNTRIES[c2],
+            'Actor2Type1Code': type2,
+            'IsRootEvent': rnd.randint(0, 1),
+            'EventCode': f"{root:02d}{rnd.randint(0, 9)}",
+            'EventBaseCode': f"{root:02d}{rnd.randint(0, 9)}",
+            'EventRootCode': f"{root:02d}",
+            'QuadClass': rnd.randint(1, 4),
+            'GoldsteinScale': round(rnd.uniform(-10, 10), 1),
+            'NumMentions': rnd.randint(1, 50),
+            'NumSources': rnd.randint(1, 10),
+            'NumArticles': rnd.randint(1, 50),
+            'AvgTone': rnd.uniform(-10, 10),
+            'DATEADDED': _stamp(rnd, day),
+            'SOURCEURL': f"https://www.{rnd.choice(SOURCES)}/news/{day}/{i}.html",
+        })
+        if rnd.random() < 0.05:
+            values['Actor1KnownGroupCode'] = rnd.choice(('UNO', 'NAT', 'EEC', 'IMF'))
+        if rnd.random() < 0.05:
+            values['Actor1Religion1Code'] = rnd.choice(('CHR', 'MOS', 'JEW', 'HIN', 'BUD'))
+        if rnd.random() < 0.1:
+            values['Actor1Type2Code'] = rnd.choice(ACTOR_TYPES)
+
+        # The action happens mostly in Actor1's country; actor geo is often missing
+        action = PLACES_BY_FIPS[FIPS[c1]] if rnd.random() < 0.7 else GAZETTEER
+        _event_geo(values, 'ActionGeo', rnd.choice(action))
+        if rnd.random() < 0.85:
+            _event_geo(values, 'Actor1Geo', rnd.choice(PLACES_BY_FIPS[FIPS[c1]]))
+        if rnd.random() < 0.75:
+            _event_geo(values, 'Actor2Geo', rnd.choice(PLACES_BY_FIPS[FIPS[c2]]))
+        yield FakeRow(values)
+
+
+def make_event_rows(n: int, day: str = '20250106', seed: int = 0) -> list:
+    """Generate Events rows with BigQuery field names for one YYYYMMDD day."""
+    return list(iter_event_rows(n, day=day, seed=seed))
+
+
+def _gcam(rnd: random.Random, word_count: int) -> str:
+    """A GCAM field whose dimension count grows with the article, as in real records.
+
+    A 1,500 word article matches roughly 450 count and 40 score
+    dimensions, about 4 KB of text.
+    """
+    counts = sorted(set(rnd.choices(range(len(GCAM_COUNT_DIMENSIONS)), k=80 + word_count // 4)))
+    scores = sorted(set(rnd.choices(range(len(GCAM_VALUE_DIMENSIONS)), k=10 + word_count // 50)))
+    values = rnd.choices(_GCAM_COUNTS, _GCAM_COUNT_WEIGHTS, k=len(counts))
+    return ','.join(
+        [f"wc:{word_count}"]
+        + [f"{GCAM_COUNT_DIMENSIONS[d]}:{v}" for d, v in zip(counts, values)]
+        + [f"{GCAM_VALUE_DIMENSIONS[d]}:{rnd.uniform(-5, 5):.6f}" for d in scores]
+    )
+
+
+def _offsets(rnd: random.Random, k: int, length: int) -> list:
+    return sorted(rnd.randrange(length) for _ in range(k))
+
+
+def iter_gkg_rows(n: int, day: str = '20250106', seed: int = 0):
+    """Generate GKG rows with BigQuery field names for one YYYYMMDD day, one at a time.
+
+    Field sizes follow real GKG 2.1 records: a variable number of
+    locations, themes, names and counts per article, GCAM scaled to the
+    word count, and the V1 variants of the V2 fields alongside them.
+    """
+    rnd = random.Random(f"gkg-{day}-{seed}")
+    for i in range(n):
+        values = dict.fromkeys(GKG_FIELDS)
+        stamp = _stamp(rnd, day)
+        source = rnd.choice(SOURCES)
+        url = f"https://www.{source}/news/{day}/{i}.html"
+        word_count = rnd.randint(100, 3000)
+        length = word_count * 6
+
+        places = rnd.choices(range(len(GAZETTEER)), k=min(int(rnd.expovariate(1 / 6)), 40))
+        themes = rnd.choices(THEMES, k=rnd.randint(5, 60))
+        persons = rnd.choices(PERSONS, k=rnd.randint(0, 12))
+        organizations = rnd.choices(ORGANIZATIONS, k=rnd.randint(0, 8))
+        counts = [(rnd.choice(COUNT_TYPES), rnd.randint(1, 500), rnd.choice(WORDS),
+                   rnd.choice(places) if places else 0) for _ in range(rnd.choice((0, 0, 1, 2, 4)))]
+        tone = rnd.uniform(-10, 10)
+        values.update({
+            'GKGRECORDID': f"{stamp}-{i}",
+            'DATE': stamp,
+            'date_ts': datetime.strptime(str(stamp), '%Y%m%d%H%M%S').replace(tzinfo=timezone.utc),
+            'SourceCollectionIdentifier': 1,
+            'SourceCommonName': source,
+            'DocumentIdentifier': url,
+            'Counts': ''.join(f"{t}#{c}#{o}#{_V1_PLACES[p]};" for t, c, o, p in counts) or None,
+            'V2Counts': ''.join(f"{t}#{c}#{o}#{_V2_PLACES[p]}#{offset};" for (t, c, o, p), offset
+                                in zip(counts, _offsets(rnd, len(counts), length))) or None,
+            'Themes': ''.join(f"{theme};" for theme in sorted(set(themes))),
+            'V2Themes': ';'.join(f"{theme},{offset}" for theme, offset
+                                 in zip(themes, _offsets(rnd, len(themes), length))),
+            'Locations': ';'.join(_V1_PLACES[p] for p in sorted(set(places))) or None,
+            'V2Locations': ';'.join(f"{_V2_PLACES[p]}#{offset}" for p, offset
+                                    in zip(places, _offsets(rnd, len(places), length))) or None,
+            'Persons': ';'.join(sorted(set(persons))) or None,
+            'V2Persons': ';'.join(f"{name},{offset}" for name, offset
+                                  in zip(persons, _offsets(rnd, len(persons), length))) or None,
+            'Organizations': ';'.join(sorted(set(organizations))) or None,
+            'V2Organizations': ';'.join(f"{name},{offset}" for name, offset
+                                        in zip(organizations, _offsets(rnd, len(organizations), length)))
+                               or None,
+            'V2Tone': f"{tone:.2f},{max(tone, 0) + 2:.2f},{max(-tone, 0) + 2:.2f},{abs(tone) + 4:.2f},"
+                      f"{rnd.uniform(10, 30):.2f},{rnd.uniform(0, 2):.2f},{word_count}",
+            'GCAM': _gcam(rnd, word_count),
+            'SharingImage': f"https://www.{source}/img/{day}/{i}.jpg" if rnd.random() < 0.8 else None,
+            'AllNames': ';'.join(f"{name},{offset}" for name, offset
+                                 in zip(persons + organizations,
+                                        _offsets(rnd, len(persons) + len(organizations), length)))
+                        or None,
+            'Extras': f"<PAGE_TITLE>{' '.join(rnd.choices(WORDS, k=rnd.randint(5, 14))).capitalize()}"
+                      f"</PAGE_TITLE>",
+        })
+        if rnd.random() < 0.3:
+            values['Dates'] = f"1#0#0#{day[:4]}#{rnd.randrange(length)}"
+        if rnd.random() < 0.2:
+            values['RelatedImages'] = ';'.join(f"https://www.{source}/img/{day}/{i}-{k}.jpg"
+                                               for k in range(rnd.randint(1, 3)))
+        if rnd.random() < 0.05:
+            values['SocialVideoEmbeds'] = f"https://youtube.com/watch?v={rnd.randrange(10 ** 9):x};"
+        if rnd.random() < 0.3:
+            quotes = (' '.join(rnd.choices(WORDS, k=rnd.randint(8, 30)))
+                      for _ in range(rnd.randint(1, 3)))
+            values['Quotations'] = '#'.join(f"{rnd.randrange(length)}|{len(q)}|said|{q}" for q in quotes)
+        if rnd.random() < 0.3:
+            values['Amounts'] = ''.join(
+                f"{rnd.randint(2, 10 ** 6)},{rnd.choice(WORDS)},{rnd.randrange(length)};"
+                for _ in range(rnd.randint(1, 4))
+            )
+        if source in ('lemonde.fr', 'spiegel.de', 'xinhuanet.com'):
+            values['TranslationInfo'] = f"srclc:{source[-2:]};eng:GT-{source[-2:].upper()} 1.0"
+        yield FakeRow(values)
+
+
+def make_gkg_rows(n: int, day: str = '20250106', seed: int = 0) -> list:
+    """Generate GKG rows with BigQuery field names for one YYYYMMDD day."""
+    return list(iter_gkg_rows(n, day=day, seed=seed))
+
+
+# =============================================================================
+# FAKE CLIENT
+# =============================================================================
+
+class FakeRowIterator:
+    """Minimal RowIterator: iteration, .pages, .total_rows and Arrow export.
+
+    Each page (or Arrow batch) waits page_latency seconds, like a network
+    round trip. rows may also be a lazy iterator of total_rows rows, whose
+    pages are then generated as they are read. on_page, if given, is
+    called with the seconds each page took to produce.
+    """
+
+    def __init__(self, rows, page_size: int = None, table=None, fields: tuple = (),
+                 page_latency: float = 0.0, total_rows: int = None, on_page=None):
+        self._rows = rows
+        self.total_rows = len(rows) if total_rows is None else total_rows
+        self._page_size = page_size or self.total_rows or 1
+        self._table = table
+        self._fields = fields
+        self._page_latency = page_latency
+        self._on_page = on_page
+
+    def _timed(self, pages):
+        """Yield each page after the simulated latency."""
+        while True:
+            started = time.perf_counter()
+            page = next(pages, None)
+            if page is None:
+                return
+            time.sleep(self._page_latency)
+            if self._on_page is not None:
+                self._on_page(time.perf_counter() - started)
+            yield page
+
+    def _row_pages(self):
+        rows = iter(self._rows)
+        while True:
+            page = list(islice(rows, self._page_size))
+            if not page:
+                return
+            yield page
+
+    @property
+    def pages(self):
+        return self._timed(self._row_pages())
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def to_arrow(self, **kwargs):
+        if self._table is None:
+            self._table = rows_to_arrow(list(self._rows), self._fields)
+        return self._table
+
+    def to_arrow_iterable(self, bqstorage_client=None, **kwargs):
+        if self._table is None and not isinstance(self._rows, list):
+            # Lazy rows: convert page by page instead of building the whole table
+            schema = arrow_schema(self._fields)
+            batches = (pa.RecordBatch.from_pylist([row._values for row in page], schema=schema)
+                       for page in self._row_pages())
+        else:
+            batches = iter(self.to_arrow().to_batches(max_chunksize=self._page_size))
+        yield from self._timed(batches)
+
+
+class FakeQueryJob:
+    """Minimal QueryJob returned by FakeClient.query; a dry run only reports its bytes.
+
+    Lazily generated rows are not counted, so their job reports no bytes.
+    """
+
+    def __init__(self, rows, job_config=None, table=None, fields: tuple = (),
+                 page_latency: float = 0.0, total_rows: int = None, on_page=None):
+        self._rows = rows
+        self._table = table
+        self._fields = fields
+        self._page_latency = page_latency
+        self._total_rows = total_rows
+        self._on_page = on_page
+        self.job_config = job_config
+        self.total_bytes_processed = sum(
+            len(str(v)) for row in rows for _, v in row.items() if v is not None
+        ) if isinstance(rows, list) else None
+        if getattr(job_config, 'dry_run', False):
+            self._rows, self._table, self._total_rows = [], None, None
+
+    def result(self, page_size: int = None, **kwargs) -> FakeRowIterator:
+        return FakeRowIterator(self._rows, page_size=page_size, table=self._table, fields=self._fields,
+                               page_latency=self._page_latency, total_rows=self._total_rows,
+                               on_page=self._on_page)
+
+
+class FakeClient:
+    """Drop-in stand-in for bigquery.Client that generates rows per query.
+
+    The dataset (Events or GKG) and the day are read from the SQL text,
+    so the same client can serve both fetchers and any date range. With
+    a fixture (an Arrow table of recorded results) every query returns
+    those rows instead, already materialized in both row and Arrow form.
+    Parameterized conditions (shard ranges and pushed-down filters) are
+    applied to the rows, and page_latency simulates the per-page round
+    trip.
+
+    With streaming=True each query generates its rows while its pages are
+    read and keeps none of them, so memory stays flat at any row count;
+    such a client only serves plain full-day queries. source_seconds adds
+    up the time spent producing pages, latency included.
+    """
+
+    def __init__(self, rows_per_day: int = 1000, project: str = 'fake-project', seed: int = 0,
+                 fixture=None, page_latency: float = 0.0, streaming: bool = False):
+        self.project = project
+        self.rows_per_day = rows_per_day
+        self.seed = seed
+        self.page_latency = page_latency
+        self.streaming = streaming
+        self.source_seconds = 0.0
+        self.queries = []
+        self._lock = threading.Lock()
+        self._days = {}
+        self._fixture = fixture
+        self._fixture_rows = arrow_to_rows(fixture) if fixture is not None else None
+
+    def query(self, query: str, job_config=None) -> FakeQueryJob:
+        with self._lock:
+            self.queries.append(query)
+
+        if self._fixture is not None:
+            return FakeQueryJob(self._fixture_rows, job_config=job_config, table=self._fixture,
+                                fields=tuple(self._fixture.column_names),
+                                page_latency=self.page_latency, on_page=self._add_source)
+
+        day = re.search(r"(\d{4})-?(\d{2})-?(\d{2})", query)
+        day = ''.join(day.groups()) if day else '20250106'
+        limit = re.search(r"LIMIT\s+(\d+)", query)
+        n = min(self.rows_per_day, int(limit.group(1))) if limit else self.rows_per_day
+
+        # Incremental queries: '<DATEADDED|DATE> > watermark ORDER BY ...'
+        since = re.search(r"\b(DATEADDED|DATE)\s*>\s*(\d+)", query)
+        keep = parameter_filter(query, query_parameters(job_config))
+        sample = re.search(r"TABLESAMPLE SYSTEM \(([\d.]+) PERCENT\)", query)
+        # A dry run estimates the full scan, which LIMIT does not reduce
+        if getattr(job_config, 'dry_run', False):
+            n = self.rows_per_day
+        generate = self.rows_per_day if since or keep or sample else n
+
+        dataset = 'gkg' if 'gkg' in query.lower() else 'events'
+        fields = GKG_FIELDS if dataset == 'gkg' else EVENT_FIELDS
+        if self.streaming:
+            if since or keep or sample:
+                raise ValueError("a streaming FakeClient cannot apply filters, shards, samples "
+                                 "or watermarks")
+            iter_rows = iter_gkg_rows if dataset == 'gkg' else iter_event_rows
+            rows = iter_rows(n, day=day, seed=self.seed)
+        else:
+            rows = self._day_rows(dataset, day, generate)
+
+        if keep:
+            rows = [r for r in rows if keep(r)]
+        # TABLESAMPLE SYSTEM: a different random subset on every query
+        if sample:
+            rate = float(sample.group(1)) / 100
+            rows = [r for r in rows if random.random() < rate]
+        if since:
+            column, watermark = since.group(1), int(since.group(2))
+            rows = sorted((r for r in rows if r.get(column) > watermark), key=lambda r: r.get(column))
+        if not self.streaming:
+            rows = rows[:n]
+
+        # Only the selected columns come back (and count as processed bytes)
+        selected = [name for name in selected_fields(query) if name in fields]
+        if selected and len(selected) < len(fields):
+            rows, fields = project_rows(rows, selected), tuple(selected)
+        return FakeQueryJob(rows, job_config=job_config, fields=fields, page_latency=self.page_latency,
+                            total_rows=n if self.streaming else None, on_page=self._add_source)
+
+    def _add_source(self, seconds: float):
+        with self._lock:
+            self.source_seconds += seconds
+
+    def _day_rows(self, dataset: str, day: str, n: int) -> list:
+        """Synthetic rows of a day, generated once and shared by concurrent shard queries."""
+        key = (dataset, day, n)
+        with self._lock:
+            if key not in self._days:
+                make_rows = make_gkg_rows if dataset == 'gkg' else make_event_rows
+                self._days[key] = make_rows(n, day=day, seed=self.seed)
+            return self._days[key]
@@ -0,0 +1,1917 @@
+#!/usr/bin/env python3
+"""
+GDELT Ingestion Common Helpers
+Shared plumbing for the daily Events and GKG fetchers.
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Arrow transport and the Parquet sink are optional
+    pa = pc = pq = None
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+BATCH_SIZE = 5000       # rows per BigQuery page / writer batch
+QUEUE_DEPTH = 4         # batches buffered between fetcher and writer
+BACKFILL_WORKERS = 4    # concurrent days in a --start/--end backfill
+MAX_RECORDS = 100000    # LIMIT of a day's query
+
+PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gdelt-483607")
+
+# Connection settings for bulk loads: trade crash durability of the
+# in-flight load for throughput (a failed load is simply re-run). The
+# rollback journal is kept: WAL writes every page twice, which cost the
+# wide GKG rows more than it saved.
+LOADER_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -262144",      # 256 MiB
+    "PRAGMA mmap_size = 1073741824",    # 1 GiB
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Bulk loads drop the secondary indexes and rebuild them at the end only
+# once this many rows are written; below it the rebuild costs about what
+# it saves (see bench_store.py)
+BULK_INDEX_ROWS = 50000
+
+PARQUET_COMPRESSION = 'zstd'
+
+CACHE_MAX_BYTES = 10 * 1024 ** 3   # local query result cache, LRU-evicted above this
+CACHE_COMPRESSION = 'zstd'
+
+DB_DIR = Path("db")     # daily databases, Parquet partitions and the result cache
+
+# Hive partition key of the Parquet trees; not 'date', which GKG rows
+# already carry as a column of a different type
+PARQUET_PARTITION_KEY = 'day'
+
+
+def day_db_path(dataset: str, target_date: str) -> Path:
+    """Daily database of a dataset ('events' or 'gkg') for one date."""
+    return DB_DIR / f"{dataset}_{target_date.replace('-', '')}.db"
+
+
+def day_parquet_dir(dataset: str, target_date: str) -> Path:
+    """Hive partition directory of one day in a dataset's Parquet tree."""
+    return DB_DIR / dataset / f"{PARQUET_PARTITION_KEY}={target_date.replace('-', '')}"
+
+
+class LoadStats:
+    """Row count and wall time of one load."""
+
+    def __init__(self, rows: int = 0, seconds: float = 0.0):
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return f"{self.rows} rows in {self.seconds:.2f}s ({self.rows_per_sec:,.0f} rows/s)"
+
+
+# =============================================================================
+# INGEST STATE
+# =============================================================================
+
+STATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS ingest_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+"""
+
+
+def get_state(conn: sqlite3.Connection, key: str, default=None):
+    """Read a value from the ingest_state table."""
+    row = conn.execute("SELECT value FROM ingest_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def set_state(conn: sqlite3.Connection, key: str, value):
+    """Write a value to the ingest_state table."""
+    conn.execute(
+        "INSERT OR REPLACE INTO ingest_state (key, value) VALUES (?, ?)",
+        (key, None if value is None else str(value)),
+    )
+
+
+def is_day_complete(db_path: Path) -> bool:
+    """Check whether a daily database holds a finished full-day load."""
+    if not db_path.exists():
+        return False
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return get_state(conn, 'complete') == '1'
+    except sqlite3.OperationalError:
+        # Written before ingest_state existed
+        return False
+    finally:
+        conn.close()
+
+
+def is_day_closed(target_date: str, lag_days: int = 0) -> bool:
+    """True once the UTC day plus lag_days is over, i.e. a full-day fetch cannot grow."""
+    day_end = datetime.strptime(target_date, '%Y-%m-%d') + timedelta(days=1 + lag_days)
+    return datetime.now(timezone.utc).replace(tzinfo=None) >= day_end
+
+
+# =============================================================================
+# BULK LOADING
+# =============================================================================
+
+def apply_loader_pragmas(conn: sqlite3.Connection):
+    """Switch a connection to bulk-load settings."""
+    for pragma in LOADER_PRAGMAS:
+        conn.execute(pragma)
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection, table: str) -> list:
+    """Drop the explicit non-unique indexes on a table and return their DDL.
+
+    Unique indexes are kept since inserts rely on them for conflict handling.
+    """
+    dropped = []
+    for _, name, unique, origin, _ in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        if unique or origin != 'c':
+            continue
+        sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+        ).fetchone()[0]
+        conn.execute(f"DROP INDEX {name}")
+        dropped.append(sql)
+    return dropped
+
+
+def create_indexes(conn: sqlite3.Connection, index_sql: list):
+    """Recreate indexes from their saved DDL."""
+    for sql in index_sql:
+        conn.execute(sql)
+
+
+def sqlite_column_types(table_sql: str) -> dict:
+    """Declared type of every column of a CREATE TABLE statement."""
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.execute(table_sql)
+        table = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchone()[0]
+        return {name: decl_type.upper() for _, name, decl_type, _, _, _
+                in conn.execute(f"PRAGMA table_info({table})")}
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# DICTIONARY ENCODING
+# =============================================================================
+
+# Under the compact schema a table's low-cardinality TEXT columns hold
+# integer keys into the shared dict_text table. Rows live in <table>_base
+# and a view named <table> decodes the keys, so readers keep the original
+# table and column names. Decoding every row is slow to group on, so
+# gdelt_query groups on the keys in <table>_base and decodes the groups.
+
+DICT_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS dict_text (
+        id INTEGER PRIMARY KEY,
+        value TEXT NOT NULL UNIQUE
+    )
+"""
+
+
+def storage_table(conn: sqlite3.Connection, table: str, compact: bool = False) -> str:
+    """Name of the table holding a dataset's rows: <table>_base under the compact schema.
+
+    The schema is fixed when a database is created; compact only decides
+    it for a database without the table yet.
+    """
+    base = f"{table}_base"
+    names = {name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)", (table, base)
+    )}
+    if base in names:
+        return base
+    if table in names:
+        return table
+    return base if compact else table
+
+
+def compact_table_sql(table_sql: str, table: str, dict_columns) -> str:
+    """CREATE TABLE of <table>_base: table_sql renamed, with dict_columns as INTEGER keys."""
+    head, sep, body = table_sql.partition('(')
+    lines = []
+    for line in body.split('\n'):
+        words = line.split()
+        if len(words) > 1 and words[0] in dict_columns:
+            # Keep whatever follows the type, e.g. the trailing comma
+            line = line.replace(f"{words[0]} {words[1].rstrip(',')}", f"{words[0]} INTEGER", 1)
+        lines.append(line)
+    return head.replace(f" {table} ", f" {table}_base ") + sep + '\n'.join(lines)
+
+
+def create_dict_view(conn: sqlite3.Connection, table: str, dict_columns):
+    """(Re)create the view <table> over <table>_base, decoding the dict columns."""
+    base = f"{table}_base"
+    select = [
+        f"(SELECT value FROM dict_text WHERE id = b.{column}) AS {column}"
+        if column in dict_columns else f"b.{column}"
+        for _, column, *_ in conn.execute(f"PRAGMA table_info({base})")
+    ]
+    conn.execute(f"DROP VIEW IF EXISTS {table}")
+    conn.execute(f"CREATE VIEW {table} AS SELECT {', '.join(select)} FROM {base} b")
+
+
+def dict_view_columns(conn: sqlite3.Connection, table: str) -> set:
+    """Columns the <table> view decodes from dict_text keys (none without the compact schema).
+
+    They are the columns stored as INTEGER keys in <table>_base that the
+    view turns back into TEXT.
+    """
+    stored = {column: decl_type.upper() for _, column, decl_type, *_
+              in conn.execute(f"PRAGMA table_info({table}_base)")}
+    if not stored:
+        return set()
+    return {column for _, column, decl_type, *_ in conn.execute(f"PRAGMA table_info({table})")
+            if stored.get(column) == 'INTEGER' and decl_type.upper() == 'TEXT'}
+
+
+class DictEncoder:
+    """Replaces the values at some positions of row tuples with dict_text keys.
+
+    Keys are cached for the life of one sink: a rolled-back batch can
+    leave cached keys that were never committed, so every sink starts a
+    new encoder.
+    """
+
+    def __init__(self, positions):
+        self.positions = tuple(positions)
+        self.ids = None
+
+    def encode(self, cursor, rows: list) -> list:
+        ids = self.ids
+        if ids is None:
+            ids = self.ids = dict(cursor.execute("SELECT value, id FROM dict_text"))
+        positions = self.positions
+        for value in {row[i] for row in rows for i in positions} - ids.keys():
+            if value is not None:
+                ids[value] = cursor.execute(
+                    "INSERT INTO dict_text (value) VALUES (?)", (value,)
+                ).lastrowid
+        encoded = []
+        for row in rows:
+            row = list(row)
+            for i in positions:
+                if row[i] is not None:
+                    row[i] = ids[row[i]]
+            encoded.append(tuple(row))
+        return encoded
+
+
+# =============================================================================
+# URL HASH
+# =============================================================================
+
+# events.source_url and gkg.document_identifier name the same articles;
+# both tables store url_hash(url) in an indexed url_hash column to join on.
+
+_DEFAULT_PORTS = (':80', ':443')
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL for matching across datasets.
+
+    Drops the scheme, a leading 'www.', default ports, the fragment and a
+    trailing slash, and lowercases the host; the path and query are kept.
+    """
+    url = url.strip().partition('#')[0]
+    scheme, sep, rest = url.partition('://')
+    if not sep:
+        rest = scheme
+    end = len(rest)
+    for delimiter in '/?':
+        at = rest.find(delimiter)
+        if at != -1:
+            end = min(end, at)
+    host, tail = rest[:end].lower(), rest[end:]
+    if host.startswith('www.'):
+        host = host[4:]
+    if host.endswith(_DEFAULT_PORTS):
+        host = host.rpartition(':')[0]
+    path, query_sep, query = tail.partition('?')
+    return host + path.rstrip('/') + query_sep + query
+
+
+def url_hash(url: str):
+    """64-bit signed BLAKE2b hash of a normalized URL (fits an SQLite INTEGER), or None."""
+    if not url:
+        return None
+    digest = hashlib.blake2b(normalize_url(url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def backfill_url_hash(conn: sqlite3.Connection, table: str, url_column: str) -> int:
+    """Fill url_hash for rows stored before the column existed; returns rows updated."""
+    conn.create_function('url_hash', 1, url_hash, deterministic=True)
+    return conn.execute(
+        f"UPDATE {table} SET url_hash = url_hash({url_column}) "
+        f"WHERE url_hash IS NULL AND {url_column} IS NOT NULL"
+    ).rowcount
+
+
+# =============================================================================
+# FULL-TEXT SEARCH
+# =============================================================================
+
+# Underscores stay inside tokens so GDELT theme codes (TAX_FNCACT) are
+# single words; diacritics are folded so 'cafe' matches 'Café'.
+FTS_TOKENIZE = "unicode61 remove_diacritics 2 tokenchars '_'"
+
+
+def create_fts_index(conn: sqlite3.Connection, table: str, fts_table: str, columns) -> bool:
+    """Create an FTS5 index over text columns of a table, kept in sync by triggers.
+
+    The index is external-content: it holds only the inverted index and
+    reads column values back from the table (rowid = id) for snippets.
+    Rows already in the table are indexed on creation. Returns False if
+    the index already exists.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+    ).fetchone()
+    if exists:
+        return False
+
+    names = ', '.join(columns)
+    new = ', '.join(f"new.{column}" for column in columns)
+    old = ', '.join(f"old.{column}" for column in columns)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5({names}, content='{table}', "
+        f"content_rowid='id', tokenize=\"{FTS_TOKENIZE}\")"
+    )
+    conn.execute(f"""
+        CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table}(rowid, {names}) VALUES (new.id, {new});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {names}) VALUES ('delete', old.id, {old});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {names}) VALUES ('delete', old.id, {old});
+            INSERT INTO {fts_table}(rowid, {names}) VALUES (new.id, {new});
+        END
+    """)
+    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    return True
+
+
+def fts_search_sql(table: str, fts_table: str, columns, snippet_tokens: int = 12) -> str:
+    """Query for rows matching an FTS5 expression (first ?), best bm25 rank first.
+
+    Returns the given columns, the rank and a snippet of the best matching
+    column with hits in [brackets]; the second ? is the row limit.
+    """
+    select = ', '.join(f"{table}.{column}" for column in columns)
+    return (
+        f"SELECT {select}, bm25({fts_table}) AS rank, "
+        f"snippet({fts_table}, -1, '[', ']', '…', {snippet_tokens}) AS snippet "
+        f"FROM {fts_table} JOIN {table} ON {table}.id = {fts_table}.rowid "
+        f"WHERE {fts_table} MATCH ? ORDER BY rank LIMIT ?"
+    )
+
+
+# =============================================================================
+# SPATIAL INDEX
+# =============================================================================
+
+# geo_rtree holds one point per coordinate pair of a row, keyed
+# row id * GEO_SLOTS + slot so id / GEO_SLOTS is the row's id. The R*Tree
+# stores float32 boxes; exact lat/lon are kept as auxiliary columns.
+GEO_SLOTS = 1024
+GEO_RTREE_SQL = """
+    CREATE VIRTUAL TABLE geo_rtree USING rtree(
+        id, min_lat, max_lat, min_lon, max_lon, +lat, +lon, +kind
+    )
+"""
+EARTH_RADIUS_KM = 6371.0088
+
+
+def create_geo_index(conn: sqlite3.Connection) -> bool:
+    """Create the geo_rtree point index; returns False if it already exists."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'geo_rtree'"
+    ).fetchone()
+    if exists:
+        return False
+    conn.execute(GEO_RTREE_SQL)
+    return True
+
+
+def geo_delete_sql(row_id: str, last_slot: str) -> str:
+    """Statement deleting the points of a row, slots 0..last_slot (SQL expressions).
+
+    The R*Tree only looks up ids by equality, so the slot ids are listed
+    rather than deleted as a range.
+    """
+    return (
+        f"DELETE FROM geo_rtree WHERE id IN ("
+        f"WITH RECURSIVE slot(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM slot "
+        f"WHERE n < MIN({last_slot}, {GEO_SLOTS - 1})) "
+        f"SELECT {row_id} * {GEO_SLOTS} + n FROM slot)"
+    )
+
+
+def geo_box_query(table: str, columns, min_lat: float, min_lon: float, max_lat: float,
+                  max_lon: float, kind=None) -> tuple:
+    """(sql, params) selecting the rows with a point inside a lat/lon box.
+
+    Returns the given columns plus the point's kind, lat and lon. A box
+    with min_lon > max_lon crosses the antimeridian and is searched as
+    two halves.
+    """
+    select = ', '.join(f"{table}.{column}" for column in columns)
+    part = (
+        f"SELECT {select}, geo_rtree.kind, geo_rtree.lat, geo_rtree.lon "
+        f"FROM geo_rtree CROSS JOIN {table} ON {table}.id = geo_rtree.id / {GEO_SLOTS} "
+        f"WHERE geo_rtree.min_lat <= ? AND geo_rtree.max_lat >= ? "
+        f"AND geo_rtree.min_lon <= ? AND geo_rtree.max_lon >= ? "
+        f"AND geo_rtree.lat BETWEEN ? AND ? AND geo_rtree.lon BETWEEN ? AND ?"
+    )
+    if kind is not None:
+        part += " AND geo_rtree.kind = ?"
+    spans = [(min_lon, 180.0), (-180.0, max_lon)] if min_lon > max_lon else [(min_lon, max_lon)]
+    params = []
+    for lo, hi in spans:
+        params += [max_lat, min_lat, hi, lo, min_lat, max_lat, lo, hi]
+        if kind is not None:
+            params.append(kind)
+    return ' UNION ALL '.join([part] * len(spans)), tuple(params)
+
+
+def radius_box(lat: float, lon: float, radius_km: float) -> tuple:
+    """(min_lat, min_lon, max_lat, max_lon) enclosing a circle on the sphere.
+
+    Circles over a pole take every longitude; min_lon > max_lon means the
+    box crosses the antimeridian.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat, max_lat = lat - math.degrees(angle), lat + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90 or angle >= math.pi / 2:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    delta = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+    if delta >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lon, max_lon = lon - delta, lon + delta
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# =============================================================================
+# ROLLUPS
+# =============================================================================
+
+# A rollup spec is (table, keys, measures): keys are (column, sql_type,
+# expression) and measures (column, sql_type, aggregate) over the source
+# table. Measures must be additive (COUNT, TOTAL, ...) since increments
+# are added onto the stored rows; keys must not be NULL (use IFNULL).
+
+
+def create_rollup(conn: sqlite3.Connection, spec: tuple):
+    """Create a rollup table keyed on its key columns."""
+    table, keys, measures = spec
+    columns = [f"{name} {sql_type} NOT NULL" for name, sql_type, _ in keys]
+    columns += [f"{name} {sql_type}" for name, sql_type, _ in measures]
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            {', '.join(columns)},
+            PRIMARY KEY ({', '.join(name for name, _, _ in keys)})
+        ) WITHOUT ROWID
+    """)
+
+
+def rollup_upsert_sql(spec: tuple, select: str = None) -> str:
+    """INSERT adding rows (from select, or one row of ? values) onto a rollup."""
+    table, keys, measures = spec
+    names = [name for name, _, _ in keys + measures]
+    source = select or f"VALUES ({', '.join('?' * len(names))})"
+    return (
+        f"INSERT INTO {table} ({', '.join(names)}) {source} "
+        f"ON CONFLICT({', '.join(name for name, _, _ in keys)}) DO UPDATE SET "
+        f"{', '.join(f'{name} = {name} + excluded.{name}' for name, _, _ in measures)}"
+    )
+
+
+def update_rollups(conn: sqlite3.Connection, source: str, specs, state_key: str = 'rollup_id') -> int:
+    """Add source rows past the state_key id watermark onto each rollup.
+
+    Rows are only ever inserted with growing ids, so each run folds in
+    just the rows loaded since the last one. Returns the rows added.
+    """
+    last = int(get_state(conn, state_key, 0))
+    end, added = conn.execute(
+        f"SELECT MAX(id), COUNT(*) FROM {source} WHERE id > ?", (last,)
+    ).fetchone()
+    if not added:
+        return 0
+    for spec in specs:
+        _, keys, measures = spec
+        select = (
+            f"SELECT {', '.join(expr for _, _, expr in keys + measures)} FROM {source} "
+            f"WHERE id > ? AND id <= ? GROUP BY {', '.join(map(str, range(1, len(keys) + 1)))}"
+        )
+        conn.execute(rollup_upsert_sql(spec, select), (last, end))
+    set_state(conn, state_key, end)
+    return added
+
+
+def reset_rollups(conn: sqlite3.Connection, specs, state_key: str = 'rollup_id'):
+    """Empty the rollups so the next update rebuilds them from every row."""
+    for table, _, _ in specs:
+        conn.execute(f"DELETE FROM {table}")
+    set_state(conn, state_key, 0)
+
+
+# =============================================================================
+# FIELD PROFILES
+# =============================================================================
+
+# Per-row conversion of each field kind (see ARROW TRANSPORT for the table)
+KIND_CONVERTERS = {
+    'text': lambda v: v,
+    'str': lambda v: str(v) if v else None,
+    'str_nn': lambda v: str(v) if v is not None else None,
+    'int': lambda v: int(v) if v is not None else None,
+    'int_nz': lambda v: int(v) if v else None,
+    'float': lambda v: float(v) if v is not None else None,
+    'float_nz': lambda v: float(v) if v else None,
+    'ts': lambda v: str(v) if v else None,
+}
+
+
+def resolve_fields(fields, profiles: dict, spec: str, required=()) -> tuple:
+    """Field specs for a --fields value: a profile name or a comma-separated column list.
+
+    Required columns (keys and watermarks) are always included and the
+    original field order is kept.
+    """
+    known = {column for column, _, _ in fields}
+    if spec in profiles:
+        wanted = set(profiles[spec])
+    else:
+        wanted = {column.strip() for column in spec.split(',') if column.strip()}
+        unknown = wanted - known
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))} "
+                             f"(profiles: {', '.join(profiles)})")
+    wanted |= set(required)
+    return tuple(field for field in fields if field[0] in wanted)
+
+
+def make_row_converter(fields):
+    """Build a BigQuery Row -> row tuple converter for a field spec.
+
+    Values come out in field order, which is the column order of the
+    table's INSERT, so rows go to the sinks as they are.
+    """
+    specs = [(bq_field, KIND_CONVERTERS[kind]) for _, bq_field, kind in fields]
+
+    def convert(row) -> tuple:
+        return tuple([convert_value(row[bq_field]) for bq_field, convert_value in specs])
+    return convert
+
+
+def select_list(fields, expressions: dict = None) -> str:
+    """SELECT list for a field spec; expressions maps computed fields to their SQL."""
+    expressions = expressions or {}
+    return ',\n            '.join(expressions.get(bq_field, bq_field) for _, bq_field, _ in fields)
+
+
+def project_table_sql(table_sql: str, columns) -> str:
+    """Cut a CREATE TABLE statement down to its id column and the given columns."""
+    head, _, rest = table_sql.partition('(')
+    body, _, tail = rest.rpartition(')')
+    lines = [line for line in body.splitlines() if line.strip()]
+    indent = lines[0][:len(lines[0]) - len(lines[0].lstrip())]
+    closing = body[body.rfind('\n') + 1:]
+    keep = set(columns) | {'id'}
+    kept = [indent + line.strip().rstrip(',') for line in lines if line.split()[0] in keep]
+    return f"{head}(\n" + ',\n'.join(kept) + f"\n{closing})" + tail
+
+
+def add_missing_columns(conn: sqlite3.Connection, table: str, table_sql: str, columns) -> list:
+    """ALTER TABLE ADD the given columns a database does not have yet; returns them."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    types = sqlite_column_types(table_sql)
+    added = [column for column in columns if column not in existing]
+    for column in added:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {types[column]}")
+    return added
+
+
+# =============================================================================
+# FILTERS
+# =============================================================================
+
+# Filter specs are (name, predicate, BigQuery type) tuples. The predicate
+# refers to its value as @name; list values are bound as ARRAY parameters
+# and scalars as scalar parameters, so no value is ever part of the SQL.
+
+def compile_filters(specs, values: dict) -> tuple:
+    """(WHERE predicates, query parameters) of the filters given a value."""
+    from google.cloud import bigquery
+
+    predicates, parameters = [], []
+    for name, predicate, param_type in specs:
+        value = values.get(name)
+        if value is None:
+            continue
+        predicates.append(predicate)
+        if isinstance(value, (list, tuple)):
+            parameters.append(bigquery.ArrayQueryParameter(name, param_type, list(value)))
+        else:
+            parameters.append(bigquery.ScalarQueryParameter(name, param_type, value))
+    return predicates, parameters
+
+
+def describe_filters(values: dict) -> str:
+    """'countries=US,UK; min_goldstein=2.0' for logging."""
+    return '; '.join(
+        f"{name}={','.join(map(str, value)) if isinstance(value, (list, tuple)) else value}"
+        for name, value in values.items()
+    )
+
+
+# Sampling keeps a fraction of a day's rows. 'hash' compares a fingerprint
+# of the record id against a threshold, so a rate always selects the same
+# rows (and a smaller rate a subset of them) but the scan is billed in
+# full. 'table' uses TABLESAMPLE SYSTEM, which skips storage blocks and
+# shrinks billed bytes, but returns different rows on every run.
+SAMPLE_METHODS = ('hash', 'table')
+SAMPLE_BUCKETS = 1000000
+
+
+def sample_filter(key_field: str) -> tuple:
+    """Filter spec keeping the rows whose key_field hashes below @sample_buckets."""
+    return ('sample_buckets',
+            f"MOD(ABS(FARM_FINGERPRINT(CAST({key_field} AS STRING))), {SAMPLE_BUCKETS}) "
+            f"< @sample_buckets",
+            'INT64')
+
+
+def sample_values(rate: float, method: str) -> dict:
+    """Filter values of a hash sample ({} for no sampling or a table sample)."""
+    if rate is None or method != 'hash':
+        return {}
+    return {'sample_buckets': round(rate * SAMPLE_BUCKETS)}
+
+
+def table_sample(rate: float, method: str) -> str:
+    """TABLESAMPLE clause of a table sample ('' otherwise)."""
+    if rate is None or method != 'table':
+        return ''
+    return f" TABLESAMPLE SYSTEM ({rate * 100:g} PERCENT)"
+
+
+def sample_fraction(value: str) -> float:
+    """argparse type for --sample-rate: a fraction in (0, 1]."""
+    rate = float(value)
+    if not 0 < rate <= 1:
+        raise ValueError(value)
+    return rate
+
+
+def comma_list(cast=str):
+    """argparse type for comma-separated values (use with action='extend')."""
+    def parse(value: str) -> list:
+        return [cast(item.strip()) for item in value.split(',') if item.strip()]
+    parse.__name__ = f"{getattr(cast, '__name__', 'value')} list"
+    return parse
+
+
+# =============================================================================
+# ARROW TRANSPORT
+# =============================================================================
+
+# Field specs are (column, bigquery_field, kind) tuples. The kind mirrors
+# the per-row conversion the fetchers apply to that field:
+#   text      value as returned
+#   str       str(v) if v else None
+#   str_nn    str(v) if v is not None else None
+#   int       int(v) if v is not None else None
+#   int_nz    int(v) if v else None
+#   float     float(v) if v is not None else None
+#   float_nz  float(v) if v else None
+#   ts        str(v) of a UTC timestamp ('YYYY-MM-DD HH:MM:SS+00:00')
+
+def make_read_client(client):
+    """BigQuery Storage Read API client for a query client, or None.
+
+    None makes to_arrow_iterable fall back to paged REST downloads, which
+    is also what happens when google-cloud-bigquery-storage is missing.
+    """
+    ensure = getattr(client, '_ensure_bqstorage_client', None)
+    if ensure is None:
+        return None
+    try:
+        return ensure()
+    except Exception:
+        return None
+
+
+def require_arrow():
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Arrow transport (pip install pyarrow)")
+
+
+def _null_if_falsy(array):
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        return pc.if_else(pc.equal(array, ''), None, array)
+    if pa.types.is_integer(array.type) or pa.types.is_floating(array.type):
+        return pc.if_else(pc.equal(array, 0), None, array)
+    return array
+
+
+def coerce_arrow_column(array, kind: str):
+    """Apply a field kind to a whole Arrow column at once."""
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if kind == 'text':
+        return array
+    if kind in ('str', 'int_nz', 'float_nz'):
+        array = _null_if_falsy(array)
+    if kind in ('str', 'str_nn'):
+        return array.cast(pa.string())
+    if kind in ('int', 'int_nz'):
+        return array.cast(pa.int64())
+    if kind in ('float', 'float_nz'):
+        return array.cast(pa.float64())
+    if kind == 'ts':
+        if pa.types.is_timestamp(array.type):
+            return pc.strftime(array.cast(pa.timestamp('s', tz='UTC')), format='%Y-%m-%d %H:%M:%S+00:00')
+        return array.cast(pa.string())
+    raise ValueError(f"Unknown field kind: {kind}")
+
+
+def coerce_arrow_batch(batch, fields) -> list:
+    """Convert a raw BigQuery record batch into columns in field-spec order."""
+    return [coerce_arrow_column(batch.column(bq_field), kind) for _, bq_field, kind in fields]
+
+
+def arrow_columns_to_rows(columns: list) -> list:
+    """Transpose coerced Arrow columns into positional row tuples."""
+    return list(zip(*(column.to_pylist() for column in columns)))
+
+
+def arrow_type(kind: str):
+    """Arrow type of the values a field kind produces."""
+    if kind in ('text', 'str', 'str_nn'):
+        return pa.string()
+    if kind in ('int', 'int_nz'):
+        return pa.int64()
+    if kind in ('float', 'float_nz'):
+        return pa.float64()
+    if kind == 'ts':
+        return pa.timestamp('s', tz='UTC')
+    raise ValueError(f"Unknown field kind: {kind}")
+
+
+def arrow_schema(fields, column_types: dict = None):
+    """Arrow schema for a field spec, in column order.
+
+    column_types maps columns to their declared SQLite types (see
+    sqlite_column_types) so Parquet stores what the SQLite schema stores;
+    timestamps stay timestamps.
+    """
+    columns = []
+    for column, _, kind in fields:
+        declared = (column_types or {}).get(column)
+        if kind != 'ts' and declared in SQLITE_ARROW_TYPES:
+            columns.append((column, SQLITE_ARROW_TYPES[declared]()))
+        else:
+            columns.append((column, arrow_type(kind)))
+    return pa.schema(columns)
+
+
+SQLITE_ARROW_TYPES = {
+    'INTEGER': lambda: pa.int64(),
+    'REAL': lambda: pa.float64(),
+    'TEXT': lambda: pa.string(),
+}
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+class ResultCache:
+    """Content-addressed cache of raw query results as compressed Arrow IPC files.
+
+    Entries are keyed by a hash of the SQL text, date and project and hold
+    the record batches exactly as BigQuery returned them, so any later
+    conversion or storage change can be replayed offline. File mtimes
+    track use; the least recently used entries are evicted once the cache
+    grows past max_bytes. With refresh set, lookups always miss and the
+    fresh results replace the cached ones.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = CACHE_MAX_BYTES, refresh: bool = False,
+                 log=print):
+        require_arrow()
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.log = log
+
+    @staticmethod
+    def key(sql: str, target_date: str, project: str, parameters: dict = None) -> str:
+        """Entry key; parameters are the values bound to the query's @parameters."""
+        parts = (sql, target_date, project)
+        if parameters:
+            parts += (repr(sorted(parameters.items())),)
+        return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.arrow"
+
+    def read(self, key: str, batch_size: int = None):
+        """Yield the cached record batches of a key (at most batch_size rows each), or None on a miss."""
+        path = self.path(key)
+        if self.refresh or not path.exists():
+            self.log(f"   🗄️  Cache {'refresh' if self.refresh else 'miss'}: {key[:12]}")
+            return None
+        os.utime(path)
+        self.log(f"   🗄️  Cache hit: {key[:12]} ({path.stat().st_size / 1024 ** 2:,.1f} MB)")
+        return self._read_batches(path, batch_size)
+
+    @staticmethod
+    def _read_batches(path: Path, batch_size: int = None):
+        with pa.memory_map(str(path), 'r') as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                step = batch_size or batch.num_rows or 1
+                for offset in range(0, batch.num_rows, step):
+                    yield batch.slice(offset, step)
+
+    def write_through(self, key: str, batches):
+        """Yield batches unchanged while saving them; the entry is kept only if all arrive."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+        writer = sink = None
+        try:
+            for batch in batches:
+                if writer is None:
+                    sink = pa.OSFile(str(tmp_path), 'wb')
+                    options = pa.ipc.IpcWriteOptions(compression=CACHE_COMPRESSION)
+                    writer = pa.ipc.new_file(sink, batch.schema, options=options)
+                writer.write_batch(batch)
+                yield batch
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                sink.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        if writer is None:
+            return
+        writer.close()
+        sink.close()
+        os.replace(tmp_path, self.path(key))
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob("*.arrow"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.log(f"   🗄️  Cache evict: {path.stem[:12]} ({size / 1024 ** 2:,.1f} MB)")
+
+
+def cached_record_batches(cache, key: str, fetch_batches, batch_size: int = None):
+    """Record batches for a query, from the cache when possible.
+
+    fetch_batches() runs the query; its batches are written through to
+    the cache. With no cache or no key the query always runs uncached.
+    """
+    if cache is None or key is None:
+        yield from fetch_batches()
+        return
+    cached = cache.read(key, batch_size)
+    if cached is not None:
+        yield from cached
+        return
+    yield from cache.write_through(key, fetch_batches())
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+
+class SQLiteSink:
+    """Writes record batches into one SQLite file inside a single transaction.
+
+    In bulk mode the connection uses LOADER_PRAGMAS. When a table is
+    given, its secondary indexes are dropped once the load reaches
+    index_rows rows and rebuilt once at the end, all inside the same
+    transaction so a failed load leaves them intact.
+    """
+
+    def __init__(self, db_path: Path, insert_batch, table: str = None, bulk: bool = False,
+                 index_rows: int = BULK_INDEX_ROWS):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+        self.insert_batch = insert_batch
+        self.stats = LoadStats()
+        self._started = time.perf_counter()
+        self._index_table = table if bulk else None
+        self._index_rows = index_rows
+        self._dropped_indexes = []
+
+        if bulk:
+            apply_loader_pragmas(self.conn)
+        self.conn.execute("BEGIN")
+
+    def write(self, records: list):
+        if self._index_table and self.stats.rows + len(records) >= self._index_rows:
+            self._dropped_indexes = drop_secondary_indexes(self.conn, self._index_table)
+            self._index_table = None
+        self.insert_batch(self.cursor, records)
+        self.stats.rows += len(records)
+
+    def close(self) -> LoadStats:
+        create_indexes(self.conn, self._dropped_indexes)
+        self.conn.commit()
+        self.conn.close()
+        self.stats.seconds = time.perf_counter() - self._started
+        return self.stats
+
+    def abort(self):
+        self.conn.rollback()
+        self.conn.close()
+
+
+class ParquetSink:
+    """Writes record batches into one hive partition directory as Parquet.
+
+    Batches of row tuples in field order become row groups of a single
+    compressed part file, written under a temporary
+    name and renamed on close. Unless append is set, closing replaces the
+    partition's existing part files, so re-running a day overwrites it.
+    """
+
+    def __init__(self, partition_dir: Path, fields, column_types: dict = None,
+                 append: bool = False):
+        require_parquet()
+        self.partition_dir = Path(partition_dir)
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
+        self.schema = arrow_schema(fields, column_types)
+        self._kinds = [arrow_type(kind) for _, _, kind in fields]
+        self.append = append
+        self.stats = LoadStats()
+        self._started = time.perf_counter()
+        self._name = f"part-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        self._tmp_path = self.partition_dir / f".{self._name}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp_path, self.schema, compression=PARQUET_COMPRESSION)
+
+    def write(self, records: list):
+        if not records:
+            return
+        arrays = [_to_arrow_array(values, kind_type, field.type)
+                  for values, kind_type, field in zip(zip(*records), self._kinds, self.schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.stats.rows += len(records)
+
+    def close(self) -> LoadStats:
+        self._writer.close()
+        if not self.append:
+            for old in self.partition_dir.glob("part-*.parquet"):
+                old.unlink()
+        os.replace(self._tmp_path, self.partition_dir / self._name)
+        self.stats.seconds = time.perf_counter() - self._started
+        return self.stats
+
+    def abort(self):
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class FanoutSink:
+    """Writes every batch to several sinks, e.g. SQLite and Parquet."""
+
+    def __init__(self, sinks: list):
+        self.sinks = sinks
+
+    def write(self, records: list):
+        for sink in self.sinks:
+            sink.write(records)
+
+    def close(self) -> LoadStats:
+        stats = None
+        for i, sink in enumerate(self.sinks):
+            try:
+                sink_stats = sink.close()
+            except BaseException:
+                for pending in self.sinks[i + 1:]:
+                    pending.abort()
+                raise
+            if stats is None:
+                stats = sink_stats
+            stats.seconds = max(stats.seconds, sink_stats.seconds)
+        return stats
+
+    def abort(self):
+        for sink in self.sinks:
+            sink.abort()
+
+
+def open_fanout(openers: list):
+    """Call each sink opener, returning one sink or a FanoutSink over all of them."""
+    sinks = []
+    try:
+        for opener in openers:
+            sinks.append(opener())
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    return sinks[0] if len(sinks) == 1 else FanoutSink(sinks)
+
+
+def write_records(records: list, open_sink) -> LoadStats:
+    """Write one list of records through a freshly opened sink."""
+    sink = open_sink()
+    try:
+        sink.write(records)
+    except BaseException:
+        sink.abort()
+        raise
+    return sink.close()
+
+
+# =============================================================================
+# PARQUET
+# =============================================================================
+
+PARQUET_COMPLETE_MARKER = '_SUCCESS'
+
+
+def require_parquet():
+    if pq is None:
+        raise RuntimeError("pyarrow is required for Parquet output (pip install pyarrow)")
+
+
+def _to_arrow_array(values, kind_type, target_type):
+    """Build a column from row values of a field kind, cast to its stored type."""
+    if pa.types.is_timestamp(kind_type):
+        # Row values carry timestamps as 'YYYY-MM-DD HH:MM:SS+00:00' strings
+        strings = pa.array(values, pa.string())
+        return pc.strptime(pc.utf8_slice_codeunits(strings, 0, 19),
+                           format='%Y-%m-%d %H:%M:%S', unit='s').cast(target_type)
+    array = pa.array(values, kind_type)
+    return array if array.type == target_type else array.cast(target_type)
+
+
+def parquet_discard_after(partition_dir: Path, column: str, watermark: int):
+    """Drop rows whose column value is above the watermark from a partition.
+
+    Mirrors the SQLite discard of a partial slice before an incremental
+    load; only part files whose statistics reach past the watermark are
+    rewritten.
+    """
+    require_parquet()
+    for path in sorted(Path(partition_dir).glob("part-*.parquet")):
+        if _parquet_column_max(path, column) <= watermark:
+            continue
+        table = pq.read_table(path)
+        keep = pc.less_equal(pc.cast(table.column(column), pa.int64()), watermark)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        pq.write_table(table.filter(keep), tmp_path, compression=PARQUET_COMPRESSION)
+        os.replace(tmp_path, path)
+
+
+def _parquet_column_max(path: Path, column: str) -> float:
+    """Largest value of a numeric-string column per the footer statistics."""
+    metadata = pq.ParquetFile(path).metadata
+    index = metadata.schema.to_arrow_schema().get_field_index(column)
+    highest = float('-inf')
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            return float('inf')
+        highest = max(highest, int(stats.max))
+    return highest
+
+
+def migrate_parquet_partitions(dataset: str) -> int:
+    """Rename partitions written under the old date= key; returns how many moved.
+
+    A tree mixing date= and day= directories cannot be read as one dataset.
+    """
+    root = DB_DIR / dataset
+    moved = 0
+    for old in sorted(root.glob("date=*")):
+        new = root / f"{PARQUET_PARTITION_KEY}={old.name.partition('=')[2]}"
+        if old.is_dir() and not new.exists():
+            os.replace(old, new)
+            moved += 1
+    return moved
+
+
+def mark_partition_complete(partition_dir: Path):
+    """Write the hive-style marker of a finished full-day partition."""
+    (Path(partition_dir) / PARQUET_COMPLETE_MARKER).touch()
+
+
+def is_partition_complete(partition_dir: Path) -> bool:
+    return (Path(partition_dir) / PARQUET_COMPLETE_MARKER).exists()
+
+
+# =============================================================================
+# STREAMING WRITER
+# =============================================================================
+
+_DONE = object()
+_ABORT = object()
+
+
+class BatchWriter:
+    """Drains record batches into a sink on a dedicated writer thread.
+
+    The queue between producer and writer is bounded, so a fast download
+    blocks on `put` instead of buffering the whole day in memory. The sink
+    is opened on the writer thread because SQLite connections must stay on
+    the thread that created them.
+    """
+
+    def __init__(self, open_sink, max_pending: int = QUEUE_DEPTH):
+        self.stats = LoadStats()
+        self._open_sink = open_sink
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="gdelt-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, records: list):
+        """Queue a batch, blocking while the writer is behind."""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(records)
+
+    def close(self, commit: bool = True) -> LoadStats:
+        """Flush pending batches, wait for the writer and return its load stats."""
+        self._queue.put(_DONE if commit else _ABORT)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def _run(self):
+        sink = None
+        records = None
+        try:
+            sink = self._open_sink()
+            while True:
+                records = self._queue.get()
+                if records is _DONE:
+                    self.stats = sink.close()
+                    return
+                if records is _ABORT:
+                    sink.abort()
+                    return
+                sink.write(records)
+        except BaseException as e:
+            self._error = e
+            if records is _DONE or records is _ABORT:
+                return
+            if sink is not None:
+                sink.abort()
+            # Keep draining so the producer never blocks on a dead writer
+            while self._queue.get() not in (_DONE, _ABORT):
+                pass
+
+
+def write_stream(batches, open_sink, max_pending: int = QUEUE_DEPTH) -> LoadStats:
+    """Pipe an iterable of record batches through a BatchWriter."""
+    writer = BatchWriter(open_sink, max_pending=max_pending)
+    try:
+        for records in batches:
+            writer.put(records)
+    except BaseException:
+        writer.close(commit=False)
+        raise
+    return writer.close()
+
+
+# =============================================================================
+# SHARDED FETCH
+# =============================================================================
+
+SHARD_END = 99999999999999   # upper bound of the last shard (YYYYMMDDHHMMSS)
+
+
+def shard_bounds(target_date: str, shards: int) -> list:
+    """Split a day into [start, end) YYYYMMDDHHMMSS ranges of equal length.
+
+    The first and last shards are open-ended, so rows stamped outside the
+    day (e.g. events added after their SQLDATE) still fall in exactly one.
+    """
+    day = datetime.strptime(target_date, '%Y-%m-%d')
+    cuts = [int((day + timedelta(seconds=86400 * i // shards)).strftime('%Y%m%d%H%M%S'))
+            for i in range(1, shards)]
+    return list(zip([0] + cuts, cuts + [SHARD_END]))
+
+
+def _put_unless(q: queue.Queue, item, stop: threading.Event):
+    """Queue an item, giving up once stop is set so a cancelled shard never hangs."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+def merge_shards(fetch_shard, bounds: list, max_records: int = None, ordered: bool = False,
+                 max_pending: int = QUEUE_DEPTH):
+    """Run fetch_shard(start, end) for every shard on a thread pool and yield one batch stream.
+
+    Unordered, batches are yielded as they arrive from any shard. Ordered,
+    each shard is yielded in full before the next, so a query sorted on
+    the shard column keeps its order (later shards buffer meanwhile). At
+    most max_records rows come out: the batch crossing the limit is cut
+    and the remaining shards are cancelled.
+    """
+    stop = threading.Event()
+    if ordered:
+        queues = [queue.Queue() for _ in bounds]
+    else:
+        queues = [queue.Queue(maxsize=max_pending * len(bounds))] * len(bounds)
+
+    def run(index, start, end):
+        try:
+            for batch in fetch_shard(start, end):
+                if stop.is_set():
+                    return
+                _put_unless(queues[index], (index, batch), stop)
+            _put_unless(queues[index], (index, _DONE), stop)
+        except BaseException as e:
+            _put_unless(queues[index], (index, e), stop)
+
+    pool = ThreadPoolExecutor(max_workers=len(bounds), thread_name_prefix="gdelt-shard")
+    for index, (start, end) in enumerate(bounds):
+        pool.submit(run, index, start, end)
+
+    remaining = max_records
+    current = 0
+    pending = len(bounds)
+    try:
+        while pending:
+            _, batch = queues[current].get()
+            if batch is _DONE:
+                pending -= 1
+                current += ordered
+                continue
+            if isinstance(batch, BaseException):
+                raise batch
+            if remaining is not None:
+                if len(batch) >= remaining:
+                    yield batch[:remaining]
+                    return
+                remaining -= len(batch)
+            yield batch
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# =============================================================================
+# FETCHER
+# =============================================================================
+
+class DayFetcher:
+    """Fetches one day of a GDELT BigQuery table: every field, or those of a profile.
+
+    Subclasses supply the table (TABLE, FIELDS, FILTERS, EXPRESSIONS),
+    TIME_COLUMN, the YYYYMMDDHHMMSS column that shards, orders and
+    watermarks a day, and _day_predicates, the WHERE conditions that
+    select the day.
+    """
+
+    TABLE = None
+    FIELDS = ()
+    FILTERS = ()
+    EXPRESSIONS = None
+    TIME_COLUMN = None
+
+    partition_lag = 0   # days after the day itself that can still add rows
+
+    def __init__(self, project_id: str = PROJECT_ID, client=None, fields: tuple = None,
+                 cache: ResultCache = None, shards: int = 1, filters: dict = None,
+                 sample_rate: float = None, sample_method: str = 'hash'):
+        self.project_id = project_id
+        self.fields = fields = self.FIELDS if fields is None else fields
+        self.cache = cache
+        self.shards = shards
+        self.filters = {name: value for name, value in (filters or {}).items()
+                        if value is not None and value != []}
+        self.sample_rate = sample_rate
+        self.sample_method = sample_method
+        self._parameter_values = {**self.filters, **sample_values(sample_rate, sample_method)}
+        self._filter_predicates, self._filter_parameters = compile_filters(
+            self.FILTERS, self._parameter_values)
+        self.bytes_processed = 0
+        self._client = client
+        self._convert_row = make_row_converter(fields)
+        self._read_client = None
+        self._lock = threading.RLock()
+
+    @property
+    def client(self):
+        """BigQuery client, created on first use so cached days need no credentials."""
+        with self._lock:
+            if self._client is None:
+                from google.cloud import bigquery
+                self._client = bigquery.Client(project=self.project_id)
+        return self._client
+
+    def fetch(self, target_date: str, max_records: int = MAX_RECORDS, since: int = None) -> list:
+        """Fetch ALL records for a date."""
+        return [r for batch in self.iter_batches(target_date, max_records, since=since) for r in batch]
+
+    def iter_batches(self, target_date: str, max_records: int = MAX_RECORDS,
+                     batch_size: int = BATCH_SIZE, since: int = None):
+        """Yield records page by page as BigQuery returns them."""
+        if self._cache_key(target_date, max_records, since) is not None:
+            # Cacheable: go through the cached Arrow batches
+            for batch in self.iter_record_batches(target_date, max_records, batch_size, since=since):
+                yield [self._convert_row(row) for row in batch.to_pylist()]
+            return
+
+        for page in self._fetch_pages(target_date, max_records, batch_size, since):
+            yield [self._convert_row(row) for row in page]
+
+    def iter_arrow_batches(self, target_date: str, max_records: int = MAX_RECORDS,
+                           batch_size: int = BATCH_SIZE, since: int = None):
+        """Yield rows as tuples in field order, converted column-wise.
+
+        Results arrive as Arrow record batches, over the BigQuery Storage
+        Read API when google-cloud-bigquery-storage is installed.
+        """
+        for batch in self.iter_record_batches(target_date, max_records, batch_size, since=since):
+            yield arrow_columns_to_rows(coerce_arrow_batch(batch, self.fields))
+
+    def iter_record_batches(self, target_date: str, max_records: int = MAX_RECORDS,
+                            batch_size: int = BATCH_SIZE, since: int = None):
+        """Yield the raw Arrow record batches of the day's query, cached when possible."""
+        require_arrow()
+        key = self._cache_key(target_date, max_records, since)
+        yield from cached_record_batches(
+            self.cache, key,
+            lambda: self._fetch_pages(target_date, max_records, batch_size, since, arrow=True),
+            batch_size,
+        )
+
+    def _cache_key(self, target_date: str, max_records: int, since: int = None):
+        """Cache key of a day's query, or None when its results may still change.
+
+        Only closed days fetched in full are cached; incremental queries
+        depend on the watermark and table samples differ on every run, so
+        both are always run.
+        """
+        if table_sample(self.sample_rate, self.sample_method):
+            return None
+        if (self.cache is None or since is not None
+                or not is_day_closed(target_date, self.partition_lag)):
+            return None
+        sql = self._build_query(target_date, max_records)
+        return self.cache.key(sql, target_date, self.project_id, self._parameter_values)
+
+    def estimate_bytes(self, target_date: str, max_records: int = MAX_RECORDS) -> int:
+        """Bytes BigQuery would bill for the day's query, from a dry run that reads nothing.
+
+        Every shard scans the same partitions, so the estimate scales with shards.
+        """
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False,
+                                             query_parameters=self._filter_parameters)
+        job = self.client.query(self._build_query(target_date, max_records), job_config=job_config)
+        return (job.total_bytes_processed or 0) * self.shards
+
+    def _fetch_pages(self, target_date: str, max_records: int, batch_size: int, since: int = None,
+                     arrow: bool = False):
+        """Yield the day's result pages (row lists, or Arrow record batches with arrow).
+
+        With shards > 1 the day is split into TIME_COLUMN ranges fetched
+        concurrently; LIMIT applies to each shard and the merged stream is
+        cut at max_records. Incremental queries merge shard by shard to
+        keep their TIME_COLUMN order.
+        """
+        if self.shards <= 1:
+            return self._fetch_shard(target_date, max_records, batch_size, since, arrow)
+        return merge_shards(
+            lambda start, end: self._fetch_shard(target_date, max_records, batch_size, since, arrow,
+                                                 shard=(start, end)),
+            shard_bounds(target_date, self.shards),
+            max_records,
+            ordered=since is not None,
+        )
+
+    def _fetch_shard(self, target_date: str, max_records: int, batch_size: int, since: int = None,
+                     arrow: bool = False, shard: tuple = None):
+        result = self._run_query(target_date, max_records, batch_size, since, shard)
+        if not arrow:
+            for page in result.pages:
+                yield list(page)
+            return
+        with self._lock:
+            if self._read_client is None:
+                self._read_client = make_read_client(self.client)
+        for batch in result.to_arrow_iterable(bqstorage_client=self._read_client):
+            if batch.num_rows:
+                yield batch
+
+    def _run_query(self, target_date: str, max_records: int, batch_size: int, since: int = None,
+                   shard: tuple = None):
+        """Run the day's query (or one TIME_COLUMN shard of it) and add its billed bytes."""
+        from google.cloud import bigquery
+
+        parameters = list(self._filter_parameters)
+        if shard is not None:
+            parameters += [
+                bigquery.ScalarQueryParameter('shard_start', 'INT64', shard[0]),
+                bigquery.ScalarQueryParameter('shard_end', 'INT64', shard[1]),
+            ]
+        job_config = bigquery.QueryJobConfig(query_parameters=parameters) if parameters else None
+        query = self._build_query(target_date, max_records, since=since, sharded=shard is not None)
+        job = self.client.query(query, job_config=job_config)
+        result = job.result(page_size=batch_size)
+        with self._lock:
+            self.bytes_processed += job.total_bytes_processed or 0
+        return result
+
+    def _day_predicates(self, target_date: str) -> list:
+        """WHERE conditions selecting the rows of one day."""
+        raise NotImplementedError
+
+    def _build_query(self, target_date: str, max_records: int, since: int = None,
+                     sharded: bool = False) -> str:
+        """Build the query for a single day."""
+        day = '\n            AND '.join(self._day_predicates(target_date))
+        query = f"""
+        SELECT
+            {select_list(self.fields, self.EXPRESSIONS)}
+        FROM `{self.TABLE}`{table_sample(self.sample_rate, self.sample_method)}
+        WHERE
+            {day}
+        """
+
+        # Pushed-down filters; their values are bound as query parameters
+        if self._filter_predicates:
+            predicates = '\n            AND '.join(self._filter_predicates)
+            query += f"""
+            AND {predicates}
+        """
+
+        # One shard of a concurrent fetch: bounds are bound as query parameters
+        if sharded:
+            query += f"""
+            AND {self.TIME_COLUMN} >= @shard_start AND {self.TIME_COLUMN} < @shard_end
+        """
+
+        # Incremental: only rows newer than the watermark, oldest first so a
+        # LIMIT cut never skips past rows that were not fetched
+        if since is not None:
+            query += f"""
+            AND {self.TIME_COLUMN} > {int(since)}
+        ORDER BY {self.TIME_COLUMN}
+        """
+
+        query += f"LIMIT {max_records}"
+        return query
+
+
+# =============================================================================
+# BACKFILL
+# =============================================================================
+
+def date_range(start: str, end: str) -> list:
+    """All YYYY-MM-DD dates from start to end, inclusive."""
+    day = datetime.strptime(start, '%Y-%m-%d')
+    last = datetime.strptime(end, '%Y-%m-%d')
+    if last < day:
+        raise ValueError(f"End date {end} is before start date {start}")
+    dates = []
+    while day <= last:
+        dates.append(day.strftime('%Y-%m-%d'))
+        day += timedelta(days=1)
+    return dates
+
+
+def dry_run(fetcher, dates: list, max_records: int) -> int:
+    """Print BigQuery's estimated billed bytes for each day's query without running any."""
+    print(f"🧪 Dry run: estimated bytes processed")
+    total = 0
+    for target_date in dates:
+        estimate = fetcher.estimate_bytes(target_date, max_records)
+        total += estimate
+        print(f"   {target_date}: {estimate / 1024 ** 2:,.1f} MB")
+    print(f"   Total: {total / 1024 ** 2:,.1f} MB ({total / 1024 ** 4:,.4f} TiB)")
+    return total
+
+
+def run_backfill(dates: list, ingest_day, get_db_path, workers: int = BACKFILL_WORKERS,
+                 force: bool = False, is_complete=None) -> dict:
+    """Run ingest_day(date) for each date on a bounded worker pool.
+
+    Days whose database is already complete (or for which is_complete(date)
+    is true, when given) are skipped unless force is set. ingest_day must
+    return the LoadStats of that day. Returns a summary dict.
+    """
+    if is_complete is None:
+        is_complete = lambda target_date: is_day_complete(get_db_path(target_date))
+
+    summary = {'days': 0, 'skipped': 0, 'failed': [], 'rows': 0, 'seconds': 0.0}
+    pending = []
+    for target_date in dates:
+        if not force and is_complete(target_date):
+            print(f"   ⏭️  {target_date}: already complete")
+            summary['skipped'] += 1
+        else:
+            pending.append(target_date)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(ingest_day, target_date): target_date for target_date in pending}
+        for future in as_completed(futures):
+            target_date = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:
+                print(f"   ❌ {target_date}: {e}")
+                summary['failed'].append(target_date)
+                continue
+            print(f"   ✅ {target_date}: {stats}")
+            summary['days'] += 1
+            summary['rows'] += stats.rows
+    summary['seconds'] = time.perf_counter() - started
+
+    rate = summary['rows'] / summary['seconds'] if summary['seconds'] > 0 else 0.0
+    print(f"\n📊 Backfill summary")
+    print(f"   Days loaded: {summary['days']}  skipped: {summary['skipped']}  "
+          f"failed: {len(summary['failed'])}")
+    print(f"   Records: {summary['rows']}")
+    print(f"   Throughput: {rate:,.0f} rows/s over {summary['seconds']:.1f}s "
+          f"with {workers} workers")
+    return summary
+
+
+# =============================================================================
+# DAILY INGEST
+# =============================================================================
+
+class DailyIngest:
+    """Command line that fetches days of one dataset into SQLite and/or Parquet.
+
+    Subclasses name the dataset, its DayFetcher and database classes and
+    its field profiles. The hooks below add the table-specific options,
+    filters and per-day steps; everything else (single day, backfill,
+    incremental and dry-run modes) is shared.
+    """
+
+    DATASET = None          # file name prefix under DB_DIR, e.g. 'events'
+    TITLE = None            # banner name, e.g. 'Event Database'
+    DATA = None             # progress name, e.g. 'Event'
+    UNIT = 'records'        # what the rollup log line counts
+    FETCHER = None
+    DATABASE = None
+    PROFILES = {}
+    REQUIRED_COLUMNS = ()
+    REQUIRED_NOTE = None    # --fields help for REQUIRED_COLUMNS
+    WATERMARK = None        # stored column of FETCHER.TIME_COLUMN
+    SAMPLE_KEY = None       # BigQuery id hashed by --sample-method hash
+    BULK_HELP = 'Bulk-load with loader PRAGMAs'
+
+    # -- hooks ----------------------------------------------------------------
+
+    def add_arguments(self, parser: argparse.ArgumentParser):
+        """Table-specific options: storage features and pushed-down filters."""
+
+    def check_args(self, parser: argparse.ArgumentParser, args):
+        """Reject invalid table-specific options with parser.error."""
+
+    def filters(self, args) -> dict:
+        """Filter values for the fetcher, by filter name."""
+        return {}
+
+    def fetcher_options(self, args) -> dict:
+        """Extra FETCHER keyword arguments."""
+        return {}
+
+    def required_columns(self, args) -> tuple:
+        """Columns loaded whatever --fields says, including those the options need."""
+        return self.REQUIRED_COLUMNS
+
+    def open_database(self, target_date: str, fields: tuple, args):
+        """The day's database, with the storage features the options ask for."""
+        raise NotImplementedError
+
+    def before_fetch(self, db, since: int):
+        """Prepare the database for an incremental fetch from the since watermark."""
+
+    def after_store(self, db, args, log):
+        """Extra steps once a day is stored in SQLite."""
+
+    # -- driver ---------------------------------------------------------------
+
+    def build_parser(self) -> argparse.ArgumentParser:
+        time_column = self.FETCHER.TIME_COLUMN
+        parser = argparse.ArgumentParser(
+            description=f'GDELT {self.TITLE} Daily Raw Data Fetcher - ALL FIELDS',
+            epilog=f"Fetches ALL {self.DATA} fields for a single day (or a --start/--end range) "
+                   "and stores in SQLite."
+                   "\n\nExample: %(prog)s 2025-01-06"
+                   "\n         %(prog)s --start 2025-01-01 --end 2025-03-31 --workers 8",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+
+        parser.add_argument('date', type=str, nargs='?', help='Date (YYYY-MM-DD)')
+        parser.add_argument('--start', type=str, help='Backfill range start date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=str, help='Backfill range end date, inclusive (YYYY-MM-DD)')
+        parser.add_argument('--workers', '-w', type=int, default=BACKFILL_WORKERS,
+                            help=f'Concurrent days in range mode (default: {BACKFILL_WORKERS})')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-fetch days that are already complete in range mode')
+        parser.add_argument('--project', '-p', default=PROJECT_ID,
+                            help=f'BigQuery project ID (default: {PROJECT_ID})')
+        parser.add_argument('--max', '-m', type=int, default=MAX_RECORDS,
+                            help=f'Max records to fetch (default: {MAX_RECORDS})')
+        parser.add_argument('--stream', action='store_true',
+                            help='Stream result pages into SQLite while downloading')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f'Rows per streamed batch (default: {BATCH_SIZE})')
+        parser.add_argument('--shards', type=int, default=1,
+                            help=f'Split each day into N {time_column} ranges fetched concurrently; '
+                                 'each shard is billed as its own scan (default: 1)')
+        parser.add_argument('--bulk', action='store_true', help=self.BULK_HELP)
+        parser.add_argument('--fields', '-f', default='all',
+                            help=f"Field profile ({', '.join(self.PROFILES)}) or comma-separated "
+                                 f"columns; {self.REQUIRED_NOTE} are always loaded (default: all)")
+        self.add_arguments(parser)
+        parser.add_argument('--sample-rate', type=sample_fraction, metavar='RATE',
+                            help='Fetch a fraction (0-1] of each day instead of every row')
+        parser.add_argument('--sample-method', choices=SAMPLE_METHODS, default='hash',
+                            help=f'hash: same {self.SAMPLE_KEY} hash sample every run, full scan '
+                                 'billed; table: TABLESAMPLE blocks, fewer bytes billed but rows '
+                                 'vary per run (default: hash)')
+        parser.add_argument('--sink', choices=['sqlite', 'parquet', 'both'], default='sqlite',
+                            help='Write to the daily SQLite file, to hive-partitioned Parquet under '
+                                 f'{DB_DIR}/{self.DATASET}/{PARQUET_PARTITION_KEY}=YYYYMMDD/, '
+                                 'or both (default: sqlite)')
+        parser.add_argument('--arrow', action='store_true',
+                            help='Fetch Arrow record batches and convert column-wise (needs pyarrow)')
+        parser.add_argument('--no-cache', action='store_true',
+                            help=f'Re-run queries instead of reading {DB_DIR}/.cache, refreshing its '
+                                 f'entries (raw results of closed days are cached with pyarrow; '
+                                 f'LRU-evicted above {CACHE_MAX_BYTES / 1024 ** 3:.0f} GiB)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Print the estimated bytes processed per day and exit without fetching')
+        parser.add_argument('--incremental', '-i', action='store_true',
+                            help=f'Only fetch rows newer than the stored {time_column} watermark')
+        return parser
+
+    def ingest_day(self, target_date: str, fetcher: DayFetcher, args, verbose: bool = True) -> LoadStats:
+        """Fetch and store one day, marking its database complete once the day is over."""
+        log = print if verbose else (lambda *a, **k: None)
+        use_parquet = args.sink in ('parquet', 'both')
+        parquet_dir = day_parquet_dir(self.DATASET, target_date)
+        db = None
+        if args.sink in ('sqlite', 'both'):
+            db = self.open_database(target_date, fetcher.fields, args)
+
+        since = (db.get_watermark() or 0) if args.incremental else None
+        if since:
+            log(f"🔖 Watermark: {since}")
+            self.before_fetch(db, since)
+            if use_parquet:
+                # Rows above the watermark belong to a partial slice that is re-fetched
+                parquet_discard_after(parquet_dir, self.WATERMARK, since)
+
+        if args.arrow:
+            batches = fetcher.iter_arrow_batches(target_date, max_records=args.max,
+                                                 batch_size=args.batch_size, since=since)
+        else:
+            batches = fetcher.iter_batches(target_date, max_records=args.max,
+                                           batch_size=args.batch_size, since=since)
+
+        openers = []
+        if db is not None:
+            openers.append(lambda: db.open_sink(bulk=args.bulk))
+        if use_parquet:
+            column_types = sqlite_column_types(self.DATABASE.TABLE_SQL)
+            openers.append(lambda: ParquetSink(parquet_dir, fetcher.fields, column_types,
+                                               append=args.incremental))
+
+        def open_sink():
+            return open_fanout(openers)
+
+        if args.stream:
+            # Fetch and store concurrently
+            log(f"📥 Streaming {self.DATA} data into database...")
+            stats = write_stream(batches, open_sink)
+        else:
+            # Fetch
+            log(f"📥 Fetching {self.DATA} data...")
+            records = [r for batch in batches for r in batch]
+            log(f"   Found {len(records)} records")
+
+            # Store
+            log("\n💾 Storing to database...")
+            stats = write_records(records, open_sink)
+
+        truncated = stats.rows >= args.max
+        if args.incremental:
+            log(f"🔖 New watermark: {db.advance_watermark(truncated=truncated)}")
+
+        if db is not None and db.rollups:
+            log(f"📈 Rolled up {db.update_rollups()} new {self.UNIT}")
+
+        if db is not None:
+            self.after_store(db, args, log)
+
+        if is_day_closed(target_date, fetcher.partition_lag) and not (args.incremental and truncated):
+            if db is not None:
+                db.mark_complete()
+            if use_parquet:
+                mark_partition_complete(parquet_dir)
+
+        return stats
+
+    def main(self, argv=None, client=None) -> int:
+        parser = self.build_parser()
+        args = parser.parse_args(argv)
+
+        if bool(args.start) != bool(args.end) or bool(args.date) == bool(args.start):
+            parser.error("give either a date or both --start and --end")
+        if args.incremental and args.sink == 'parquet':
+            parser.error("--incremental keeps its watermark in SQLite; use --sink both")
+        if args.shards < 1:
+            parser.error("--shards must be at least 1")
+        self.check_args(parser, args)
+
+        # Validate dates
+        for value in (args.date, args.start, args.end):
+            if value is None:
+                continue
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                print(f"Error: Invalid date format '{value}'. Use YYYY-MM-DD.", file=sys.stderr)
+                return 1
+
+        try:
+            fields = resolve_fields(self.FETCHER.FIELDS, self.PROFILES, args.fields,
+                                    self.required_columns(args))
+        except ValueError as e:
+            parser.error(str(e))
+
+        # Raw results of closed days are cached locally (needs pyarrow)
+        cache = None
+        try:
+            cache = ResultCache(DB_DIR / ".cache", refresh=args.no_cache)
+        except RuntimeError as e:
+            print(f"⚠️  Result cache disabled: {e}", file=sys.stderr)
+
+        # One client shared by every day of a backfill
+        fetcher = self.FETCHER(project_id=args.project, client=client, fields=fields, cache=cache,
+                               shards=args.shards, filters=self.filters(args),
+                               sample_rate=args.sample_rate, sample_method=args.sample_method,
+                               **self.fetcher_options(args))
+
+        if args.dry_run:
+            try:
+                dates = date_range(args.start, args.end) if args.start else [args.date]
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            dry_run(fetcher, dates, args.max)
+            return 0
+
+        def db_path(target_date: str) -> Path:
+            return day_db_path(self.DATASET, target_date)
+
+        def parquet_dir(target_date: str) -> Path:
+            return day_parquet_dir(self.DATASET, target_date)
+
+        if args.sink in ('parquet', 'both'):
+            moved = migrate_parquet_partitions(self.DATASET)
+            if moved:
+                print(f"📦 Moved {moved} Parquet partitions to the {PARQUET_PARTITION_KEY}= key")
+
+        if args.start:
+            try:
+                dates = date_range(args.start, args.end)
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+
+            print(f"📊 {self.TITLE} Daily Raw Data - BACKFILL")
+            print(f"📅 Range: {args.start} → {args.end} ({len(dates)} days)")
+            print(f"⚙️  Workers: {args.workers}")
+            print(f"📊 Max records per day: {args.max}")
+            print(f"🧾 Fields: {args.fields} ({len(fields)} columns)")
+            if fetcher.filters:
+                print(f"🔎 Filters: {describe_filters(fetcher.filters)}")
+            if args.sample_rate:
+                print(f"🎲 Sample: {args.sample_rate:.2%} ({args.sample_method})")
+            print()
+
+            def day_complete(target_date: str) -> bool:
+                return ((args.sink == 'parquet' or is_day_complete(db_path(target_date)))
+                        and (args.sink == 'sqlite' or is_partition_complete(parquet_dir(target_date))))
+
+            summary = run_backfill(
+                dates,
+                lambda target_date: self.ingest_day(target_date, fetcher, args, verbose=False),
+                db_path,
+                workers=args.workers,
+                force=args.force,
+                is_complete=day_complete,
+            )
+            print(f"   Bytes processed: {fetcher.bytes_processed / 1024 ** 2:,.1f} MB")
+            return 1 if summary['failed'] else 0
+
+        # Setup
+        outputs = []
+        if args.sink in ('sqlite', 'both'):
+            outputs.append(str(db_path(args.date)))
+        if args.sink in ('parquet', 'both'):
+            outputs.append(str(parquet_dir(args.date)))
+        print(f"📊 {self.TITLE} Daily Raw Data - ALL FIELDS")
+        print(f"📅 Date: {args.date}")
+        print(f"💾 Output: {', '.join(outputs)}")
+        print(f"📊 Max records: {args.max}")
+        if args.shards > 1:
+            print(f"🧩 Shards: {args.shards}")
+        print(f"🧾 Fields: {args.fields} ({len(fields)} columns)")
+        if fetcher.filters:
+            print(f"🔎 Filters: {describe_filters(fetcher.filters)}")
+        if args.sample_rate:
+            print(f"🎲 Sample: {args.sample_rate:.2%} ({args.sample_method})")
+        print()
+
+        stats = self.ingest_day(args.date, fetcher, args)
+
+        print(f"\n✅ Done!")
+        print(f"   Records: {stats.rows}")
+        print(f"   Throughput: {stats.rows_per_sec:,.0f} rows/s ({stats.seconds:.2f}s)")
+        print(f"   Bytes processed: {fetcher.bytes_processed / 1024 ** 2:,.1f} MB")
+        print(f"   Output: {', '.join(outputs)}")
+
+        return 0
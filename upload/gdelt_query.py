@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+GDELT Federated Query
+Runs one query over a date range of daily Events / GKG databases in
+parallel (scatter) and merges the per-day results (gather), including
+ranked full-text search over the optional FTS5 indexes and box / radius
+lookups over the optional R*Tree spatial indexes. Events can be joined
+with their source articles in the same day's GKG database by URL hash.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gdelt_common import (
+    comma_list, date_range, day_db_path, dict_view_columns, fts_search_sql, geo_box_query,
+    haversine_km, radius_box,
+)
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Datasets with daily databases (see day_db_path); each queries the table
+# of its own name, a decoding view under the compact schema
+DATASETS = ('events', 'gkg')
+
+# dataset -> (FTS5 index, columns returned with each search hit)
+SEARCH_INDEXES = {
+    'events': ('events_fts', ('global_event_id', 'sql_date')),
+    'gkg': ('gkg_fts', ('gkg_record_id', 'date')),
+}
+
+# dataset -> rollup tables kept by --rollups, queryable with --table
+ROLLUP_TABLES = {
+    'events': ('events_rollup_hourly', 'events_rollup_daily'),
+    'gkg': ('gkg_theme_hourly',),
+}
+
+# Columns returned by --articles: event columns, then GKG article columns
+EVENT_JOIN_COLUMNS = ('global_event_id', 'sql_date', 'event_root_code', 'source_url')
+ARTICLE_JOIN_COLUMNS = ('gkg_record_id', 'tone', 'v2_themes')
+
+# dataset -> type of the point kind stored in geo_rtree (events: action /
+# actor1 / actor2, gkg: V2Locations location type)
+GEO_KINDS = {'events': str, 'gkg': int}
+
+QUERY_WORKERS = os.cpu_count() or 4
+
+AGGREGATES = ('count', 'sum', 'avg', 'min', 'max')
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_WORD = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def day_paths(dataset: str, dates: list) -> list:
+    """Daily database files of a dataset that exist for the given dates."""
+    return [path for path in (day_db_path(dataset, date) for date in dates) if path.exists()]
+
+
+# =============================================================================
+# SCATTER
+# =============================================================================
+
+def _run_query(db_path: str, sql: str, params: tuple) -> tuple:
+    """Worker: run a read-only query against one daily file."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        return columns, cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def map_files(worker, paths: list, *args, workers: int = QUERY_WORKERS) -> list:
+    """worker(path, *args) for every file on a process pool, in path order."""
+    if not paths:
+        return []
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(worker, map(str, paths), *([arg] * len(paths) for arg in args)))
+
+
+def scatter(paths: list, sql: str, params: tuple = (), workers: int = QUERY_WORKERS) -> tuple:
+    """Run sql on every file on a process pool; returns (columns, per-file row lists)."""
+    results = map_files(_run_query, paths, sql, tuple(params), workers=workers)
+    if not results:
+        return [], []
+    return results[0][0], [rows for _, rows in results]
+
+
+def query_range(dataset: str, dates: list, sql: str, params: tuple = (),
+                workers: int = QUERY_WORKERS) -> tuple:
+    """Run raw SQL on each day of the range and concatenate the rows."""
+    columns, parts = scatter(day_paths(dataset, dates), sql, params, workers)
+    return columns, [row for rows in parts for row in rows]
+
+
+# =============================================================================
+# GATHER
+# =============================================================================
+
+def parse_aggregate(spec: str) -> tuple:
+    """'count', 'sum:goldstein_scale', ... -> (function, column or None)."""
+    func, _, column = spec.partition(':')
+    func = func.lower()
+    if func not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate '{func}' (use one of {', '.join(AGGREGATES)})")
+    if func != 'count' and not column:
+        raise ValueError(f"Aggregate '{func}' needs a column, e.g. {func}:avg_tone")
+    if column and not _IDENTIFIER.match(column):
+        raise ValueError(f"Invalid column name: {column}")
+    return func, column or None
+
+
+def aggregate_name(func: str, column: str) -> str:
+    return func if column is None else f"{func}_{column}"
+
+
+def partial_sql(table: str, group_by: list, aggregates: list, where: str = None,
+                dict_columns=()) -> str:
+    """Per-day SQL producing mergeable partials.
+
+    avg is computed as SUM and COUNT of the column so days with different
+    row counts combine exactly. dict_columns are the columns the table's
+    view decodes under the compact schema: when only the grouping needs
+    them, rows are grouped on the keys in <table>_base and just the groups
+    are decoded.
+    """
+    partials = []
+    for func, column in aggregates:
+        if func == 'count':
+            partials.append(f"COUNT({column or '*'})")
+        elif func == 'avg':
+            partials.append(f"SUM({column})")
+            partials.append(f"COUNT({column})")
+        else:
+            partials.append(f"{func.upper()}({column})")
+
+    keyed = _groups_on_keys(group_by, aggregates, where, dict_columns)
+    if keyed:
+        table = f"{table}_base"
+        partials = [f"{partial} AS p{i}" for i, partial in enumerate(partials)]
+    sql = f"SELECT {', '.join(list(group_by) + partials)} FROM {table}"
+    if where:
+        sql += f" WHERE {where}"
+    if group_by:
+        sql += f" GROUP BY {', '.join(group_by)}"
+    if keyed:
+        select = [f"(SELECT value FROM dict_text WHERE id = p.{column})" if column in dict_columns
+                  else f"p.{column}" for column in group_by]
+        select += [f"p.p{i}" for i in range(len(partials))]
+        sql = f"SELECT {', '.join(select)} FROM ({sql}) p"
+    return sql
+
+
+def _groups_on_keys(group_by: list, aggregates: list, where: str, dict_columns) -> bool:
+    """Whether a partial can group on dict keys: it groups by a dict column and
+    neither its aggregates (other than COUNT) nor its filter read one."""
+    if not dict_columns or not set(group_by) & set(dict_columns):
+        return False
+    if any(func != 'count' and column in dict_columns for func, column in aggregates):
+        return False
+    return not (where and set(_WORD.findall(where)) & set(dict_columns))
+
+
+def _merge_value(func: str, current, value):
+    if current is None:
+        return value
+    if value is None:
+        return current
+    if func in ('count', 'sum'):
+        return current + value
+    if func == 'min':
+        return min(current, value)
+    return max(current, value)
+
+
+def gather(parts: list, group_by: list, aggregates: list) -> list:
+    """Merge per-day partial rows into one row per group."""
+    width = len(group_by)
+    merged = {}
+    for rows in parts:
+        for row in rows:
+            key = row[:width]
+            state = merged.get(key)
+            if state is None:
+                merged[key] = list(row[width:])
+                continue
+            i = width
+            j = 0
+            for func, _ in aggregates:
+                if func == 'avg':
+                    state[j] = _merge_value('sum', state[j], row[i])
+                    state[j + 1] = _merge_value('count', state[j + 1], row[i + 1])
+                    i += 2
+                    j += 2
+                else:
+                    state[j] = _merge_value(func, state[j], row[i])
+                    i += 1
+                    j += 1
+
+    results = []
+    for key, state in merged.items():
+        values = []
+        j = 0
+        for func, _ in aggregates:
+            if func == 'avg':
+                total, count = state[j], state[j + 1]
+                values.append(total / count if count else None)
+                j += 2
+            else:
+                values.append(state[j])
+                j += 1
+        results.append(key + tuple(values))
+    return results
+
+
+def top_k(rows: list, columns: list, order_by: str, k: int = None, ascending: bool = False) -> list:
+    """Sort merged rows by one output column (NULLs last) and keep the first k."""
+    index = columns.index(order_by)
+    present = [r for r in rows if r[index] is not None]
+    missing = [r for r in rows if r[index] is None]
+    ordered = sorted(present, key=lambda r: r[index], reverse=not ascending) + missing
+    return ordered[:k] if k else ordered
+
+
+def _run_partial(db_path: str, table: str, group_by: list, aggregates: list, where: str,
+                 params: tuple) -> list:
+    """Worker: partial aggregate rows of one daily file, grouped on dict keys when it can."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        sql = partial_sql(table, group_by, aggregates, where, dict_view_columns(conn, table))
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def aggregate(dataset: str, dates: list, group_by: list = (), aggregates: list = (('count', None),),
+              where: str = None, params: tuple = (), order_by: str = None, k: int = None,
+              ascending: bool = False, table: str = None, workers: int = QUERY_WORKERS) -> tuple:
+    """Grouped aggregate over a date range; returns (columns, rows).
+
+    Each day computes partial aggregates in SQLite, then the partials are
+    merged per group, so count/sum/avg/min/max and top-k are exact over
+    the whole range. table selects one of the dataset's rollup tables
+    instead of the raw rows; days without it are skipped.
+    """
+    group_by = list(group_by)
+    aggregates = list(aggregates)
+    for column in group_by:
+        if not _IDENTIFIER.match(column):
+            raise ValueError(f"Invalid column name: {column}")
+
+    paths = day_paths(dataset, dates)
+    if table is None:
+        table = dataset
+    elif table in ROLLUP_TABLES[dataset]:
+        paths = [path for path in paths if _has_table(path, table)]
+    else:
+        raise ValueError(f"Unknown {dataset} rollup '{table}' "
+                         f"(use one of {', '.join(ROLLUP_TABLES[dataset])})")
+    parts = map_files(_run_partial, paths, table, group_by, aggregates, where, tuple(params),
+                      workers=workers)
+
+    columns = group_by + [aggregate_name(func, column) for func, column in aggregates]
+    rows = gather(parts, group_by, aggregates)
+    order_by = order_by or columns[len(group_by)]
+    if order_by not in columns:
+        raise ValueError(f"Cannot order by '{order_by}' (columns: {', '.join(columns)})")
+    return columns, top_k(rows, columns, order_by, k, ascending)
+
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+def _has_table(db_path, name: str) -> bool:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def search(dataset: str, dates: list, text: str, k: int = 20,
+           workers: int = QUERY_WORKERS) -> tuple:
+    """Full-text search over a date range, best matches first; returns (columns, rows).
+
+    text is an FTS5 query ('protest', '"climate change"', 'tax_fncact
+    AND bbc', ...). Each day returns its own top k by bm25 and the hits
+    are merged by rank; bm25 weighs terms with per-day statistics, so
+    ranks are comparable across days but not exactly global. Days loaded
+    without --fts are skipped.
+    """
+    table = dataset
+    fts_table, columns = SEARCH_INDEXES[dataset]
+    paths = [path for path in day_paths(dataset, dates) if _has_table(path, fts_table)]
+    columns, parts = scatter(paths, fts_search_sql(table, fts_table, columns), (text, k), workers)
+    if not columns:
+        return [], []
+    rows = [row for rows in parts for row in rows]
+    return columns, top_k(rows, columns, 'rank', k, ascending=True)
+
+
+# =============================================================================
+# SPATIAL
+# =============================================================================
+
+def within_box(dataset: str, dates: list, box: tuple, kind=None,
+               workers: int = QUERY_WORKERS) -> tuple:
+    """Rows with a point inside (min_lat, min_lon, max_lat, max_lon); returns (columns, rows).
+
+    A row matches once per point in the box. Days loaded without --geo
+    are skipped.
+    """
+    table = dataset
+    _, columns = SEARCH_INDEXES[dataset]
+    if kind is not None:
+        kind = GEO_KINDS[dataset](kind)
+    paths = [path for path in day_paths(dataset, dates) if _has_table(path, 'geo_rtree')]
+    sql, params = geo_box_query(table, columns, *box, kind=kind)
+    columns, parts = scatter(paths, sql, params, workers)
+    return columns, [row for rows in parts for row in rows]
+
+
+def near(dataset: str, dates: list, lat: float, lon: float, radius_km: float, kind=None,
+         k: int = None, workers: int = QUERY_WORKERS) -> tuple:
+    """Rows with a point within radius_km of (lat, lon), nearest first.
+
+    The R*Tree narrows the search to the circle's bounding box and the
+    exact great-circle distance is checked on the gathered points.
+    """
+    columns, rows = within_box(dataset, dates, radius_box(lat, lon, radius_km), kind, workers)
+    if not columns:
+        return [], []
+    at_lat, at_lon = columns.index('lat'), columns.index('lon')
+    hits = []
+    for row in rows:
+        distance = haversine_km(lat, lon, row[at_lat], row[at_lon])
+        if distance <= radius_km:
+            hits.append(row + (distance,))
+    hits.sort(key=lambda row: row[-1])
+    return columns + ['distance_km'], hits[:k] if k else hits
+
+
+# =============================================================================
+# ARTICLE JOIN
+# =============================================================================
+
+def open_joined(events_path, gkg_path) -> sqlite3.Connection:
+    """Open a day's events database read-only with its GKG database attached as 'a'.
+
+    Both tables carry an indexed url_hash of the normalized article URL,
+    so events join their articles with an index lookup:
+    SELECT ... FROM events e JOIN a.gkg g ON g.url_hash = e.url_hash
+    """
+    conn = sqlite3.connect(f"file:{events_path}?mode=ro", uri=True)
+    conn.execute("ATTACH DATABASE ? AS a", (f"file:{gkg_path}?mode=ro",))
+    return conn
+
+
+def article_join_sql(event_columns=EVENT_JOIN_COLUMNS, article_columns=ARTICLE_JOIN_COLUMNS,
+                     where: str = None) -> str:
+    """Events (e) with the GKG records (g) of their source articles."""
+    select = [f"e.{column}" for column in event_columns] + [f"g.{column}" for column in article_columns]
+    sql = f"SELECT {', '.join(select)} FROM events e JOIN a.gkg g ON g.url_hash = e.url_hash"
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def _run_joined(events_path: str, gkg_path: str, sql: str, params: tuple) -> tuple:
+    """Worker: run a query on one day's events file with its GKG file attached."""
+    conn = open_joined(events_path, gkg_path)
+    try:
+        cursor = conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        return columns, cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def event_articles(dates: list, where: str = None, params: tuple = (),
+                   workers: int = QUERY_WORKERS) -> tuple:
+    """Events joined with their source articles over a date range; returns (columns, rows).
+
+    Each event day is joined with the GKG day of the same date; days
+    missing either database are skipped.
+    """
+    pairs = [(day_db_path('events', date), day_db_path('gkg', date)) for date in dates]
+    pairs = [(str(e), str(g)) for e, g in pairs if e.exists() and g.exists()]
+    if not pairs:
+        return [], []
+    sql = article_join_sql(where=where)
+    with ProcessPoolExecutor(max_workers=min(workers, len(pairs))) as pool:
+        results = list(pool.map(_run_joined, *zip(*pairs),
+                                [sql] * len(pairs), [tuple(params)] * len(pairs)))
+    return results[0][0], [row for _, rows in results for row in rows]
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def print_table(columns: list, rows: list):
+    cells = [[('' if v is None else f"{v:.4f}" if isinstance(v, float) else str(v)) for v in row]
+             for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    print('  '.join(c.ljust(w) for c, w in zip(columns, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in cells:
+        print('  '.join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+def write_csv(columns: list, rows: list):
+    writer = csv.writer(sys.stdout)
+    writer.writerow(columns)
+    writer.writerows(rows)
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='GDELT Federated Query - one query over many daily databases',
+        epilog="Example: %(prog)s events --start 2025-01-01 --end 2025-01-31 "
+               "--group-by action_geo_country_code --agg count --agg avg:goldstein_scale --top 10"
+               "\n         %(prog)s gkg --start 2025-01-01 --end 2025-01-07 "
+               "--sql \"SELECT gkg_record_id FROM gkg WHERE tone < -9\""
+               "\n         %(prog)s gkg --start 2025-01-01 --end 2025-01-31 --search '\"climate change\"'"
+               "\n         %(prog)s events --start 2025-01-01 --end 2025-01-07 --near 48.85,2.35 --radius 25"
+               "\n         %(prog)s events --start 2025-01-01 --end 2025-01-31 --table events_rollup_daily "
+               "--group-by event_root_code --agg sum:events",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('dataset', choices=DATASETS, help='Dataset to query')
+    parser.add_argument('--start', required=True, help='Range start date (YYYY-MM-DD)')
+    parser.add_argument('--end', required=True, help='Range end date, inclusive (YYYY-MM-DD)')
+    parser.add_argument('--sql', help='Raw SQL run on each day; rows are concatenated')
+    parser.add_argument('--search', '-s', metavar='QUERY',
+                        help='FTS5 full-text query over days loaded with --fts; best matches first')
+    parser.add_argument('--box', type=comma_list(float), metavar='MIN_LAT,MIN_LON,MAX_LAT,MAX_LON',
+                        help='Rows with a point in the box, over days loaded with --geo '
+                             '(MIN_LON > MAX_LON crosses the antimeridian)')
+    parser.add_argument('--near', type=comma_list(float), metavar='LAT,LON',
+                        help='Rows with a point within --radius of LAT,LON, nearest first')
+    parser.add_argument('--radius', type=float, default=50.0,
+                        help='Radius in km for --near (default: 50)')
+    parser.add_argument('--kind',
+                        help='Only points of this kind with --box / --near '
+                             '(events: action, actor1, actor2; gkg: location type 1-5)')
+    parser.add_argument('--table', '-t',
+                        help='Aggregate a rollup table kept by --rollups instead of the raw rows '
+                             f"(events: {', '.join(ROLLUP_TABLES['events'])}; "
+                             f"gkg: {', '.join(ROLLUP_TABLES['gkg'])})")
+    parser.add_argument('--articles', action='store_true',
+                        help='Join events with their source articles in the same day\'s GKG '
+                             'database (--where may use e. and g. columns)')
+    parser.add_argument('--group-by', '-g', default='',
+                        help='Comma-separated columns to group by')
+    parser.add_argument('--agg', '-a', action='append', dest='aggregates', metavar='FUNC[:COLUMN]',
+                        help=f"Aggregate to compute, repeatable ({', '.join(AGGREGATES)}; default: count)")
+    parser.add_argument('--where', help='SQL filter applied on each day')
+    parser.add_argument('--order-by', help='Output column to sort by (default: first aggregate)')
+    parser.add_argument('--asc', action='store_true', help='Sort ascending instead of descending')
+    parser.add_argument('--top', '-k', type=int,
+                        help='Keep only the first K rows (default for --search: 20)')
+    parser.add_argument('--workers', '-w', type=int, default=QUERY_WORKERS,
+                        help=f'Parallel query processes (default: {QUERY_WORKERS})')
+    parser.add_argument('--csv', action='store_true', help='Write CSV to stdout')
+    args = parser.parse_args(argv)
+    if sum(map(bool, (args.search, args.sql, args.box, args.near, args.articles))) > 1:
+        parser.error("--search, --sql, --box, --near and --articles cannot be combined")
+    if args.articles and args.dataset != 'events':
+        parser.error("--articles joins from the events dataset")
+    if args.box and len(args.box) != 4:
+        parser.error("--box takes MIN_LAT,MIN_LON,MAX_LAT,MAX_LON")
+    if args.near and len(args.near) != 2:
+        parser.error("--near takes LAT,LON")
+
+    try:
+        dates = date_range(args.start, args.end)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    paths = day_paths(args.dataset, dates)
+    log = (lambda *a: print(*a, file=sys.stderr)) if args.csv else print
+    log(f"📂 {len(paths)} of {len(dates)} daily {args.dataset} databases found")
+    if not paths:
+        return 1
+
+    started = time.perf_counter()
+    try:
+        if args.search:
+            columns, rows = search(args.dataset, dates, args.search, k=args.top or 20,
+                                   workers=args.workers)
+        elif args.box:
+            columns, rows = within_box(args.dataset, dates, tuple(args.box), kind=args.kind,
+                                       workers=args.workers)
+            if args.top:
+                rows = rows[:args.top]
+        elif args.near:
+            columns, rows = near(args.dataset, dates, *args.near, args.radius, kind=args.kind,
+                                 k=args.top, workers=args.workers)
+        elif args.articles:
+            columns, rows = event_articles(dates, where=args.where, workers=args.workers)
+            if args.top:
+                rows = rows[:args.top]
+        elif args.sql:
+            columns, rows = query_range(args.dataset, dates, args.sql, workers=args.workers)
+            if args.top:
+                rows = rows[:args.top]
+        else:
+            group_by = [c.strip() for c in args.group_by.split(',') if c.strip()]
+            aggregates = [parse_aggregate(spec) for spec in args.aggregates or ['count']]
+            columns, rows = aggregate(args.dataset, dates, group_by, aggregates, where=args.where,
+                                      order_by=args.order_by, k=args.top, ascending=args.asc,
+                                      table=args.table, workers=args.workers)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.csv:
+        write_csv(columns, rows)
+    else:
+        print()
+        print_table(columns, rows)
+    log(f"\n⏱️  {len(rows)} rows from {len(paths)} days in {elapsed:.2f}s ({args.workers} workers)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,123 +4,344 @@ GDELT GKG Daily Raw Data Fetcher
 Fetches ALL raw GKG fields for a single day and stores in SQLite.
 """
 
-import os
 import sys
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 import argparse
+import zlib
+from array import array
+from itertools import accumulate
+from operator import sub
 
-from google.cloud import bigquery
+from gdelt_common import (
+    BATCH_SIZE, DB_DIR, DICT_TABLE_SQL, GEO_SLOTS, QUEUE_DEPTH, STATE_TABLE_SQL, DailyIngest,
+    DayFetcher, DictEncoder, LoadStats, SQLiteSink, add_missing_columns, backfill_url_hash,
+    comma_list, compact_table_sql, create_dict_view, create_fts_index, create_geo_index,
+    create_rollup, day_db_path, day_parquet_dir, geo_delete_sql, get_state, project_table_sql,
+    reset_rollups, rollup_upsert_sql, sample_filter, set_state, storage_table, url_hash,
+    write_records, write_stream,
+)
 
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT", "gdelt-483607")
-DB_DIR = Path("db")
-
-
 def get_db_path(target_date: str) -> Path:
     """Generate database filename with target date."""
-    date_clean = target_date.replace('-', '')
-    return DB_DIR / f"gkg_{date_clean}.db"
+    return day_db_path('gkg', target_date)
+
+
+def get_parquet_dir(target_date: str) -> Path:
+    """Hive partition directory of one day in the Parquet dataset."""
+    return day_parquet_dir('gkg', target_date)
+
+
+# =============================================================================
+# FIELDS
+# =============================================================================
+
+# (column, BigQuery field, kind) in INSERT column order; kinds are
+# documented in gdelt_common
+GKG_FIELDS = (
+    ('gkg_record_id',        'GKGRECORDID',                'str'),
+    ('date',                 'DATE',                       'str'),
+    ('date_ts',              'date_ts',                    'ts'),
+    ('source_collection_id', 'SourceCollectionIdentifier', 'str'),
+    ('source_common_name',   'SourceCommonName',           'text'),
+    ('document_identifier',  'DocumentIdentifier',         'text'),
+    ('counts',               'Counts',                     'text'),
+    ('v2_counts',            'V2Counts',                   'text'),
+    ('themes',               'Themes',                     'text'),
+    ('v2_themes',            'V2Themes',                   'text'),
+    ('locations',            'Locations',                  'text'),
+    ('v2_locations',         'V2Locations',                'text'),
+    ('persons',              'Persons',                    'text'),
+    ('v2_persons',           'V2Persons',                  'text'),
+    ('organizations',        'Organizations',              'text'),
+    ('v2_organizations',     'V2Organizations',            'text'),
+    ('v2_tone',              'V2Tone',                     'text'),
+    ('dates',                'Dates',                      'text'),
+    ('gcam',                 'GCAM',                       'text'),
+    ('sharing_image',        'SharingImage',               'text'),
+    ('related_images',       'RelatedImages',              'text'),
+    ('social_image_embeds',  'SocialImageEmbeds',          'text'),
+    ('social_video_embeds',  'SocialVideoEmbeds',          'text'),
+    ('quotations',           'Quotations',                 'text'),
+    ('all_names',            'AllNames',                   'text'),
+    ('amounts',              'Amounts',                    'text'),
+    ('translation_info',     'TranslationInfo',            'text'),
+    ('extras',               'Extras',                     'text'),
+)
+
+GKG_COLUMNS = tuple(column for column, _, _ in GKG_FIELDS)
+
+# Computed SELECT expressions, by output field name
+GKG_EXPRESSIONS = {
+    'date_ts': "PARSE_TIMESTAMP('%Y%m%d%H%M%S', CAST(DATE AS STRING)) as date_ts",
+}
+
+# --fields profiles. The record id and the DATE watermark column are
+# always loaded on top of any profile or explicit column list.
+GKG_REQUIRED_COLUMNS = ('gkg_record_id', 'date')
 
+_GKG_CORE = ('date_ts', 'source_collection_id', 'source_common_name', 'document_identifier')
 
-MAX_RECORDS = 100000
+GKG_PROFILES = {
+    'minimal': _GKG_CORE,
+    'tone': _GKG_CORE + ('v2_themes', 'v2_tone'),
+    'entities': _GKG_CORE + ('v2_counts', 'v2_themes', 'v2_locations', 'v2_persons',
+                             'v2_organizations', 'v2_tone', 'all_names'),
+    'all': GKG_COLUMNS,
+}
+
+
+# Row filters pushed down into the BigQuery query (see gdelt_common). A
+# theme matches whole V2Themes entries ('THEME,offset;...'), and the word
+# count is the seventh V2Tone value.
+GKG_FILTERS = (
+    ('themes', "EXISTS(SELECT 1 FROM UNNEST(@themes) AS theme "
+               "WHERE STRPOS(CONCAT(';', V2Themes), CONCAT(';', theme, ',')) > 0)", 'STRING'),
+    ('sources', 'SourceCommonName IN UNNEST(@sources)', 'STRING'),
+    ('min_wordcount', "SAFE_CAST(SPLIT(V2Tone, ',')[SAFE_OFFSET(6)] AS INT64) >= @min_wordcount",
+     'INT64'),
+    sample_filter('GKGRECORDID'),
+)
 
 
 # =============================================================================
 # GKG FETCHER
 # =============================================================================
 
-class GKGFetcher:
-    """Fetches ALL GKG data from BigQuery."""
-
-    def __init__(self, project_id: str = PROJECT_ID):
-        self.client = bigquery.Client(project=project_id)
-
-    def fetch(self, target_date: str, max_records: int = MAX_RECORDS) -> list:
-        """Fetch ALL GKG records for a date."""
-        date_obj = datetime.strptime(target_date, '%Y-%m-%d')
-        next_date = date_obj + timedelta(days=1)
-
-        # Query ALL GKG fields (using actual BigQuery field names)
-        query = f"""
-        SELECT
-            GKGRECORDID,
-            DATE,
-            SourceCollectionIdentifier,
-            SourceCommonName,
-            DocumentIdentifier,
-            Counts,
-            V2Counts,
-            Themes,
-            V2Themes,
-            Locations,
-            V2Locations,
-            Persons,
-            V2Persons,
-            Organizations,
-            V2Organizations,
-            V2Tone,
-            Dates,
-            GCAM,
-            SharingImage,
-            RelatedImages,
-            SocialImageEmbeds,
-            SocialVideoEmbeds,
-            Quotations,
-            AllNames,
-            Amounts,
-            TranslationInfo,
-            Extras,
-            PARSE_TIMESTAMP('%Y%m%d%H%M%S', CAST(DATE AS STRING)) as date_ts
-        FROM `gdelt-bq.gdeltv2.gkg_partitioned`
-        WHERE
-            _PARTITIONTIME >= TIMESTAMP('{target_date}')
-            AND _PARTITIONTIME < TIMESTAMP('{next_date}')
-            AND DocumentIdentifier IS NOT NULL
-        LIMIT {max_records}
-        """
+class GKGFetcher(DayFetcher):
+    """Fetches GKG data from BigQuery: every field, or those of a profile."""
 
-        result = self.client.query(query).result()
-
-        records = []
-        for row in result:
-            records.append({
-                'gkg_record_id': str(row.GKGRECORDID) if row.GKGRECORDID else None,
-                'date': str(row.DATE) if row.DATE else None,
-                'date_ts': str(row.date_ts) if row.date_ts else None,
-                'source_collection_id': str(row.SourceCollectionIdentifier) if row.SourceCollectionIdentifier else None,
-                'source_common_name': row.SourceCommonName,
-                'document_identifier': row.DocumentIdentifier,
-                'counts': row.Counts,
-                'v2_counts': row.V2Counts,
-                'themes': row.Themes,
-                'v2_themes': row.V2Themes,
-                'locations': row.Locations,
-                'v2_locations': row.V2Locations,
-                'persons': row.Persons,
-                'v2_persons': row.V2Persons,
-                'organizations': row.Organizations,
-                'v2_organizations': row.V2Organizations,
-                'v2_tone': row.V2Tone,
-                'dates': row.Dates,
-                'gcam': row.GCAM,
-                'sharing_image': row.SharingImage,
-                'related_images': row.RelatedImages,
-                'social_image_embeds': row.SocialImageEmbeds,
-                'social_video_embeds': row.SocialVideoEmbeds,
-                'quotations': row.Quotations,
-                'all_names': row.AllNames,
-                'amounts': row.Amounts,
-                'translation_info': row.TranslationInfo,
-                'extras': row.Extras,
-            })
-
-        return records
+    TABLE = 'gdelt-bq.gdeltv2.gkg_partitioned'
+    FIELDS = GKG_FIELDS
+    FILTERS = GKG_FILTERS
+    EXPRESSIONS = GKG_EXPRESSIONS
+    TIME_COLUMN = 'DATE'
+
+    def _day_predicates(self, target_date: str) -> list:
+        next_date = datetime.strptime(target_date, '%Y-%m-%d') + timedelta(days=1)
+        return [
+            f"_PARTITIONTIME >= TIMESTAMP('{target_date}')",
+            f"_PARTITIONTIME < TIMESTAMP('{next_date}')",
+            "DocumentIdentifier IS NOT NULL",
+        ]
+
+# =============================================================================
+# FIELD PARSING
+# =============================================================================
+
+def _int_or_none(value: str):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float_or_none(value: str):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Typed columns split out of V2Tone, in field order
+TONE_COLUMNS = (
+    ('tone', 'REAL'),
+    ('positive_score', 'REAL'),
+    ('negative_score', 'REAL'),
+    ('polarity', 'REAL'),
+    ('activity_density', 'REAL'),
+    ('self_group_density', 'REAL'),
+    ('word_count', 'INTEGER'),
+)
+
+_NO_TONE = (None,) * len(TONE_COLUMNS)
+
+# Rollup kept by the optional --rollups: articles and tone per V2Themes
+# theme and DATE hour, counting each article once per theme. Themes are
+# parsed in Python, so the spec has no SQL expressions (see gdelt_common).
+GKG_THEME_ROLLUP = (
+    'gkg_theme_hourly',
+    (('hour', 'INTEGER', None), ('theme', 'TEXT', None)),
+    (('articles', 'INTEGER', None), ('tone_sum', 'REAL', None), ('tone_count', 'INTEGER', None)),
+)
+
+
+def theme_totals(rows, totals: dict = None, sign: int = 1) -> dict:
+    """Fold (id, date, v2_themes, tone) rows into {(hour, theme): [articles, tone_sum, tone_count]}.
+
+    sign=-1 takes the rows back out, for rows replaced in place.
+    """
+    totals = {} if totals is None else totals
+    for _, date, themes, tone in rows:
+        if not themes or date is None:
+            continue
+        hour = int(date) // 10000
+        for theme in {entry.partition(',')[0] for entry in themes.split(';') if entry}:
+            total = totals.setdefault((hour, theme), [0, 0.0, 0])
+            total[0] += sign
+            if tone is not None:
+                total[1] += sign * tone
+                total[2] += sign
+    return totals
+
+
+def parse_tone(field: str) -> tuple:
+    """Split V2Tone ('tone,pos,neg,polarity,activity,selfgroup,wordcount') into typed values."""
+    if not field:
+        return _NO_TONE
+    parts = field.split(',')
+    if len(parts) < len(TONE_COLUMNS):
+        return _NO_TONE
+    try:
+        values = [float(p) for p in parts[:len(TONE_COLUMNS)]]
+    except ValueError:
+        return _NO_TONE
+    values[-1] = int(values[-1])
+    return tuple(values)
+
+
+def parse_names(field: str) -> list:
+    """Parse V2Persons / V2Organizations ('Name,Offset;...') into (name, offset)."""
+    if not field:
+        return []
+    names = []
+    for block in field.split(';'):
+        name, _, offset = block.rpartition(',')
+        if not name:
+            name, offset = block, None
+        if name:
+            names.append((name, _int_or_none(offset)))
+    return names
+
+
+def parse_locations(field: str) -> list:
+    """Parse V2Locations into (type, full_name, country, adm1, adm2, lat, long, feature_id, offset).
+
+    Blocks are 'Type#FullName#CountryCode#ADM1Code#ADM2Code#Lat#Long#FeatureID#CharOffset';
+    the 8-field variant without ADM2Code is also accepted.
+    """
+    if not field:
+        return []
+    locations = []
+    for block in field.split(';'):
+        parts = block.split('#')
+        if len(parts) == 8:
+            parts.insert(4, '')
+        if len(parts) != 9:
+            continue
+        loc_type, full_name, country, adm1, adm2, lat, long_, feature_id, offset = parts
+        locations.append((
+            _int_or_none(loc_type), full_name or None, country or None, adm1 or None, adm2 or None,
+            _float_or_none(lat), _float_or_none(long_), feature_id or None, _int_or_none(offset),
+        ))
+    return locations
+
+
+def location_points(gkg_id: int, field: str):
+    """Yield geo_rtree rows for the coordinates of a V2Locations field.
+
+    A location's slot is the position of its block in the field, so the
+    points of a row can be found again from the stored text alone.
+    """
+    if not field:
+        return
+    for slot, block in enumerate(field.split(';')[:GEO_SLOTS]):
+        for location in parse_locations(block):
+            loc_type, lat, lon = location[0], location[5], location[6]
+            if lat is not None and lon is not None:
+                yield gkg_id * GEO_SLOTS + slot, lat, lat, lon, lon, lat, lon, loc_type
+
+
+def parse_counts(field: str) -> list:
+    """Parse V2Counts into (count_type, count, object_type) + location fields + offset.
+
+    Blocks are 'CountType#Count#ObjectType#' followed by the location fields
+    of V2Locations (with or without ADM2Code) and the character offset.
+    """
+    if not field:
+        return []
+    counts = []
+    for block in field.split(';'):
+        parts = block.split('#')
+        if len(parts) == 11:
+            parts.insert(7, '')
+        if len(parts) != 12:
+            continue
+        count_type, count, object_type = parts[:3]
+        location = parse_locations('#'.join(parts[3:]))
+        if not location:
+            continue
+        counts.append((count_type or None, _int_or_none(count), object_type or None) + location[0])
+    return counts
+
+
+def parse_gcam(field: str) -> dict:
+    """Parse GCAM 'dim:value,...' pairs (wc, cN.N counts, vN.N scores) into {dim: float}."""
+    if not field:
+        return {}
+    values = {}
+    for pair in field.split(','):
+        dim, _, value = pair.rpartition(':')
+        try:
+            values[dim] = float(value)
+        except ValueError:
+            continue
+    return values
+
+
+# =============================================================================
+# GCAM PACKING
+# =============================================================================
+
+def gcam_columns(fields) -> dict:
+    """Transpose (gkg id, GCAM text) pairs into {dim: (gkg ids, values)}.
+
+    Well-formed fields are split in one pass without a per-article dict;
+    anything else goes through parse_gcam.
+    """
+    columns = {}
+    for gkg_id, field in fields:
+        parts = field.replace(':', ',').split(',')
+        if len(parts) == 2 * (field.count(',') + 1):
+            pairs = zip(parts[::2], parts[1::2])
+        else:
+            pairs = parse_gcam(field).items()
+        for dim, value in pairs:
+            column = columns.get(dim)
+            if column is None:
+                column = columns[dim] = ([], [])
+            column[0].append(gkg_id)
+            column[1].append(value)
+
+    for dim, (ids, values) in columns.items():
+        try:
+            columns[dim] = (ids, [float(value) for value in values])
+        except ValueError:
+            kept = [(i, _float_or_none(value)) for i, value in zip(ids, values)]
+            kept = [(i, value) for i, value in kept if value is not None]
+            columns[dim] = ([i for i, _ in kept], [value for _, value in kept])
+    return {dim: column for dim, column in columns.items() if column[0]}
+
+
+def pack_gcam_block(ids: list, values: list) -> tuple:
+    """Encode one dimension's (ascending gkg id, value) pairs as two zlib blobs.
+
+    Ids are delta-encoded int64, values are float64.
+    """
+    deltas = array('q', map(sub, ids, [0] + ids[:-1]))
+    return zlib.compress(deltas.tobytes()), zlib.compress(array('d', values).tobytes())
+
+
+def unpack_gcam_block(ids_blob: bytes, values_blob: bytes) -> tuple:
+    """Decode a block written by pack_gcam_block into (ids, values) arrays."""
+    ids = array('q', accumulate(array('q', zlib.decompress(ids_blob))))
+    return ids, array('d', zlib.decompress(values_blob))
 
 
 # =============================================================================
@@ -130,10 +351,87 @@ class GKGFetcher:
 class GKGDatabase:
     """Stores ALL GKG raw data in SQLite."""
 
-    def __init__(self, db_path: Path):
+    TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS gkg (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        gkg_record_id TEXT,
+        date INTEGER,
+        date_ts TEXT,
+        source_collection_id TEXT,
+        source_common_name TEXT,
+        document_identifier TEXT,
+        counts TEXT,
+        v2_counts TEXT,
+        themes TEXT,
+        v2_themes TEXT,
+        locations TEXT,
+        v2_locations TEXT,
+        persons TEXT,
+        v2_persons TEXT,
+        organizations TEXT,
+        v2_organizations TEXT,
+        v2_tone TEXT,
+        dates TEXT,
+        gcam TEXT,
+        sharing_image TEXT,
+        related_images TEXT,
+        social_image_embeds TEXT,
+        social_video_embeds TEXT,
+        quotations TEXT,
+        all_names TEXT,
+        amounts TEXT,
+        translation_info TEXT,
+        extras TEXT,
+        url_hash INTEGER
+    )
+"""
+
+    # (entity table, source column, parser)
+    ENTITY_SOURCES = (
+        ('gkg_person', 'v2_persons', parse_names),
+        ('gkg_org', 'v2_organizations', parse_names),
+        ('gkg_location', 'v2_locations', parse_locations),
+        ('gkg_count', 'v2_counts', parse_counts),
+    )
+    ENTITY_TABLES = tuple(table for table, _, _ in ENTITY_SOURCES)
+
+    # Text columns covered by the optional gkg_fts full-text index
+    FTS_COLUMNS = ('all_names', 'quotations', 'v2_themes')
+
+    # Low-cardinality columns stored as dict_text keys under --compact-schema
+    DICT_COLUMNS = ('source_collection_id', 'source_common_name')
+
+    def __init__(self, db_path: Path, entities: bool = False, packed_gcam: bool = False,
+                 fields: tuple = GKG_FIELDS, fts: bool = False, geo: bool = False,
+                 rollups: bool = False, compact: bool = False):
         self.db_path = db_path
+        self.entities = entities
+        self.packed_gcam = packed_gcam
+        self.fts = fts
+        self.geo = geo
+        self.rollups = rollups
+        self.compact = compact
+        self.fields = fields
+        self.columns = tuple(column for column, _, _ in fields)
+        self._at = {column: i for i, column in enumerate(self.columns)}
         self._init_db()
 
+        # Loaded columns, then the tone values parsed from v2_tone when it is
+        # loaded. Upsert on the unique record id so re-running a day replaces
+        # rows; columns outside the profile keep their stored values.
+        insert_columns = self.columns
+        if 'v2_tone' in self._at:
+            insert_columns += tuple(name for name, _ in TONE_COLUMNS)
+        if 'document_identifier' in self._at:
+            insert_columns += ('url_hash',)
+        self.INSERT_SQL = (
+            f"INSERT INTO {self.table} ({', '.join(insert_columns)}) "
+            f"VALUES ({', '.join('?' * len(insert_columns))}) "
+            f"ON CONFLICT(gkg_record_id) DO UPDATE SET "
+            f"{', '.join(f'{c} = excluded.{c}' for c in insert_columns[1:])}"
+        )
+        self._encoder = self._new_encoder()
+
     def _init_db(self):
         """Initialize database schema with ALL fields."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -141,123 +439,700 @@ class GKGDatabase:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        # Create table with ALL GKG fields
+        # Rows go to gkg, or to gkg_base behind a decoding gkg view when the
+        # database was created with the compact schema
+        self.table = table = storage_table(conn, 'gkg', self.compact)
+        self.compact = table != 'gkg'
+        self.table_sql = self.TABLE_SQL
+        if self.compact:
+            cursor.execute(DICT_TABLE_SQL)
+            self.table_sql = compact_table_sql(self.TABLE_SQL, 'gkg', self.DICT_COLUMNS)
+
+        # Create the table with the loaded fields; databases created with a
+        # smaller profile gain the missing columns
+        cursor.execute(project_table_sql(self.table_sql, self.columns))
+        add_missing_columns(conn, table, self.table_sql, self.columns)
+
+        # Parsed V2Tone columns, added in place to databases created before them
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, sql_type in TONE_COLUMNS:
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+
+        cursor.execute(STATE_TABLE_SQL)
+
+        # Create indexes for common queries
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_gkg_date ON {table}(date)")
+        if 'source_common_name' in existing:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_gkg_source ON {table}(source_common_name)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_gkg_tone ON {table}(tone)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_gkg_word_count ON {table}(word_count)")
+
+        # Article join key, filled in place for databases created before it;
+        # only tables that hold the article URL get one
+        if 'document_identifier' in existing:
+            if add_missing_columns(conn, table, self.table_sql, ('url_hash',)):
+                backfill_url_hash(conn, table, 'document_identifier')
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_gkg_url_hash ON {table}(url_hash)")
+
+        # Entity tables stay on once a database has them
+        self.entities = self.entities or self._has_table(cursor, 'gkg_person')
+        if self.entities:
+            self._init_entity_tables(cursor)
+
+        # Likewise for the packed GCAM store
+        self.packed_gcam = self.packed_gcam or self._has_table(cursor, 'gcam_dim')
+        if self.packed_gcam:
+            self._init_gcam_tables(cursor)
+
+        # And for the full-text index
+        self.fts = self.fts or self._has_table(cursor, 'gkg_fts')
+        if self.fts:
+            add_missing_columns(conn, table, self.table_sql, self.FTS_COLUMNS)
+            create_fts_index(conn, table, 'gkg_fts', self.FTS_COLUMNS)
+
+        # And for the spatial index over V2Locations
+        self.geo = self.geo or self._has_table(cursor, 'geo_rtree')
+        if self.geo:
+            self._init_geo_index(conn)
+
+        # And for the theme rollup
+        self.rollups = self.rollups or self._has_table(cursor, 'gkg_theme_hourly')
+        if self.rollups:
+            add_missing_columns(conn, table, self.table_sql, ('v2_themes',))
+            create_rollup(conn, GKG_THEME_ROLLUP)
+
+        # Recreated on every open so it covers columns added above
+        if self.compact:
+            create_dict_view(conn, 'gkg', self.DICT_COLUMNS)
+
+        conn.commit()
+        try:
+            self._ensure_unique_record_id(conn)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _has_table(cursor, name: str) -> bool:
+        return cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    def _init_geo_index(self, conn):
+        """Create geo_rtree with triggers removing a row's points when it changes.
+
+        Points are added per batch by _insert_geo; rows already in the
+        table are indexed on creation.
+        """
+        add_missing_columns(conn, self.table, self.table_sql, ('v2_locations',))
+        if not create_geo_index(conn):
+            return
+
+        last_slot = "LENGTH(old.v2_locations) - LENGTH(REPLACE(old.v2_locations, ';', ''))"
+        delete = geo_delete_sql('old.id', last_slot)
+        conn.execute(f"""
+            CREATE TRIGGER gkg_geo_ad AFTER DELETE ON {self.table}
+            WHEN old.v2_locations IS NOT NULL BEGIN
+                {delete};
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER gkg_geo_au AFTER UPDATE OF v2_locations ON {self.table}
+            WHEN old.v2_locations IS NOT NULL BEGIN
+                {delete};
+            END
+        """)
+        source = conn.execute(f"SELECT id, v2_locations FROM {self.table} WHERE v2_locations IS NOT NULL")
+        while True:
+            rows = source.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            conn.executemany(
+                "INSERT INTO geo_rtree VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (point for gkg_id, field in rows for point in location_points(gkg_id, field)),
+            )
+
+    @staticmethod
+    def _init_entity_tables(cursor):
+        """Create the normalized person / organization / location / count tables."""
+        for table in ('gkg_person', 'gkg_org'):
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    gkg_record_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    char_offset INTEGER
+                )
+            """)
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name ON {table}(name)")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_record_id ON {table}(gkg_record_id)")
+
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS gkg (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                gkg_record_id TEXT,
-                date INTEGER,
-                date_ts TEXT,
-                source_collection_id TEXT,
-                source_common_name TEXT,
-                document_identifier TEXT,
-                counts TEXT,
-                v2_counts TEXT,
-                themes TEXT,
-                v2_themes TEXT,
-                locations TEXT,
-                v2_locations TEXT,
-                persons TEXT,
-                v2_persons TEXT,
-                organizations TEXT,
-                v2_organizations TEXT,
-                v2_tone TEXT,
-                dates TEXT,
-                gcam TEXT,
-                sharing_image TEXT,
-                related_images TEXT,
-                social_image_embeds TEXT,
-                social_video_embeds TEXT,
-                quotations TEXT,
-                all_names TEXT,
-                amounts TEXT,
-                translation_info TEXT,
-                extras TEXT
+            CREATE TABLE IF NOT EXISTS gkg_location (
+                gkg_record_id TEXT NOT NULL,
+                loc_type INTEGER,
+                full_name TEXT,
+                country_code TEXT,
+                adm1_code TEXT,
+                adm2_code TEXT,
+                lat REAL,
+                long REAL,
+                feature_id TEXT,
+                char_offset INTEGER
             )
         """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_location_country ON gkg_location(country_code, adm1_code)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_location_feature ON gkg_location(feature_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_location_name ON gkg_location(full_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_location_record_id ON gkg_location(gkg_record_id)")
 
-        # Create indexes for common queries
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_date ON gkg(date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_source ON gkg(source_common_name)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_record_id ON gkg(gkg_record_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS gkg_count (
+                gkg_record_id TEXT NOT NULL,
+                count_type TEXT,
+                count INTEGER,
+                object_type TEXT,
+                loc_type INTEGER,
+                full_name TEXT,
+                country_code TEXT,
+                adm1_code TEXT,
+                adm2_code TEXT,
+                lat REAL,
+                long REAL,
+                feature_id TEXT,
+                char_offset INTEGER
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_count_type ON gkg_count(count_type, country_code)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gkg_count_record_id ON gkg_count(gkg_record_id)")
+
+    @staticmethod
+    def _init_gcam_tables(cursor):
+        """Create the packed GCAM store.
+
+        gcam_block holds, per dimension and insert batch, the gkg ids and
+        values of every article that scored on it. gcam_row points each
+        article at the batch holding its current scores; an article is
+        dropped from its old blocks when it is rewritten or discarded.
+
+        gcam_block is a rowid table: its large blobs would spill out of
+        the B-tree pages of a WITHOUT ROWID table and bloat the file.
+        Databases created with that layout are converted in place.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS gcam_dim (
+                dim_id INTEGER PRIMARY KEY,
+                code TEXT NOT NULL UNIQUE
+            )
+        """)
+        old = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'gcam_block'").fetchone()
+        if old and 'WITHOUT ROWID' in old[0].upper():
+            cursor.execute("ALTER TABLE gcam_block RENAME TO gcam_block_old")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS gcam_block (
+                id INTEGER PRIMARY KEY,
+                dim_id INTEGER NOT NULL,
+                block_id INTEGER NOT NULL,
+                gkg_ids BLOB NOT NULL,
+                vals BLOB NOT NULL
+            )
+        """)
+        if old and 'WITHOUT ROWID' in old[0].upper():
+            cursor.execute("""
+                INSERT INTO gcam_block (dim_id, block_id, gkg_ids, vals)
+                SELECT dim_id, block_id, gkg_ids, vals FROM gcam_block_old
+            """)
+            cursor.execute("DROP TABLE gcam_block_old")
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_gcam_block_dim ON gcam_block(dim_id, block_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_gcam_block_block ON gcam_block(block_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS gcam_row (
+                gkg_id INTEGER PRIMARY KEY,
+                block_id INTEGER NOT NULL
+            )
+        """)
+
+    def _ensure_unique_record_id(self, conn: sqlite3.Connection):
+        """Make idx_gkg_record_id a UNIQUE index, upgrading older databases."""
+        indexes = {name: unique for _, name, unique, _, _
+                   in conn.execute(f"PRAGMA index_list({self.table})")}
+        if indexes.get('idx_gkg_record_id') == 1:
+            return
 
+        conn.execute("BEGIN")
+        try:
+            if 'idx_gkg_record_id' in indexes:
+                conn.execute("DROP INDEX idx_gkg_record_id")
+            conn.execute(f"CREATE UNIQUE INDEX idx_gkg_record_id ON {self.table}(gkg_record_id)")
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            raise RuntimeError(
+                f"{self.db_path} contains duplicate gkg_record_id rows; "
+                f"run 'gkg_maintain.py compact {self.db_path}' first"
+            ) from None
+        conn.commit()
+
+    def get_watermark(self):
+        """Return the highest DATE already loaded, or None for an empty database."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            watermark = get_state(conn, 'watermark')
+            if watermark is None:
+                watermark = conn.execute(f"SELECT MAX(date) FROM {self.table}").fetchone()[0]
+        finally:
+            conn.close()
+        return int(watermark) if watermark is not None else None
+
+    def advance_watermark(self, truncated: bool = False):
+        """Persist the loaded DATE high-water mark.
+
+        When the fetch hit its LIMIT the newest DATE slice may be partial,
+        so the watermark stops just below it and the next run re-fetches it.
+        """
+        conn = sqlite3.connect(self.db_path)
+        watermark = conn.execute(f"SELECT MAX(date) FROM {self.table}").fetchone()[0]
+        if truncated and watermark is not None:
+            watermark = conn.execute(
+                f"SELECT MAX(date) FROM {self.table} WHERE date < ?", (watermark,)
+            ).fetchone()[0]
+        if watermark is not None:
+            set_state(conn, 'watermark', int(watermark))
         conn.commit()
         conn.close()
+        return watermark
 
-    def store(self, records: list):
-        """Store all GKG records."""
+    def discard_after(self, watermark: int):
+        """Delete rows newer than the watermark, left over from an interrupted load."""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if self.entities:
+            for table in self.ENTITY_TABLES:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE gkg_record_id IN "
+                    f"(SELECT gkg_record_id FROM {self.table} WHERE date > ?)", (int(watermark),)
+                )
+        if self.packed_gcam:
+            self._drop_gcam_rows(conn.cursor(), [gkg_id for (gkg_id,) in conn.execute(
+                f"SELECT id FROM {self.table} WHERE date > ?", (int(watermark),))])
+        removed = conn.execute(f"DELETE FROM {self.table} WHERE date > ?", (int(watermark),)).rowcount
+        if removed and self.rollups:
+            # The removed rows may have been rolled up already
+            reset_rollups(conn, (GKG_THEME_ROLLUP,))
+        conn.commit()
+        conn.close()
 
-        for r in records:
-            cursor.execute("""
-                INSERT INTO gkg (
-                    gkg_record_id, date, date_ts, source_collection_id, source_common_name, document_identifier,
-                    counts, v2_counts, themes, v2_themes, locations, v2_locations,
-                    persons, v2_persons, organizations, v2_organizations, v2_tone,
-                    dates, gcam, sharing_image, related_images, social_image_embeds,
-                    social_video_embeds, quotations, all_names, amounts, translation_info, extras
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                r['gkg_record_id'], r['date'], r['date_ts'], r['source_collection_id'], r['source_common_name'], r['document_identifier'],
-                r['counts'], r['v2_counts'], r['themes'], r['v2_themes'], r['locations'], r['v2_locations'],
-                r['persons'], r['v2_persons'], r['organizations'], r['v2_organizations'], r['v2_tone'],
-                r['dates'], r['gcam'], r['sharing_image'], r['related_images'], r['social_image_embeds'],
-                r['social_video_embeds'], r['quotations'], r['all_names'], r['amounts'], r['translation_info'], r['extras']
+    def update_rollups(self, rebuild: bool = False) -> int:
+        """Fold GKG rows loaded since the last update into gkg_theme_hourly.
+
+        Returns the rows added; with rebuild=True the rollup is recomputed
+        from every row.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if rebuild:
+                reset_rollups(conn, (GKG_THEME_ROLLUP,))
+            last = int(get_state(conn, 'rollup_id', 0))
+            end, added = conn.execute(
+                f"SELECT MAX(id), COUNT(*) FROM {self.table} WHERE id > ?", (last,)
+            ).fetchone()
+            if added:
+                self._apply_theme_totals(conn, theme_totals(conn.execute(
+                    f"SELECT id, date, v2_themes, tone FROM {self.table} WHERE id > ? AND id <= ?",
+                    (last, end))))
+                set_state(conn, 'rollup_id', end)
+            conn.commit()
+        finally:
+            conn.close()
+        return added
+
+    def mark_complete(self):
+        """Record that this database holds the full day."""
+        conn = sqlite3.connect(self.db_path)
+        set_state(conn, 'complete', 1)
+        conn.commit()
+        conn.close()
+
+    def store(self, records: list, bulk: bool = False) -> LoadStats:
+        """Store all GKG records (row tuples in field order)."""
+        return write_records(records, lambda: self.open_sink(bulk=bulk))
+
+    def store_batches(self, batches, bulk: bool = False,
+                      max_pending: int = QUEUE_DEPTH) -> LoadStats:
+        """Store record batches on a writer thread while they are still downloading."""
+        return write_stream(batches, lambda: self.open_sink(bulk=bulk),
+                            max_pending=max_pending)
+
+    def open_sink(self, bulk: bool = False) -> SQLiteSink:
+        """Open a sink that writes batches of row tuples into this database.
+
+        With bulk=True the load runs with loader PRAGMAs. The indexes are
+        kept: GKG rows are wide enough that maintaining them costs about
+        what a rebuild would (see bench_store.py).
+        """
+        self._encoder = self._new_encoder()
+        return SQLiteSink(self.db_path, self._insert_rows, bulk=bulk)
+
+    def _new_encoder(self):
+        if not self.compact:
+            return None
+        return DictEncoder(i for i, column in enumerate(self.columns) if column in self.DICT_COLUMNS)
+
+    def _insert_rows(self, cursor, rows: list):
+        """Insert a batch of row tuples in field order."""
+        tone = self._at.get('v2_tone')
+        gcam = self._at.get('gcam') if self.packed_gcam else None
+        rows_out = rows
+        if self._encoder is not None:
+            rows_out = self._encoder.encode(cursor, rows)
+        if gcam is not None:
+            # GCAM goes to the packed store instead of the raw text column
+            rows_out = (row[:gcam] + (None,) + row[gcam + 1:] for row in rows_out)
+        if tone is not None:
+            rows_out = (out + parse_tone(row[tone]) for out, row in zip(rows_out, rows))
+        url = self._at.get('document_identifier')
+        if url is not None:
+            rows_out = (out + (url_hash(row[url]),) for out, row in zip(rows_out, rows))
+        rolled = self._rolled_up_rows(cursor, rows) if self.rollups else None
+        cursor.executemany(self.INSERT_SQL, rows_out)
+        if rolled:
+            self._reroll(cursor, rolled)
+
+        if gcam is not None:
+            self._insert_gcam(cursor, rows)
+        if self.entities:
+            self._insert_entities(cursor, rows)
+        if self.geo and 'v2_locations' in self._at:
+            self._insert_geo(cursor, rows)
+
+    def _rolled_up_rows(self, cursor, rows: list) -> list:
+        """Rollup inputs (id, date, v2_themes, tone) of batch rows already rolled up.
+
+        Upserted rows keep their id, so update_rollups never sees them
+        again; _reroll swaps their old contribution for the new one.
+        """
+        last = int(get_state(cursor, 'rollup_id', 0))
+        if not last:
+            return []
+        record_id = self._at['gkg_record_id']
+        gkg_ids = [gkg_id for gkg_id, _ in self._gkg_ids(
+            cursor, [row[record_id] for row in rows if row[record_id] is not None]) if gkg_id <= last]
+        return self._rollup_inputs(cursor, gkg_ids)
+
+    def _rollup_inputs(self, cursor, gkg_ids: list) -> list:
+        inputs = []
+        for i in range(0, len(gkg_ids), 500):
+            chunk = gkg_ids[i:i + 500]
+            inputs.extend(cursor.execute(
+                f"SELECT id, date, v2_themes, tone FROM {self.table} "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk,
             ))
+        return inputs
+
+    def _reroll(self, cursor, old_rows: list):
+        """Replace the rollup contribution of upserted rows with their new values."""
+        totals = theme_totals(old_rows, sign=-1)
+        theme_totals(self._rollup_inputs(cursor, [row[0] for row in old_rows]), totals)
+        self._apply_theme_totals(cursor, totals)
+        # Themes whose last article moved away
+        cursor.execute("DELETE FROM gkg_theme_hourly WHERE articles <= 0")
+
+    @staticmethod
+    def _apply_theme_totals(conn, totals: dict):
+        conn.executemany(rollup_upsert_sql(GKG_THEME_ROLLUP),
+                         (key + tuple(total) for key, total in totals.items() if any(total)))
+
+    def _insert_entities(self, cursor, rows: list):
+        """Replace the child entity rows of a batch of GKG rows.
+
+        Tables whose source column is not loaded are left as they are.
+        """
+        record_id = self._at['gkg_record_id']
+        rows = [row for row in rows if row[record_id] is not None]
+        keys = [(row[record_id],) for row in rows]
+        for table, source, parse in self.ENTITY_SOURCES:
+            at = self._at.get(source)
+            if at is None:
+                continue
+            cursor.executemany(f"DELETE FROM {table} WHERE gkg_record_id = ?", keys)
+            children = [(row[record_id],) + child for row in rows for child in parse(row[at])]
+            if children:
+                cursor.executemany(
+                    f"INSERT INTO {table} VALUES ({', '.join('?' * len(children[0]))})", children
+                )
+
+    def _insert_geo(self, cursor, rows: list):
+        """Index the V2Locations coordinates of a batch of GKG rows.
+
+        Points of upserted rows were removed by the gkg_geo_au trigger.
+        """
+        record_id, locations = self._at['gkg_record_id'], self._at['v2_locations']
+        fields = {row[record_id]: row[locations]
+                  for row in rows if row[record_id] is not None and row[locations]}
+        if not fields:
+            return
+        cursor.executemany(
+            "INSERT OR REPLACE INTO geo_rtree VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (point for gkg_id, record in self._gkg_ids(cursor, list(fields))
+             for point in location_points(gkg_id, fields[record])),
+        )
+
+    def _insert_gcam(self, cursor, rows: list):
+        """Append one packed block per GCAM dimension for a batch of GKG rows."""
+        record_id, gcam = self._at['gkg_record_id'], self._at['gcam']
+        fields = {row[record_id]: row[gcam] for row in rows if row[record_id] is not None and row[gcam]}
+        if not fields:
+            return
+
+        gkg_ids = self._gkg_ids(cursor, list(fields))
+        # Upserted articles leave the blocks holding their previous scores
+        self._drop_gcam_rows(cursor, [gkg_id for gkg_id, _ in gkg_ids])
+        block_id = int(get_state(cursor, 'gcam_block', 0)) + 1
+        set_state(cursor, 'gcam_block', block_id)
+        cursor.executemany(
+            "INSERT INTO gcam_row (gkg_id, block_id) VALUES (?, ?)",
+            ((gkg_id, block_id) for gkg_id, _ in gkg_ids),
+        )
+
+        columns = gcam_columns((gkg_id, fields[record]) for gkg_id, record in gkg_ids)
+        dim_ids = self._gcam_dim_ids(cursor, columns)
+        cursor.executemany(
+            "INSERT INTO gcam_block (dim_id, block_id, gkg_ids, vals) VALUES (?, ?, ?, ?)",
+            ((dim_ids[dim], block_id) + pack_gcam_block(ids, values)
+             for dim, (ids, values) in columns.items()),
+        )
+
+    @staticmethod
+    def _drop_gcam_rows(cursor, gkg_ids: list):
+        """Remove articles from the packed store, rewriting the blocks that held them.
+
+        Blocks left with no article are deleted, so superseded scores never
+        accumulate.
+        """
+        blocks = set()
+        for i in range(0, len(gkg_ids), 500):
+            chunk = gkg_ids[i:i + 500]
+            where = f"gkg_id IN ({', '.join('?' * len(chunk))})"
+            blocks.update(block_id for (block_id,) in cursor.execute(
+                f"SELECT DISTINCT block_id FROM gcam_row WHERE {where}", chunk))
+            cursor.execute(f"DELETE FROM gcam_row WHERE {where}", chunk)
+        if not blocks:
+            return
+
+        dropped = set(gkg_ids)
+        for block_id in sorted(blocks):
+            for row_id, ids_blob, values_blob in cursor.execute(
+                    "SELECT id, gkg_ids, vals FROM gcam_block WHERE block_id = ?", (block_id,)).fetchall():
+                ids, values = unpack_gcam_block(ids_blob, values_blob)
+                kept = [(i, v) for i, v in zip(ids, values) if i not in dropped]
+                if len(kept) == len(ids):
+                    continue
+                if kept:
+                    cursor.execute(
+                        "UPDATE gcam_block SET gkg_ids = ?, vals = ? WHERE id = ?",
+                        pack_gcam_block([i for i, _ in kept], [v for _, v in kept]) + (row_id,),
+                    )
+                else:
+                    cursor.execute("DELETE FROM gcam_block WHERE id = ?", (row_id,))
+
+    def _gkg_ids(self, cursor, record_ids: list) -> list:
+        """Map record ids to the rowids the upsert kept or assigned: sorted (id, record id)."""
+        gkg_ids = []
+        for i in range(0, len(record_ids), 500):
+            chunk = record_ids[i:i + 500]
+            gkg_ids.extend(cursor.execute(
+                f"SELECT id, gkg_record_id FROM {self.table} "
+                f"WHERE gkg_record_id IN ({', '.join('?' * len(chunk))})", chunk,
+            ).fetchall())
+        gkg_ids.sort()
+        return gkg_ids
+    @staticmethod
+    def _gcam_dim_ids(cursor, codes) -> dict:
+        """Return {code: dim_id}, registering codes not seen before."""
+        cursor.executemany("INSERT OR IGNORE INTO gcam_dim (code) VALUES (?)", ((c,) for c in codes))
+        return dict(cursor.execute("SELECT code, dim_id FROM gcam_dim"))
+
+    def gcam_dimension(self, code: str) -> dict:
+        """Return {gkg id: value} for one GCAM dimension, decoding only its blocks."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if not self._has_table(conn, 'gcam_dim'):
+                return {}
+            blocks = conn.execute("""
+                SELECT b.block_id, b.gkg_ids, b.vals
+                FROM gcam_block b JOIN gcam_dim d ON d.dim_id = b.dim_id
+                WHERE d.code = ?
+                ORDER BY b.block_id
+            """, (code,)).fetchall()
+            current = dict(conn.execute("SELECT gkg_id, block_id FROM gcam_row"))
+        finally:
+            conn.close()
+
+        result = {}
+        for block_id, ids_blob, values_blob in blocks:
+            ids, values = unpack_gcam_block(ids_blob, values_blob)
+            for gkg_id, value in zip(ids, values):
+                if current.get(gkg_id) == block_id:
+                    result[gkg_id] = value
+        return result
+
+    def pack_gcam(self) -> tuple:
+        """Move raw GCAM text into the packed store and merge its blocks.
+
+        Returns (rows packed, dimensions). Each dimension ends up as a single
+        block holding only current scores.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        self._init_gcam_tables(cursor)
+        self.packed_gcam = True
+
+        # Read from the storage table: the record id and GCAM text are never
+        # dictionary-encoded, so the decoding view would only add lookups
+        packed, last_id = 0, 0
+        while True:
+            rows = cursor.execute(
+                f"SELECT id, {', '.join(self.columns)} FROM {self.table} "
+                f"WHERE id > ? AND gcam IS NOT NULL AND gkg_record_id IS NOT NULL "
+                f"ORDER BY id LIMIT ?", (last_id, BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            self._insert_gcam(cursor, [row[1:] for row in rows])
+            cursor.executemany(f"UPDATE {self.table} SET gcam = NULL WHERE id = ?",
+                               ((row[0],) for row in rows))
+            packed += len(rows)
+
+        # Merge every dimension's blocks into one, dropping superseded scores
+        current = dict(cursor.execute("SELECT gkg_id, block_id FROM gcam_row"))
+        merged_block = int(get_state(cursor, 'gcam_block', 0)) + 1
+        dim_ids = [dim_id for (dim_id,) in cursor.execute("SELECT dim_id FROM gcam_dim").fetchall()]
+        for dim_id in dim_ids:
+            merged = {}
+            for block_id, ids_blob, values_blob in cursor.execute(
+                    "SELECT block_id, gkg_ids, vals FROM gcam_block WHERE dim_id = ? ORDER BY block_id",
+                    (dim_id,)).fetchall():
+                ids, values = unpack_gcam_block(ids_blob, values_blob)
+                merged.update((i, v) for i, v in zip(ids, values) if current.get(i) == block_id)
+            cursor.execute("DELETE FROM gcam_block WHERE dim_id = ?", (dim_id,))
+            if merged:
+                ids = sorted(merged)
+                cursor.execute(
+                    "INSERT INTO gcam_block (dim_id, block_id, gkg_ids, vals) VALUES (?, ?, ?, ?)",
+                    (dim_id, merged_block) + pack_gcam_block(ids, [merged[i] for i in ids]),
+                )
+        cursor.execute("UPDATE gcam_row SET block_id = ?", (merged_block,))
+        set_state(cursor, 'gcam_block', merged_block)
+
+        conn.commit()
+        conn.close()
+        return packed, len(dim_ids)
 
+    def backfill_tone(self) -> int:
+        """Fill the parsed tone columns from v2_tone for every stored row; returns rows updated."""
+        conn = sqlite3.connect(self.db_path)
+        assignments = ', '.join(f"{name} = ?" for name, _ in TONE_COLUMNS)
+        updated, last_id = 0, 0
+        while True:
+            rows = conn.execute(
+                f"SELECT id, v2_tone FROM {self.table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            conn.executemany(
+                f"UPDATE {self.table} SET {assignments} WHERE id = ?",
+                (parse_tone(v2_tone) + (row_id,) for row_id, v2_tone in rows),
+            )
+            updated += len(rows)
+            last_id = rows[-1][0]
         conn.commit()
         conn.close()
+        return updated
+
+    def rebuild_entities(self) -> int:
+        """Re-derive all entity tables from the stored gkg rows; returns rows processed."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        self._init_entity_tables(cursor)
+        for table in self.ENTITY_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+
+        processed = 0
+        # Entity source columns are never dictionary-encoded (see pack_gcam)
+        source = conn.execute(f"SELECT {', '.join(self.columns)} FROM {self.table}")
+        while True:
+            rows = source.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            self._insert_entities(cursor, rows)
+            processed += len(rows)
+
+        conn.commit()
+        conn.close()
+        self.entities = True
+        return processed
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='GDELT GKG Daily Raw Data Fetcher - ALL FIELDS',
-        epilog="Fetches ALL GKG fields for a single day and stores in SQLite.\n\nExample: %(prog)s 2025-01-06"
-    )
+class GKGIngest(DailyIngest):
+    """Daily GKG command line: storage features and article filters."""
 
-    parser.add_argument('date', type=str, help='Date (YYYY-MM-DD)')
-    parser.add_argument('--project', '-p', default=PROJECT_ID,
-                        help=f'BigQuery project ID (default: {PROJECT_ID})')
-    parser.add_argument('--max', '-m', type=int, default=MAX_RECORDS,
-                        help=f'Max records to fetch (default: {MAX_RECORDS})')
+    DATASET = 'gkg'
+    TITLE = 'GKG'
+    DATA = 'GKG'
+    FETCHER = GKGFetcher
+    DATABASE = GKGDatabase
+    PROFILES = GKG_PROFILES
+    REQUIRED_COLUMNS = GKG_REQUIRED_COLUMNS
+    REQUIRED_NOTE = 'record id and DATE'
+    WATERMARK = 'date'
+    SAMPLE_KEY = 'GKGRECORDID'
 
-    args = parser.parse_args()
+    def add_arguments(self, parser: argparse.ArgumentParser):
+        parser.add_argument('--theme', action='extend', type=comma_list(str.upper), metavar='THEMES',
+                            help='Only records tagged with any of these V2Themes (e.g. PROTEST,TAX_FNCACT)')
+        parser.add_argument('--source', action='extend', type=comma_list(str.lower), metavar='DOMAINS',
+                            help='Only records from these source domains (e.g. bbc.co.uk,reuters.com)')
+        parser.add_argument('--min-wordcount', type=int, metavar='WORDS',
+                            help='Only records of articles with at least WORDS words')
+        parser.add_argument('--entities', action='store_true',
+                            help='Also load persons/orgs/locations/counts into indexed child tables')
+        parser.add_argument('--packed-gcam', action='store_true',
+                            help='Store GCAM as compressed per-dimension blocks instead of raw text')
+        parser.add_argument('--fts', action='store_true',
+                            help='Maintain an FTS5 index over names, quotations and themes '
+                                 '(search with gdelt_query.py --search)')
+        parser.add_argument('--geo', action='store_true',
+                            help='Maintain an R*Tree index over V2Locations coordinates '
+                                 '(query with gdelt_query.py --box / --near)')
+        parser.add_argument('--rollups', action='store_true',
+                            help='Maintain an hourly per-theme rollup of article counts and tone '
+                                 '(query with gdelt_query.py --table)')
+        parser.add_argument('--compact-schema', action='store_true',
+                            help='Create new databases with source columns stored as dictionary '
+                                 'keys behind a gkg view (smaller files)')
 
-    # Validate date
-    try:
-        datetime.strptime(args.date, '%Y-%m-%d')
-    except ValueError:
-        print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD.", file=sys.stderr)
-        return 1
-
-    # Setup
-    db_path = get_db_path(args.date)
-    print(f"📊 GKG Daily Raw Data - ALL FIELDS")
-    print(f"📅 Date: {args.date}")
-    print(f"💾 Output: {db_path}")
-    print(f"📊 Max records: {args.max}\n")
-
-    # Fetch
-    print("📥 Fetching GKG data...")
-    fetcher = GKGFetcher(project_id=args.project)
-    records = fetcher.fetch(args.date, max_records=args.max)
-    print(f"   Found {len(records)} records")
-
-    # Store
-    print("\n💾 Storing to database...")
-    db = GKGDatabase(db_path)
-    db.store(records)
-
-    print(f"\n✅ Done!")
-    print(f"   Records: {len(records)}")
-    print(f"   Database: {db_path}")
-
-    return 0
+    def filters(self, args) -> dict:
+        return {
+            'themes': args.theme,
+            'sources': args.source,
+            'min_wordcount': args.min_wordcount,
+        }
+
+    def open_database(self, target_date: str, fields: tuple, args) -> GKGDatabase:
+        return GKGDatabase(get_db_path(target_date), entities=args.entities,
+                           packed_gcam=args.packed_gcam, fields=fields, fts=args.fts, geo=args.geo,
+                           rollups=args.rollups, compact=args.compact_schema)
+
+    def before_fetch(self, db: GKGDatabase, since: int):
+        # Rows above the watermark belong to a partial slice that is re-fetched
+        db.discard_after(since)
+
+
+def main(argv=None, client=None):
+    return GKGIngest().main(argv, client=client)
 
 
 if __name__ == "__main__":
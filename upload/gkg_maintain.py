@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+GDELT GKG Database Maintenance
+One-shot upkeep commands for existing daily gkg_YYYYMMDD.db files.
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+from gdelt_common import storage_table
+from gkg_daily import DB_DIR, GKGDatabase
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def resolve_paths(paths: list) -> list:
+    """Explicit database paths, or every daily GKG database in DB_DIR."""
+    if paths:
+        return [Path(p) for p in paths]
+    return sorted(DB_DIR.glob("gkg_????????.db"))
+
+
+def file_size_mb(db_path: Path) -> float:
+    return db_path.stat().st_size / (1024 * 1024)
+
+
+# =============================================================================
+# COMPACT
+# =============================================================================
+
+def compact(db_path: Path) -> int:
+    """Deduplicate gkg rows by record id, enforce uniqueness and VACUUM.
+
+    The most recently inserted copy of each record is kept. Returns the
+    number of rows removed.
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    table = storage_table(conn, 'gkg')
+    cursor.execute(f"""
+        DELETE FROM {table}
+        WHERE gkg_record_id IS NOT NULL
+          AND id NOT IN (
+              SELECT MAX(id) FROM {table}
+              WHERE gkg_record_id IS NOT NULL
+              GROUP BY gkg_record_id
+          )
+    """)
+    removed = cursor.rowcount
+    conn.commit()
+    conn.close()
+
+    # Upgrades idx_gkg_record_id to UNIQUE now that duplicates are gone
+    db = GKGDatabase(db_path)
+    if removed and db.rollups:
+        db.update_rollups(rebuild=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM")
+    conn.close()
+    return removed
+
+
+def cmd_compact(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        before = file_size_mb(db_path)
+        removed = compact(db_path)
+        after = file_size_mb(db_path)
+        print(f"   ✅ {db_path}: removed {removed} duplicates, {before:.1f} MB → {after:.1f} MB")
+    return 0
+
+
+# =============================================================================
+# BACKFILL TONE
+# =============================================================================
+
+def cmd_backfill_tone(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        # Opening the database adds the tone columns and indexes if missing
+        updated = GKGDatabase(db_path).backfill_tone()
+        print(f"   ✅ {db_path}: tone columns filled for {updated} records")
+    return 0
+
+
+# =============================================================================
+# PACK GCAM
+# =============================================================================
+
+def cmd_pack_gcam(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        before = file_size_mb(db_path)
+        packed, dimensions = GKGDatabase(db_path).pack_gcam()
+        conn = sqlite3.connect(db_path)
+        conn.execute("VACUUM")
+        conn.close()
+        after = file_size_mb(db_path)
+        print(f"   ✅ {db_path}: packed {packed} records into {dimensions} dimensions, "
+              f"{before:.1f} MB → {after:.1f} MB")
+    return 0
+
+
+# =============================================================================
+# ENTITIES
+# =============================================================================
+
+def cmd_entities(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        processed = GKGDatabase(db_path).rebuild_entities()
+        print(f"   ✅ {db_path}: entity tables rebuilt from {processed} records")
+    return 0
+
+
+# =============================================================================
+# FULL-TEXT INDEX
+# =============================================================================
+
+def cmd_fts(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        # Opening with fts=True creates and fills the index if missing
+        GKGDatabase(db_path, fts=True)
+        conn = sqlite3.connect(db_path)
+        if args.optimize:
+            conn.execute("INSERT INTO gkg_fts(gkg_fts) VALUES ('optimize')")
+            conn.commit()
+        indexed = conn.execute(f"SELECT COUNT(*) FROM {storage_table(conn, 'gkg')}").fetchone()[0]
+        conn.close()
+        print(f"   ✅ {db_path}: full-text index covers {indexed} records")
+    return 0
+
+
+# =============================================================================
+# SPATIAL INDEX
+# =============================================================================
+
+def cmd_geo(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        # Opening with geo=True creates and fills the index if missing
+        GKGDatabase(db_path, geo=True)
+        conn = sqlite3.connect(db_path)
+        points = conn.execute("SELECT COUNT(*) FROM geo_rtree").fetchone()[0]
+        conn.close()
+        print(f"   ✅ {db_path}: spatial index holds {points} locations")
+    return 0
+
+
+# =============================================================================
+# ROLLUPS
+# =============================================================================
+
+def cmd_rollups(args) -> int:
+    paths = resolve_paths(args.paths)
+    if not paths:
+        print(f"No GKG databases found in {DB_DIR}", file=sys.stderr)
+        return 1
+
+    for db_path in paths:
+        # Opening with rollups=True creates the table if missing
+        added = GKGDatabase(db_path, rollups=True).update_rollups(rebuild=args.rebuild)
+        print(f"   ✅ {db_path}: rolled up {added} records")
+    return 0
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='GDELT GKG Database Maintenance',
+        epilog="Example: %(prog)s compact db/gkg_20250106.db"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compact_parser = commands.add_parser(
+        'compact', help='Deduplicate by gkg_record_id, enforce uniqueness and VACUUM')
+    compact_parser.add_argument('paths', nargs='*',
+                                help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    compact_parser.set_defaults(func=cmd_compact)
+
+    tone_parser = commands.add_parser(
+        'backfill-tone', help='Add and fill the parsed V2Tone columns in existing databases')
+    tone_parser.add_argument('paths', nargs='*',
+                             help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    tone_parser.set_defaults(func=cmd_backfill_tone)
+
+    gcam_parser = commands.add_parser(
+        'pack-gcam', help='Move raw GCAM text into the packed per-dimension store and VACUUM')
+    gcam_parser.add_argument('paths', nargs='*',
+                             help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    gcam_parser.set_defaults(func=cmd_pack_gcam)
+
+    entities_parser = commands.add_parser(
+        'entities', help='Build or rebuild the gkg_person/org/location/count tables')
+    entities_parser.add_argument('paths', nargs='*',
+                                 help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    entities_parser.set_defaults(func=cmd_entities)
+
+    fts_parser = commands.add_parser(
+        'fts', help='Build the gkg_fts full-text index over names, quotations and themes')
+    fts_parser.add_argument('paths', nargs='*',
+                            help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    fts_parser.add_argument('--optimize', action='store_true',
+                            help='Merge the index b-trees for faster queries')
+    fts_parser.set_defaults(func=cmd_fts)
+
+    geo_parser = commands.add_parser(
+        'geo', help='Build the geo_rtree spatial index over V2Locations coordinates')
+    geo_parser.add_argument('paths', nargs='*',
+                            help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    geo_parser.set_defaults(func=cmd_geo)
+
+    rollups_parser = commands.add_parser(
+        'rollups', help='Build or update the gkg_theme_hourly theme x hour rollup')
+    rollups_parser.add_argument('paths', nargs='*',
+                                help=f'Database files (default: all {DB_DIR}/gkg_*.db)')
+    rollups_parser.add_argument('--rebuild', action='store_true',
+                                help='Recompute the rollup from every record')
+    rollups_parser.set_defaults(func=cmd_rollups)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())